@@ -0,0 +1,38 @@
+from web3 import Web3
+
+from src.lib.data_entities.constants import ARB_SYS_ADDRESS
+from src.lib.data_entities.event import parse_typed_logs
+from src.lib.utils.helper import clear_abi_registry, load_contract
+from tests.unit.stand_in_chain import StandInChain, l2_to_l1_tx_log
+
+CONTRACT_NAMES = ["ArbSys", "RollupUserLogic", "Outbox", "Inbox", "NodeInterface", "Bridge"]
+
+
+def load_contracts(provider):
+    return [load_contract(provider=provider, contract_name=name, address=ARB_SYS_ADDRESS) for name in CONTRACT_NAMES]
+
+
+async def test_load_contract_cold(bench):
+    provider = Web3(StandInChain())
+
+    def setup():
+        clear_abi_registry()
+        return provider
+
+    await bench(load_contracts, setup=setup, max_rpc_calls=0)
+
+
+async def test_load_contract_warm(bench):
+    provider = Web3(StandInChain())
+    load_contracts(provider)
+
+    await bench(load_contracts, setup=lambda: provider, rounds=200, max_rpc_calls=0)
+
+
+async def test_parse_typed_logs(bench):
+    provider = Web3(StandInChain())
+    logs = [l2_to_l1_tx_log(position, block_number=100, log_index=position) for position in range(500)]
+
+    events = await bench(lambda: parse_typed_logs(provider, "ArbSys", logs, "L2ToL1Tx"), max_rpc_calls=0)
+
+    assert [e["position"] for e in events] == list(range(500))
@@ -0,0 +1,60 @@
+from eth_abi import encode
+from web3 import AsyncWeb3, Web3
+
+from src.lib.data_entities.constants import ARB_SYS_ADDRESS
+from src.lib.data_entities.networks import l2_networks
+from src.lib.utils.lib import get_block_ranges_for_l1_block
+from tests.unit.stand_in_chain import AsyncStandInChain, StandInChain, revert, selector
+
+NITRO_GENESIS_BLOCK = l2_networks[42161].nitro_genesis_block
+
+HEAD = NITRO_GENESIS_BLOCK + 180_000_000
+
+# The stand-in puts L2 block n in L1 block n // 4.
+FOR_L1_BLOCK = (NITRO_GENESIS_BLOCK + 123_456_789) // 4
+
+
+def arb_sys(calldata):
+    if calldata[:4] == selector("arbOSVersion()"):
+        return encode(["uint256"], [71])
+    revert()
+
+
+def make_chain():
+    return StandInChain(head=HEAD, contracts={ARB_SYS_ADDRESS: arb_sys})
+
+
+async def test_get_block_ranges_for_l1_block(bench):
+    chain = make_chain()
+
+    block_range = await bench(
+        lambda provider: get_block_ranges_for_l1_block(provider, FOR_L1_BLOCK),
+        setup=lambda: Web3(chain),
+        max_rpc_calls=18,
+    )
+
+    assert block_range == [FOR_L1_BLOCK * 4, FOR_L1_BLOCK * 4 + 3]
+
+
+async def test_get_block_ranges_for_l1_block_async(bench):
+    chain = make_chain()
+
+    block_range = await bench(
+        lambda provider: get_block_ranges_for_l1_block(provider, FOR_L1_BLOCK),
+        setup=lambda: AsyncWeb3(AsyncStandInChain(chain)),
+        max_rpc_calls=19,
+    )
+
+    assert block_range == [FOR_L1_BLOCK * 4, FOR_L1_BLOCK * 4 + 3]
+
+
+async def test_get_block_ranges_for_l1_block_k_ary(bench):
+    chain = make_chain()
+
+    block_range = await bench(
+        lambda provider: get_block_ranges_for_l1_block(provider, FOR_L1_BLOCK, interpolate=False),
+        setup=lambda: Web3(chain),
+        max_rpc_calls=63,
+    )
+
+    assert block_range == [FOR_L1_BLOCK * 4, FOR_L1_BLOCK * 4 + 3]
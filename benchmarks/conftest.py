@@ -0,0 +1,114 @@
+import inspect
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from tests.unit.stand_in_chain import StandInChain
+
+DEFAULT_ROUNDS = 20
+
+BENCHMARKS_DIR = Path(__file__).parent
+
+benchmark_results = []
+
+
+def benchmarks_requested(config):
+    # Benchmarks take a while, so a plain pytest run leaves them out: they are collected only when
+    # the command line names this directory or a path inside it.
+    for arg in config.args:
+        path = (config.invocation_params.dir / arg.split("::")[0]).resolve()
+        if path == BENCHMARKS_DIR or BENCHMARKS_DIR in path.parents:
+            return True
+    return False
+
+
+def pytest_collect_file(file_path, parent):
+    # Files named on the command line are collected by pytest itself.
+    if (
+        file_path.name.endswith("_benchmark.py")
+        and not parent.session.isinitpath(file_path)
+        and benchmarks_requested(parent.config)
+    ):
+        return pytest.Module.from_parent(parent, path=file_path)
+
+
+class Bench:
+    # Times fn over a number of rounds and counts the JSON-RPC requests every StandInChain served
+    # meanwhile. setup runs untimed before each round and its return value is passed to fn, so each
+    # round can start from fresh providers and caches. A round exceeding max_rpc_calls fails the
+    # benchmark, which catches added round-trips that wall time on a local stand-in would hide.
+    def __init__(self, name, rpc_calls):
+        self.name = name
+        self.rpc_calls = rpc_calls
+
+    async def __call__(self, fn, setup=None, rounds=DEFAULT_ROUNDS, max_rpc_calls=None):
+        timings = []
+        round_rpc_calls = []
+        methods = Counter()
+        value = None
+
+        for _ in range(rounds):
+            args = setup() if setup is not None else ()
+            if not isinstance(args, tuple):
+                args = (args,)
+
+            self.rpc_calls.clear()
+            started = time.perf_counter()
+            value = fn(*args)
+            if inspect.isawaitable(value):
+                value = await value
+            timings.append(time.perf_counter() - started)
+
+            round_rpc_calls.append(sum(self.rpc_calls.values()))
+            methods = Counter(self.rpc_calls)
+
+        result = {
+            "name": self.name,
+            "rounds": rounds,
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "mean": statistics.mean(timings),
+            "rpcCalls": max(round_rpc_calls),
+            "methods": dict(methods),
+        }
+        benchmark_results.append(result)
+
+        if max_rpc_calls is not None:
+            assert result["rpcCalls"] <= max_rpc_calls, (
+                f"{self.name} made {result['rpcCalls']} RPC calls in a round, over its budget of {max_rpc_calls}: "
+                f"{result['methods']}"
+            )
+        return value
+
+
+@pytest.fixture
+def bench(request, monkeypatch):
+    rpc_calls = Counter()
+    make_request = StandInChain.make_request
+
+    def counting_make_request(chain, method, params):
+        rpc_calls[method] += 1
+        return make_request(chain, method, params)
+
+    monkeypatch.setattr(StandInChain, "make_request", counting_make_request)
+    return Bench(request.node.name, rpc_calls)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not benchmark_results:
+        return
+
+    terminalreporter.section("benchmarks")
+    name_width = max(len(r["name"]) for r in benchmark_results)
+    terminalreporter.write_line(
+        f"{'name':<{name_width}}  {'rounds':>6}  {'min ms':>9}  {'median ms':>9}  {'mean ms':>9}  {'rpc':>5}  methods"
+    )
+    for r in benchmark_results:
+        methods = ", ".join(f"{method} {count}" for method, count in sorted(r["methods"].items()))
+        terminalreporter.write_line(
+            f"{r['name']:<{name_width}}  {r['rounds']:>6}  {r['min'] * 1000:>9.3f}  {r['median'] * 1000:>9.3f}  "
+            f"{r['mean'] * 1000:>9.3f}  {r['rpcCalls']:>5}  {methods}"
+        )
@@ -0,0 +1,47 @@
+from web3 import AsyncWeb3, Web3
+
+from src.lib.data_entities.constants import ARB_SYS_ADDRESS
+from src.lib.utils.event_fetcher import EventFetcher
+from tests.unit.stand_in_chain import AsyncStandInChain, StandInChain, l2_to_l1_tx_log
+
+HEAD = 1_000_000
+
+LOG_COUNT = 1000
+
+
+def make_chain(max_log_range=None):
+    logs = [l2_to_l1_tx_log(position, block_number=position * (HEAD // LOG_COUNT) + 7) for position in range(LOG_COUNT)]
+    return StandInChain(logs=logs, head=HEAD, max_log_range=max_log_range)
+
+
+def get_events(provider, **options):
+    return EventFetcher(provider).get_events(
+        contract_factory="ArbSys",
+        event_name="L2ToL1Tx",
+        filter={"fromBlock": 0, "toBlock": "latest", "address": ARB_SYS_ADDRESS},
+        **options,
+    )
+
+
+async def test_get_events_single_query(bench):
+    provider = Web3(make_chain())
+
+    events = await bench(lambda: get_events(provider), rounds=5, max_rpc_calls=1)
+
+    assert len(events) == LOG_COUNT
+
+
+async def test_get_events_chunked_range(bench):
+    provider = AsyncWeb3(AsyncStandInChain(make_chain()))
+
+    events = await bench(lambda: get_events(provider, block_range_size=50_000), rounds=5, max_rpc_calls=22)
+
+    assert len(events) == LOG_COUNT
+
+
+async def test_get_events_bisects_rejected_range(bench):
+    provider = Web3(make_chain(max_log_range=100_000))
+
+    events = await bench(lambda: get_events(provider), rounds=5, max_rpc_calls=32)
+
+    assert len(events) == LOG_COUNT
@@ -0,0 +1,167 @@
+from eth_abi import decode, encode
+from web3 import Web3
+
+from src.lib.data_entities.constants import ARB_SYS_ADDRESS
+from src.lib.data_entities.message import L2ToL1MessageStatus
+from src.lib.data_entities.networks import l2_networks
+from src.lib.message.l1_to_l2_message import L1ToL2Message
+from src.lib.message.l2_to_l1_message_nitro import L2ToL1MessageReaderNitro
+from src.lib.message.message_data_parser import SubmitRetryableMessageDataParser
+from tests.unit.stand_in_chain import StandInChain, block_hash, encode_log, revert, selector
+
+ROLLUP = l2_networks[42161].ethBridge.rollup
+
+OUTBOX = l2_networks[42161].ethBridge.outbox
+
+NODE_NUM = 12_345
+
+CREATED_AT_BLOCK = 19_000_000
+
+# The stand-in's L2 block n has send count n, so messages below this position are confirmed.
+CONFIRMED_L2_BLOCK = 250_000_000
+
+RETRYABLE_DATA = (
+    "0x000000000000000000000000467194771DAE2967AEF3ECBEDD3BF9A310C76C650000000000000000000000000000000000000000000000"
+    "000000000000000000000000000000000000000000000000000000000000000000000030346F1C785E000000000000000000000000000000"
+    "00000000000000000000000053280CF1490000000000000000000000007F869DC59A96E798E759030B3C39398BA584F08700000000000000"
+    "00000000007F869DC59A96E798E759030B3C39398BA584F08700000000000000000000000000000000000000000000000000000000000210"
+    "F100000000000000000000000000000000000000000000000000000000172C58650000000000000000000000000000000000000000000000"
+    "0000000000000001442E567B360000000000000000000000006B175474E89094C44DA98B954EEDEAC495271D0F0000000000000000000000"
+    "007F869DC59A96E798E759030B3C39398BA584F0870000000000000000000000007F869DC59A96E798E759030B3C39398BA584F087000000"
+    "00000000000000000000000000000000000000003871022F1082344C77000000000000000000000000000000000000000000000000000000"
+    "00000000A0000000000000000000000000000000000000000000000000000000000000008000000000000000000000000000000000000000"
+    "0000000000000000000000004000000000000000000000000000000000000000000000000000000000000000600000000000000000000000"
+    "0000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000"
+)
+
+
+def rollup(calldata):
+    if calldata[:4] == selector("latestConfirmed()"):
+        return encode(["uint64"], [NODE_NUM])
+    if calldata[:4] == selector("getNode(uint64)"):
+        (node_num,) = decode(["uint64"], calldata[4:])
+        node = (
+            b"\x01" * 32,
+            b"\x00" * 32,
+            b"\x02" * 32,
+            node_num - 1,
+            0,
+            0,
+            0,
+            0,
+            0,
+            0,
+            CREATED_AT_BLOCK,
+            b"\x03" * 32,
+        )
+        return encode(
+            ["(bytes32,bytes32,bytes32,uint64,uint64,uint64,uint64,uint64,uint64,uint64,uint64,bytes32)"], [node]
+        )
+    revert()
+
+
+def outbox(spent):
+    def handler(calldata):
+        if calldata[:4] == selector("isSpent(uint256)"):
+            (position,) = decode(["uint256"], calldata[4:])
+            return encode(["bool"], [position in spent])
+        revert()
+
+    return handler
+
+
+def node_created_log():
+    after_state = (
+        (
+            [Web3.to_bytes(hexstr=block_hash(CONFIRMED_L2_BLOCK)), CONFIRMED_L2_BLOCK.to_bytes(32, "big")],
+            [0, 0],
+        ),
+        1,
+    )
+    before_state = (([b"\x00" * 32, b"\x00" * 32], [0, 0]), 1)
+    return encode_log(
+        "RollupUserLogic",
+        "NodeCreated",
+        {
+            "nodeNum": NODE_NUM,
+            "parentNodeHash": b"\x04" * 32,
+            "nodeHash": b"\x03" * 32,
+            "executionHash": b"\x05" * 32,
+            "assertion": (before_state, after_state, 1),
+            "afterInboxBatchAcc": b"\x06" * 32,
+            "wasmModuleRoot": b"\x07" * 32,
+            "inboxMaxCount": 1,
+        },
+        CREATED_AT_BLOCK,
+        0,
+        ROLLUP,
+    )
+
+
+def make_chains(spent=()):
+    l1_chain = StandInChain(
+        logs=[node_created_log()],
+        head=CREATED_AT_BLOCK + 100,
+        chain_id=1,
+        contracts={ROLLUP: rollup, OUTBOX: outbox(spent)},
+    )
+    l2_chain = StandInChain(head=CONFIRMED_L2_BLOCK + 100)
+    return l1_chain, l2_chain
+
+
+async def test_l2_to_l1_message_status(bench):
+    l1_chain, l2_chain = make_chains()
+    event = {"position": 1_000, "arbBlockNum": 1_000}
+
+    def setup():
+        l2_provider = Web3(l2_chain)
+        return L2ToL1MessageReaderNitro(Web3(l1_chain), event), l2_provider
+
+    status = await bench(lambda reader, l2_provider: reader.status(l2_provider), setup=setup, max_rpc_calls=12)
+
+    assert status == L2ToL1MessageStatus.CONFIRMED
+
+
+async def test_l2_to_l1_message_status_executed(bench):
+    l1_chain, l2_chain = make_chains(spent={1_000})
+    event = {"position": 1_000, "arbBlockNum": 1_000}
+
+    def setup():
+        return L2ToL1MessageReaderNitro(Web3(l1_chain), event, l2_networks[42161]), Web3(l2_chain)
+
+    status = await bench(lambda reader, l2_provider: reader.status(l2_provider), setup=setup, max_rpc_calls=11)
+
+    assert status == L2ToL1MessageStatus.EXECUTED
+
+
+async def test_submit_retryable_message_data_parse(bench):
+    parser = SubmitRetryableMessageDataParser()
+
+    message_data = await bench(lambda: parser.parse(RETRYABLE_DATA), rounds=1000, max_rpc_calls=0)
+
+    assert message_data["destAddress"] == "0x467194771dAe2967Aef3ECbEDD3Bf9a310C76C65"
+
+
+async def test_calculate_submit_retryable_id(bench):
+    message_data = SubmitRetryableMessageDataParser().parse(RETRYABLE_DATA)
+
+    def calculate_submit_retryable_id():
+        return L1ToL2Message.calculate_submit_retryable_id(
+            42161,
+            "0x7F869dC59A96e798e759030b3c39398ba584F087",
+            1_234_567,
+            30_000_000_000,
+            message_data["destAddress"],
+            message_data["l2CallValue"],
+            message_data["l1Value"],
+            message_data["maxSubmissionFee"],
+            message_data["excessFeeRefundAddress"],
+            message_data["callValueRefundAddress"],
+            message_data["gasLimit"],
+            message_data["maxFeePerGas"],
+            message_data["data"],
+        )
+
+    retryable_id = await bench(calculate_submit_retryable_id, rounds=1000, max_rpc_calls=0)
+
+    assert len(Web3.to_bytes(hexstr=retryable_id)) == 32
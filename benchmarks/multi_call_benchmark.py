@@ -0,0 +1,70 @@
+from eth_abi import decode, encode
+from web3 import AsyncWeb3, Web3
+
+from src.lib.utils.multi_call import MultiCaller
+from tests.unit.stand_in_chain import AsyncStandInChain, StandInChain, revert, selector
+
+MULTICALL = "0x842eC2c7D803033Edf55E478F461FC547Bc54EB2"
+
+ACCOUNT = "0x7F869dC59A96e798e759030b3c39398ba584F087"
+
+SPENDER = "0x467194771dAe2967Aef3ECbEDD3Bf9a310C76C65"
+
+TOKEN_COUNT = 200
+
+ALL_OPTIONS = {
+    "balanceOf": {"account": ACCOUNT},
+    "allowance": {"owner": ACCOUNT, "spender": SPENDER},
+    "symbol": True,
+    "decimals": True,
+    "name": True,
+}
+
+
+def erc20(index):
+    def handler(calldata):
+        if calldata[:4] == selector("balanceOf(address)"):
+            (account,) = decode(["address"], calldata[4:])
+            return encode(["uint256"], [index])
+        if calldata[:4] == selector("allowance(address,address)"):
+            return encode(["uint256"], [2 * index])
+        if calldata[:4] == selector("symbol()"):
+            return encode(["string"], [f"T{index}"])
+        if calldata[:4] == selector("decimals()"):
+            return encode(["uint8"], [18])
+        if calldata[:4] == selector("name()"):
+            return encode(["string"], [f"Token {index}"])
+        revert()
+
+    return handler
+
+
+def make_chain():
+    tokens = [Web3.to_checksum_address("0x" + f"{i:040x}") for i in range(1, TOKEN_COUNT + 1)]
+    chain = StandInChain(contracts={token: erc20(i) for i, token in enumerate(tokens, 1)})
+    chain.add_multicall(MULTICALL)
+    return chain, tokens
+
+
+async def test_get_token_data_names(bench):
+    chain, tokens = make_chain()
+    caller = MultiCaller(Web3(chain), MULTICALL)
+
+    token_data = await bench(lambda: caller.get_token_data(tokens), max_rpc_calls=2)
+
+    assert token_data[0] == {"name": "Token 1"}
+
+
+async def test_get_token_data_all_fields(bench):
+    chain, tokens = make_chain()
+    caller = MultiCaller(AsyncWeb3(AsyncStandInChain(chain)), MULTICALL)
+
+    token_data = await bench(lambda: caller.get_token_data(tokens, ALL_OPTIONS), max_rpc_calls=9)
+
+    assert token_data[-1] == {
+        "balance": TOKEN_COUNT,
+        "allowance": 2 * TOKEN_COUNT,
+        "symbol": f"T{TOKEN_COUNT}",
+        "decimals": 18,
+        "name": f"Token {TOKEN_COUNT}",
+    }
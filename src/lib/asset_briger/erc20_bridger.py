@@ -7,7 +7,7 @@ from web3.exceptions import ContractLogicError
 from src.lib.asset_briger.asset_bridger import AssetBridger
 from src.lib.data_entities.constants import DISABLED_GATEWAY
 from src.lib.data_entities.errors import ArbSdkError, MissingProviderArbSdkError
-from src.lib.data_entities.networks import get_l2_network
+from src.lib.data_entities.networks import fetch_l2_network
 from src.lib.data_entities.retryable_data import RetryableDataTools
 from src.lib.data_entities.signer_or_provider import (
     SignerProviderUtils,
@@ -19,12 +19,15 @@ from src.lib.data_entities.transaction_request import (
 from src.lib.message.l1_to_l2_message_gas_estimator import L1ToL2MessageGasEstimator
 from src.lib.message.l1_transaction import L1TransactionReceipt
 from src.lib.message.l2_transaction import L2TransactionReceipt
-from src.lib.utils.event_fetcher import EventFetcher
+from src.lib.utils.event_fetcher import DEFAULT_STREAM_BLOCK_RANGE_SIZE, EventFetcher
+from src.lib.utils.executor import call_rpc
 from src.lib.utils.helper import (
     CaseDict,
-    is_contract_deployed,
+    fetch_is_contract_deployed,
     load_contract,
 )
+from src.lib.utils.instrumentation import instrumented_operation
+from src.lib.utils.multi_call_batcher import read_contract
 
 
 class Erc20Bridger(AssetBridger):
@@ -36,7 +39,7 @@ class Erc20Bridger(AssetBridger):
 
     @classmethod
     async def from_provider(cls, l2_provider):
-        l2_network = get_l2_network(l2_provider)
+        l2_network = await fetch_l2_network(l2_provider)
         return Erc20Bridger(l2_network)
 
     async def get_l1_gateway_address(self, erc20_l1_address, l1_provider):
@@ -48,7 +51,7 @@ class Erc20Bridger(AssetBridger):
             address=self.l2_network.token_bridge.l1_gateway_router,
             is_classic=True,
         )
-        return l1_gateway_router.functions.getGateway(erc20_l1_address).call()
+        return await read_contract(l1_gateway_router.functions.getGateway(erc20_l1_address))
 
     async def get_l2_gateway_address(self, erc20_l1_address, l2_provider):
         await self.check_l2_network(l2_provider)
@@ -58,7 +61,7 @@ class Erc20Bridger(AssetBridger):
             address=self.l2_network.token_bridge.l2_gateway_router,
             is_classic=True,
         )
-        return l2_gateway_router.functions.getGateway(erc20_l1_address).call()
+        return await call_rpc(l2_gateway_router.functions.getGateway(erc20_l1_address).call)
 
     async def get_approve_token_request(self, params):
         gateway_address = await self.get_l1_gateway_address(
@@ -102,9 +105,9 @@ class Erc20Bridger(AssetBridger):
         if "from" not in transaction:
             transaction["from"] = params["l1Signer"].account.address
 
-        tx_hash = params["l1Signer"].provider.eth.send_transaction(transaction)
+        tx_hash = await call_rpc(params["l1Signer"].provider.eth.send_transaction, transaction)
 
-        tx_receipt = params["l1Signer"].provider.eth.wait_for_transaction_receipt(tx_hash)
+        tx_receipt = await call_rpc(params["l1Signer"].provider.eth.wait_for_transaction_receipt, tx_hash)
         return tx_receipt
 
     async def get_l2_withdrawal_events(
@@ -115,6 +118,7 @@ class Erc20Bridger(AssetBridger):
         l1_token_address=None,
         from_address=None,
         to_address=None,
+        block_range_size=None,
     ):
         await self.check_l2_network(l2_provider)
         event_fetcher = EventFetcher(l2_provider)
@@ -130,6 +134,7 @@ class Erc20Bridger(AssetBridger):
                 **filter,
             },
             is_classic=True,
+            block_range_size=block_range_size,
         )
 
         events = [{"txHash": a["transactionHash"], **a["event"]} for a in events]
@@ -139,6 +144,38 @@ class Erc20Bridger(AssetBridger):
             else events
         )
 
+    async def iter_l2_withdrawal_events(
+        self,
+        l2_provider,
+        gateway_address,
+        filter,
+        l1_token_address=None,
+        from_address=None,
+        to_address=None,
+        block_range_size=DEFAULT_STREAM_BLOCK_RANGE_SIZE,
+    ):
+        await self.check_l2_network(l2_provider)
+        event_fetcher = EventFetcher(l2_provider)
+
+        events = event_fetcher.iter_events(
+            contract_factory="L2ArbitrumGateway",
+            event_name="WithdrawalInitiated",
+            argument_filters={},
+            filter={
+                "address": gateway_address,
+                **filter,
+            },
+            is_classic=True,
+            block_range_size=block_range_size,
+        )
+        try:
+            async for a in events:
+                if l1_token_address and a["event"]["l1Token"].lower() != l1_token_address.lower():
+                    continue
+                yield {"txHash": a["transactionHash"], **a["event"]}
+        finally:
+            await events.aclose()
+
     async def looks_like_weth_gateway(self, potential_weth_gateway_address, l1_provider):
         try:
             potential_weth_gateway = load_contract(
@@ -147,7 +184,7 @@ class Erc20Bridger(AssetBridger):
                 address=potential_weth_gateway_address,
                 is_classic=True,
             )
-            potential_weth_gateway.functions.l1Weth().call()
+            await call_rpc(potential_weth_gateway.functions.l1Weth().call)
             return True
 
         except ContractLogicError:
@@ -189,7 +226,7 @@ class Erc20Bridger(AssetBridger):
             address=self.l2_network.token_bridge.l1_gateway_router,
             is_classic=True,
         )
-        return l1_gateway_router.functions.calculateL2TokenAddress(erc20_l1_address).call()
+        return await read_contract(l1_gateway_router.functions.calculateL2TokenAddress(erc20_l1_address))
 
     async def get_l1_erc20_address(self, erc20_l2_address, l2_provider):
         await self.check_l2_network(l2_provider)
@@ -203,7 +240,7 @@ class Erc20Bridger(AssetBridger):
             is_classic=True,
         )
 
-        l1_address = arb_erc20.functions.l1Address().call()
+        l1_address = await call_rpc(arb_erc20.functions.l1Address().call)
 
         l2_gateway_router = load_contract(
             provider=l2_provider,
@@ -211,7 +248,7 @@ class Erc20Bridger(AssetBridger):
             address=self.l2_network.token_bridge.l2_gateway_router,
             is_classic=True,
         )
-        l2_address = l2_gateway_router.functions.calculateL2TokenAddress(l1_address).call()
+        l2_address = await call_rpc(l2_gateway_router.functions.calculateL2TokenAddress(l1_address).call)
 
         if l2_address.lower() != erc20_l2_address.lower():
             raise ArbSdkError(
@@ -227,7 +264,7 @@ class Erc20Bridger(AssetBridger):
             address=self.l2_network.token_bridge.l1_gateway_router,
             is_classic=True,
         )
-        return (l1_gateway_router.functions.l1TokenToGateway(l1_token_address).call()) == DISABLED_GATEWAY
+        return (await read_contract(l1_gateway_router.functions.l1TokenToGateway(l1_token_address))) == DISABLED_GATEWAY
 
     def apply_defaults(self, params):
         return {
@@ -313,6 +350,7 @@ class Erc20Bridger(AssetBridger):
             }
         )
 
+    @instrumented_operation("erc20_bridger.deposit")
     async def deposit(self, params):
         await self.check_l1_network(params["l1Signer"])
 
@@ -340,9 +378,9 @@ class Erc20Bridger(AssetBridger):
         if "from" not in transaction:
             transaction["from"] = params["l1Signer"].account.address
 
-        tx_hash = params["l1Signer"].provider.eth.send_transaction(transaction)
+        tx_hash = await call_rpc(params["l1Signer"].provider.eth.send_transaction, transaction)
 
-        tx_receipt = params["l1Signer"].provider.eth.wait_for_transaction_receipt(tx_hash)
+        tx_receipt = await call_rpc(params["l1Signer"].provider.eth.wait_for_transaction_receipt, tx_hash)
 
         return L1TransactionReceipt.monkey_patch_contract_call_wait(tx_receipt)
 
@@ -390,6 +428,7 @@ class Erc20Bridger(AssetBridger):
             "estimateL1GasLimit": estimate_l1_gas_limit,
         }
 
+    @instrumented_operation("erc20_bridger.withdraw")
     async def withdraw(self, params):
         if not SignerProviderUtils.signer_has_provider(params["l2Signer"]):
             raise MissingProviderArbSdkError("l2Signer")
@@ -405,9 +444,9 @@ class Erc20Bridger(AssetBridger):
         if "from" not in tx:
             tx["from"] = params["l2Signer"].account.address
 
-        tx_hash = params["l2Signer"].provider.eth.send_transaction(tx)
+        tx_hash = await call_rpc(params["l2Signer"].provider.eth.send_transaction, tx)
 
-        tx_receipt = params["l2Signer"].provider.eth.wait_for_transaction_receipt(tx_hash)
+        tx_receipt = await call_rpc(params["l2Signer"].provider.eth.wait_for_transaction_receipt, tx_hash)
 
         return L2TransactionReceipt.monkey_patch_wait(tx_receipt)
 
@@ -448,13 +487,13 @@ class AdminErc20Bridger(Erc20Bridger):
             is_classic=True,
         )
 
-        if not is_contract_deployed(l1_signer.provider, l1_token.address):
+        if not await fetch_is_contract_deployed(l1_signer.provider, l1_token.address):
             raise Exception("L1 token is not deployed.")
 
-        if not is_contract_deployed(l2_provider, l2_token.address):
+        if not await fetch_is_contract_deployed(l2_provider, l2_token.address):
             raise Exception("L2 token is not deployed.")
 
-        l1_address_from_l2 = l2_token.functions.l1Address().call()
+        l1_address_from_l2 = await call_rpc(l2_token.functions.l1Address().call)
         if l1_address_from_l2 != l1_token_address:
             raise ArbSdkError(
                 f"L2 token does not have l1 address set. Set address: {l1_address_from_l2}, expected address: {l1_token_address}."
@@ -527,13 +566,15 @@ class AdminErc20Bridger(Erc20Bridger):
         if "from" not in register_tx:
             register_tx["from"] = l1_signer.account.address
 
-        tx_hash = l1_signer.provider.eth.send_transaction(register_tx)
+        tx_hash = await call_rpc(l1_signer.provider.eth.send_transaction, register_tx)
 
-        register_tx_receipt = l1_signer.provider.eth.wait_for_transaction_receipt(tx_hash)
+        register_tx_receipt = await call_rpc(l1_signer.provider.eth.wait_for_transaction_receipt, tx_hash)
 
         return L1TransactionReceipt.monkey_patch_contract_call_wait(register_tx_receipt)
 
-    async def get_l1_gateway_set_events(self, l1_provider, filter, custom_network_l1_gateway_router=None):
+    async def get_l1_gateway_set_events(
+        self, l1_provider, filter, custom_network_l1_gateway_router=None, block_range_size=None
+    ):
         await self.check_l1_network(l1_provider)
 
         l1_gateway_router_address = self.l2_network.token_bridge.l1_gateway_router
@@ -553,11 +594,14 @@ class AdminErc20Bridger(Erc20Bridger):
                 **filter,
             },
             is_classic=True,
+            block_range_size=block_range_size,
         )
 
         return [a["event"] for a in events]
 
-    async def get_l2_gateway_set_events(self, l2_provider, filter, custom_network_l2_gateway_router=None):
+    async def get_l2_gateway_set_events(
+        self, l2_provider, filter, custom_network_l2_gateway_router=None, block_range_size=None
+    ):
         if self.l2_network.is_custom and not custom_network_l2_gateway_router:
             raise ArbSdkError("Must supply customNetworkL2GatewayRouter for custom network ")
 
@@ -579,6 +623,7 @@ class AdminErc20Bridger(Erc20Bridger):
                 **filter,
             },
             is_classic=True,
+            block_range_size=block_range_size,
         )
 
         return [a["event"] for a in events]
@@ -633,8 +678,8 @@ class AdminErc20Bridger(Erc20Bridger):
         if "from" not in transaction:
             transaction["from"] = l1_signer.account.address
 
-        tx_hash = l1_signer.provider.eth.send_transaction(transaction)
+        tx_hash = await call_rpc(l1_signer.provider.eth.send_transaction, transaction)
 
-        tx_receipt = l1_signer.provider.eth.wait_for_transaction_receipt(tx_hash)
+        tx_receipt = await call_rpc(l1_signer.provider.eth.wait_for_transaction_receipt, tx_hash)
 
         return L1TransactionReceipt.monkey_patch_contract_call_wait(tx_receipt)
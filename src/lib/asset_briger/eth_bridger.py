@@ -1,7 +1,7 @@
 from src.lib.asset_briger.asset_bridger import AssetBridger
 from src.lib.data_entities.constants import ARB_SYS_ADDRESS
 from src.lib.data_entities.errors import MissingProviderArbSdkError
-from src.lib.data_entities.networks import get_l2_network
+from src.lib.data_entities.networks import fetch_l2_network
 from src.lib.data_entities.signer_or_provider import SignerProviderUtils
 from src.lib.data_entities.transaction_request import (
     is_l1_to_l2_transaction_request,
@@ -10,7 +10,9 @@ from src.lib.data_entities.transaction_request import (
 from src.lib.message.l1_to_l2_message_creator import L1ToL2MessageCreator
 from src.lib.message.l1_transaction import L1TransactionReceipt
 from src.lib.message.l2_transaction import L2TransactionReceipt
+from src.lib.utils.executor import call_rpc
 from src.lib.utils.helper import load_contract
+from src.lib.utils.instrumentation import instrumented_operation
 
 
 class EthBridger(AssetBridger):
@@ -20,7 +22,7 @@ class EthBridger(AssetBridger):
 
     @staticmethod
     async def from_provider(l2_provider):
-        return EthBridger(get_l2_network(l2_provider))
+        return EthBridger(await fetch_l2_network(l2_provider))
 
     async def get_deposit_request(self, params):
         inbox = load_contract(
@@ -42,6 +44,7 @@ class EthBridger(AssetBridger):
             "isValid": lambda: True,
         }
 
+    @instrumented_operation("eth_bridger.deposit")
     async def deposit(self, params):
         if is_l1_to_l2_transaction_request(params):
             eth_deposit = params
@@ -58,8 +61,8 @@ class EthBridger(AssetBridger):
         if "from" not in tx:
             tx["from"] = params["l1Signer"].account.address
 
-        tx_hash = params["l1Signer"].provider.eth.send_transaction(tx)
-        tx_receipt = params["l1Signer"].provider.eth.wait_for_transaction_receipt(tx_hash)
+        tx_hash = await call_rpc(params["l1Signer"].provider.eth.send_transaction, tx)
+        tx_receipt = await call_rpc(params["l1Signer"].provider.eth.wait_for_transaction_receipt, tx_hash)
 
         return L1TransactionReceipt.monkey_patch_eth_deposit_wait(tx_receipt)
 
@@ -96,8 +99,8 @@ class EthBridger(AssetBridger):
         if "from" not in tx:
             tx["from"] = params["l1Signer"].account.address
 
-        tx_hash = params["l1Signer"].provider.eth.send_transaction(tx)
-        tx_receipt = params["l1Signer"].provider.eth.wait_for_transaction_receipt(tx_hash)
+        tx_hash = await call_rpc(params["l1Signer"].provider.eth.send_transaction, tx)
+        tx_receipt = await call_rpc(params["l1Signer"].provider.eth.wait_for_transaction_receipt, tx_hash)
 
         return L1TransactionReceipt.monkey_patch_contract_call_wait(tx_receipt)
 
@@ -124,6 +127,7 @@ class EthBridger(AssetBridger):
             "estimateL1GasLimit": lambda _: 130000,
         }
 
+    @instrumented_operation("eth_bridger.withdraw")
     async def withdraw(self, params):
         if not SignerProviderUtils.signer_has_provider(params["l2Signer"]):
             raise MissingProviderArbSdkError("l2Signer")
@@ -140,8 +144,8 @@ class EthBridger(AssetBridger):
         if "from" not in tx:
             tx["from"] = params["l2Signer"].account.address
 
-        tx_hash = params["l2Signer"].provider.eth.send_transaction(tx)
+        tx_hash = await call_rpc(params["l2Signer"].provider.eth.send_transaction, tx)
 
-        tx_receipt = params["l2Signer"].provider.eth.wait_for_transaction_receipt(tx_hash)
+        tx_receipt = await call_rpc(params["l2Signer"].provider.eth.wait_for_transaction_receipt, tx_hash)
 
         return L2TransactionReceipt.monkey_patch_wait(tx_receipt)
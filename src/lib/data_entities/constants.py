@@ -5,6 +5,7 @@ ARB_ADDRESS_TABLE_ADDRESS = "0x0000000000000000000000000000000000000066"
 ARB_OWNER_PUBLIC = "0x000000000000000000000000000000000000006B"
 ARB_GAS_INFO = "0x000000000000000000000000000000000000006C"
 ARB_STATISTICS = "0x000000000000000000000000000000000000006F"
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
 ADDRESS_ALIAS_OFFSET = "0x1111000000000000000000000000000000001111"
 DISABLED_GATEWAY = "0x0000000000000000000000000000000000000001"
 CUSTOM_TOKEN_IS_ENABLED = 42161
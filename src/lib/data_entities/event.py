@@ -1,32 +1,298 @@
+from eth_abi import encode
+from eth_abi.decoding import ContextFramesBytesIO, TupleDecoder
+from eth_abi.exceptions import DecodingError
+from eth_abi.grammar import TupleType, parse
+from eth_abi.registry import registry as default_abi_registry
+from eth_utils.abi import collapse_if_tuple
+from hexbytes import HexBytes
 from web3 import Web3
-from web3.types import LogReceipt
 
+from src.lib.data_entities.errors import ArbSdkError
 from src.lib.utils.helper import CaseDict, load_abi
 
+KNOWN_EVENT_CONTRACTS = [
+    ("Bridge", False),
+    ("Inbox", False),
+    ("SequencerInbox", False),
+    ("Outbox", False),
+    ("RollupUserLogic", False),
+    ("ArbSys", False),
+    ("ArbRetryableTx", False),
+    ("L1GatewayRouter", True),
+    ("L2GatewayRouter", True),
+    ("L1ERC20Gateway", True),
+    ("L2ArbitrumGateway", True),
+    ("L1CustomGateway", True),
+    ("L2CustomGateway", True),
+]
 
-def parse_typed_logs(provider, contract_name, logs, event_name, is_classic=False):
-    contract_abi, _ = load_abi(contract_name, is_classic=is_classic)
-    contract = provider.eth.contract(abi=contract_abi)
+event_decoder_index = {}
+event_abi_decoder_index = {}
+topic_event_index = {}
+
+
+def to_topic_hex(topic):
+    return Web3.to_hex(HexBytes(topic))
+
+
+def is_hashed_when_indexed(abi_type):
+    return (
+        abi_type.is_array
+        or isinstance(abi_type, TupleType)
+        or (abi_type.base in ("string", "bytes") and not abi_type.sub)
+    )
+
+
+def named_abi_value(abi_input, value):
+    abi_type = parse(collapse_if_tuple(abi_input))
+
+    if abi_type.is_array:
+        item_abi = {**abi_input, "type": abi_type.item_type.to_type_str()}
+        return [named_abi_value(item_abi, item) for item in value]
+
+    if isinstance(abi_type, TupleType):
+        return {
+            component["name"]: named_abi_value(component, item)
+            for component, item in zip(abi_input["components"], value)
+        }
+
+    if abi_type.base == "address":
+        return Web3.to_checksum_address(value)
+
+    return value
+
+
+def argument_values_equal(expected, actual):
+    if isinstance(expected, str) and isinstance(actual, str):
+        return expected.lower() == actual.lower()
+
+    if isinstance(expected, (str, bytes)) and isinstance(actual, (str, bytes)):
+        return HexBytes(expected) == HexBytes(actual)
+
+    return expected == actual
+
+
+def topics_match(topic_filters, topics):
+    if len(topic_filters) > len(topics):
+        return False
+
+    for expected, actual in zip(topic_filters, topics):
+        if expected is None:
+            continue
+        options = expected if isinstance(expected, (list, tuple)) else [expected]
+        if to_topic_hex(actual) not in [to_topic_hex(option) for option in options]:
+            return False
+    return True
+
+
+def merge_topic_filters(topic_filters):
+    # A position is only narrowed when every event constrains it; otherwise it stays a wildcard
+    # and the surplus logs are dropped locally with topics_match.
+    merged = []
+    for position in range(max(len(topics) for topics in topic_filters)):
+        options = []
+        for topics in topic_filters:
+            expected = topics[position] if position < len(topics) else None
+            if expected is None:
+                options = None
+                break
+            for option in expected if isinstance(expected, (list, tuple)) else [expected]:
+                if option not in options:
+                    options.append(option)
+
+        merged.append(options[0] if options and len(options) == 1 else options)
+
+    while merged and merged[-1] is None:
+        merged.pop()
+    return merged
+
+
+class EventDecoder:
+    def __init__(self, contract_name, event_abi, is_classic=False):
+        self.contract_name = contract_name
+        self.is_classic = is_classic
+        self.name = event_abi["name"]
+        self.abi = event_abi
+
+        inputs = event_abi.get("inputs", [])
+        self.signature = f"{self.name}({','.join(collapse_if_tuple(i) for i in inputs)})"
+        self.topic = Web3.to_hex(Web3.keccak(text=self.signature))
+
+        self.topic_inputs = [i for i in inputs if i.get("indexed")]
+        self.data_inputs = [i for i in inputs if not i.get("indexed")]
+        self.topic_types = [
+            "bytes32" if is_hashed_when_indexed(parse(collapse_if_tuple(i))) else collapse_if_tuple(i)
+            for i in self.topic_inputs
+        ]
+        self.data_types = [collapse_if_tuple(i) for i in self.data_inputs]
+
+        self.topic_decoders = [default_abi_registry.get_decoder(t) for t in self.topic_types]
+        self.data_decoder = TupleDecoder(decoders=[default_abi_registry.get_decoder(t) for t in self.data_types])
+
+    @property
+    def topic_count(self):
+        return len(self.topic_inputs) + 1
+
+    def decode_args(self, log):
+        topics = log["topics"]
+        if len(topics) != self.topic_count:
+            raise ArbSdkError(f"Expected {self.topic_count} log topics for event {self.name}, got {len(topics)}.")
+
+        args = {}
+        for abi_input, abi_type, decoder, topic in zip(
+            self.topic_inputs, self.topic_types, self.topic_decoders, topics[1:]
+        ):
+            value = decoder(ContextFramesBytesIO(bytes(HexBytes(topic))))
+            args[abi_input["name"]] = value if abi_type == "bytes32" else named_abi_value(abi_input, value)
+
+        data_values = self.data_decoder(ContextFramesBytesIO(bytes(HexBytes(log.get("data") or b""))))
+        for abi_input, value in zip(self.data_inputs, data_values):
+            args[abi_input["name"]] = named_abi_value(abi_input, value)
+
+        return args
 
-    event_abi = next(
-        (event for event in contract_abi if event.get("name") == event_name and event.get("type") == "event"),
+    def decode(self, log):
+        return CaseDict(self.decode_args(log))
+
+    def encode_topic_value(self, abi_input, abi_type, value):
+        if abi_input["type"] == "string":
+            return Web3.to_hex(Web3.keccak(text=value))
+
+        if abi_input["type"] == "bytes":
+            return Web3.to_hex(Web3.keccak(HexBytes(value)))
+
+        if abi_type != collapse_if_tuple(abi_input):
+            raise ArbSdkError(
+                f"Filtering on indexed {abi_input['type']} argument {abi_input['name']} is not supported."
+            )
+
+        if isinstance(value, str) and abi_type.startswith("bytes"):
+            value = HexBytes(value)
+
+        return Web3.to_hex(encode([abi_type], [value]))
+
+    def build_topics(self, argument_filters=None):
+        if argument_filters is None:
+            argument_filters = {}
+
+        topics = [self.topic]
+        for abi_input, abi_type in zip(self.topic_inputs, self.topic_types):
+            value = argument_filters.get(abi_input["name"])
+            if value is None:
+                topics.append(None)
+            elif isinstance(value, (list, tuple)):
+                topics.append([self.encode_topic_value(abi_input, abi_type, v) for v in value])
+            else:
+                topics.append(self.encode_topic_value(abi_input, abi_type, value))
+
+        while topics[-1] is None:
+            topics.pop()
+        return topics
+
+    def matches_arguments(self, args, argument_filters):
+        for abi_input in self.data_inputs:
+            expected = argument_filters.get(abi_input["name"])
+            if expected is None:
+                continue
+
+            options = expected if isinstance(expected, (list, tuple)) else [expected]
+            if not any(argument_values_equal(option, args[abi_input["name"]]) for option in options):
+                return False
+        return True
+
+
+def get_event_decoders(contract_name, is_classic=False):
+    key = (contract_name, is_classic)
+    if key not in event_decoder_index:
+        contract_abi, _ = load_abi(contract_name, is_classic=is_classic)
+        decoders = {}
+        for item in contract_abi:
+            if item.get("type") == "event" and not item.get("anonymous"):
+                decoder = EventDecoder(contract_name, item, is_classic=is_classic)
+                decoders[decoder.topic] = decoder
+        event_decoder_index[key] = decoders
+    return event_decoder_index[key]
+
+
+def get_event_decoder(contract_name, event_name, is_classic=False):
+    return next(
+        (d for d in get_event_decoders(contract_name, is_classic).values() if d.name == event_name),
         None,
     )
-    if not event_abi:
-        return []
 
-    event_signature = Web3.keccak(
-        text=f"{event_name}({','.join([input['type'] for input in event_abi['inputs']])})"
-    ).hex()
 
-    parsed_logs = []
-    for log in logs:
-        log_topic = Web3.to_hex(log["topics"][0])
-        if log_topic and log_topic == event_signature:
+def get_event_decoder_for_abi(event_abi, contract_name=None, is_classic=False):
+    key = (
+        event_abi["name"],
+        tuple((i["name"], collapse_if_tuple(i), bool(i.get("indexed"))) for i in event_abi.get("inputs", [])),
+    )
+    if key not in event_abi_decoder_index:
+        event_abi_decoder_index[key] = EventDecoder(contract_name, event_abi, is_classic=is_classic)
+    return event_abi_decoder_index[key]
+
+
+def get_topic_event_index():
+    if not topic_event_index:
+        for contract_name, is_classic in KNOWN_EVENT_CONTRACTS:
+            for topic, decoder in get_event_decoders(contract_name, is_classic).items():
+                topic_event_index.setdefault(topic, []).append(decoder)
+    return topic_event_index
+
+
+def decode_logs(logs, contracts=None):
+    if contracts is None:
+        index = get_topic_event_index()
+    else:
+        index = {}
+        for contract_name, is_classic in contracts:
+            for topic, decoder in get_event_decoders(contract_name, is_classic).items():
+                index.setdefault(topic, []).append(decoder)
+
+    decoded_events = []
+    for log in logs or []:
+        topics = log.get("topics") or []
+        if not topics:
+            continue
+
+        for decoder in index.get(to_topic_hex(topics[0]), []):
+            if len(topics) != decoder.topic_count:
+                continue
             try:
-                log_receipt = LogReceipt(log)
-                decoded_log = contract.events[event_name]().process_log(log_receipt)
-                parsed_logs.append(CaseDict(decoded_log["args"]))
-            except Exception as e:
-                raise e
-    return parsed_logs
+                args = decoder.decode(log)
+            except DecodingError:
+                continue
+
+            decoded_events.append(
+                CaseDict(
+                    {
+                        "contractName": decoder.contract_name,
+                        "name": decoder.name,
+                        "topic": decoder.topic,
+                        "event": args,
+                        "address": log.get("address"),
+                        "blockNumber": log.get("blockNumber"),
+                        "transactionHash": log.get("transactionHash"),
+                        "logIndex": log.get("logIndex"),
+                    }
+                )
+            )
+            break
+
+    return decoded_events
+
+
+def select_decoded_events(decoded_events, contract_name, event_name, is_classic=False):
+    decoder = get_event_decoder(contract_name, event_name, is_classic)
+    if not decoder:
+        return []
+    return [e.event for e in decoded_events if e.topic == decoder.topic]
+
+
+def parse_typed_logs(provider, contract_name, logs, event_name, is_classic=False):
+    decoder = get_event_decoder(contract_name, event_name, is_classic)
+    if not decoder:
+        return []
+
+    return [
+        decoder.decode(log) for log in logs if log.get("topics") and to_topic_hex(log["topics"][0]) == decoder.topic
+    ]
@@ -1,9 +1,11 @@
-from web3 import Web3
+from web3 import AsyncWeb3, Web3
 
 from src.lib.data_entities.constants import SEVEN_DAYS_IN_SECONDS
 from src.lib.data_entities.errors import ArbSdkError
 from src.lib.data_entities.signer_or_provider import SignerOrProvider
+from src.lib.utils.chain_id import fetch_chain_id, get_chain_id
 from src.lib.utils.helper import CaseDict, load_contract
+from src.lib.utils.multi_call_batcher import read_contracts
 
 
 class Network(CaseDict):
@@ -348,10 +350,10 @@ def get_network(signer_or_provider_or_chain_id, layer):
         chain_id = signer_or_provider_or_chain_id
 
     elif isinstance(signer_or_provider_or_chain_id, Web3):
-        chain_id = signer_or_provider_or_chain_id.eth.chain_id
+        chain_id = get_chain_id(signer_or_provider_or_chain_id)
 
     elif isinstance(signer_or_provider_or_chain_id, SignerOrProvider):
-        chain_id = signer_or_provider_or_chain_id.provider.eth.chain_id
+        chain_id = get_chain_id(signer_or_provider_or_chain_id.provider)
     else:
         raise ArbSdkError(
             f"Please provide a Web3 instance or chain ID. You have provided {type(signer_or_provider_or_chain_id)}"
@@ -372,6 +374,25 @@ def get_l2_network(signer_or_provider_or_chain_id):
     return get_network(signer_or_provider_or_chain_id, 2)
 
 
+async def fetch_network(signer_or_provider_or_chain_id, layer):
+    # Like get_network, but also accepts AsyncWeb3 providers, whose chain id has to be awaited.
+    provider = signer_or_provider_or_chain_id
+    if isinstance(provider, SignerOrProvider):
+        provider = provider.provider
+
+    if isinstance(provider, AsyncWeb3):
+        return get_network(await fetch_chain_id(provider), layer)
+    return get_network(signer_or_provider_or_chain_id, layer)
+
+
+async def fetch_l1_network(signer_or_provider_or_chain_id):
+    return await fetch_network(signer_or_provider_or_chain_id, 1)
+
+
+async def fetch_l2_network(signer_or_provider_or_chain_id):
+    return await fetch_network(signer_or_provider_or_chain_id, 2)
+
+
 def get_eth_bridge_information(rollup_contract_address, l1_signer_or_provider):
     rollup = load_contract(
         provider=l1_signer_or_provider,
@@ -379,10 +400,14 @@ def get_eth_bridge_information(rollup_contract_address, l1_signer_or_provider):
         address=rollup_contract_address,
         is_classic=False,
     )
-    bridge = rollup.functions.bridge().call()
-    inbox = rollup.functions.inbox().call()
-    sequencer_inbox = rollup.functions.sequencerInbox().call()
-    outbox = rollup.functions.outbox().call()
+    bridge, inbox, sequencer_inbox, outbox = read_contracts(
+        [
+            rollup.functions.bridge(),
+            rollup.functions.inbox(),
+            rollup.functions.sequencerInbox(),
+            rollup.functions.outbox(),
+        ]
+    )
 
     return EthBridge(
         bridge=bridge,
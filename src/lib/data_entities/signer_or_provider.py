@@ -1,8 +1,9 @@
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
-from web3 import Web3
+from web3 import AsyncWeb3, Web3
 
 from src.lib.data_entities.errors import ArbSdkError, MissingProviderArbSdkError
+from src.lib.utils.chain_id import fetch_chain_id
 
 
 class SignerOrProvider:
@@ -23,7 +24,7 @@ class SignerProviderUtils:
         elif isinstance(signer_or_provider, SignerOrProvider):
             return True
 
-        elif isinstance(signer_or_provider, Web3):
+        elif isinstance(signer_or_provider, (Web3, AsyncWeb3)):
             return False
 
         else:
@@ -31,7 +32,7 @@ class SignerProviderUtils:
 
     @staticmethod
     def get_provider(signer_or_provider):
-        if isinstance(signer_or_provider, Web3):
+        if isinstance(signer_or_provider, (Web3, AsyncWeb3)):
             return signer_or_provider
 
         elif isinstance(signer_or_provider, SignerOrProvider):
@@ -57,7 +58,7 @@ class SignerProviderUtils:
         elif isinstance(signer_or_provider, SignerOrProvider):
             return signer_or_provider.account
 
-        elif isinstance(signer_or_provider, Web3):
+        elif isinstance(signer_or_provider, (Web3, AsyncWeb3)):
             return None
 
         else:
@@ -86,7 +87,7 @@ class SignerProviderUtils:
         elif isinstance(signer_or_provider, SignerOrProvider):
             provider = signer_or_provider.provider
 
-        elif isinstance(signer_or_provider, Web3):
+        elif isinstance(signer_or_provider, (Web3, AsyncWeb3)):
             provider = signer_or_provider
 
         else:
@@ -95,7 +96,7 @@ class SignerProviderUtils:
         if provider is None:
             raise MissingProviderArbSdkError(signer_or_provider)
 
-        provider_chain_id = provider.eth.chain_id
+        provider_chain_id = await fetch_chain_id(provider)
         if provider_chain_id != chain_id:
             raise ArbSdkError(
                 f"Signer/provider chain id: {provider_chain_id} does not match provided chain id: {chain_id}."
@@ -7,7 +7,9 @@ from src.lib.data_entities.errors import ArbSdkError
 from src.lib.data_entities.message import InboxMessageKind
 from src.lib.data_entities.networks import l1_networks
 from src.lib.data_entities.signer_or_provider import SignerProviderUtils
+from src.lib.utils.chain_id import fetch_chain_id
 from src.lib.utils.event_fetcher import EventFetcher
+from src.lib.utils.executor import call_rpc
 from src.lib.utils.helper import (
     format_contract_output,
     load_contract,
@@ -26,7 +28,7 @@ class InboxTools:
             raise ArbSdkError(f"L1Network not found for chain id: {l2_network.partner_chain_id}.")
 
     async def find_first_block_below(self, block_number, block_timestamp):
-        block = await self.l1_provider.eth.get_block(block_number)
+        block = await call_rpc(self.l1_provider.eth.get_block, block_number)
         diff = block.timestamp - block_timestamp
         if diff < 0:
             return block
@@ -51,15 +53,16 @@ class InboxTools:
 
         contract_creation = self.is_contract_creation(transaction_l2_request)
 
-        gas_components = node_interface.functions.gasEstimateComponents(
-            transaction_l2_request["to"] or Web3.to_checksum_address("0x0000000000000000000000000000000000000000"),
-            contract_creation,
-            transaction_l2_request["data"],
-        ).call(
+        gas_components = await call_rpc(
+            node_interface.functions.gasEstimateComponents(
+                transaction_l2_request["to"] or Web3.to_checksum_address("0x0000000000000000000000000000000000000000"),
+                contract_creation,
+                transaction_l2_request["data"],
+            ).call,
             {
                 "from": transaction_l2_request["from"],
                 "value": transaction_l2_request["value"],
-            }
+            },
         )
 
         gas_components = format_contract_output(node_interface, "gasEstimateComponents", gas_components)
@@ -191,7 +194,7 @@ class InboxTools:
         if not event_info:
             return None
 
-        block = await self.l1_provider.eth.get_block(event_info.block_hash)
+        block = await call_rpc(self.l1_provider.eth.get_block, event_info.block_hash)
 
         if overrides is None:
             overrides = {}
@@ -199,15 +202,16 @@ class InboxTools:
         if "from" not in overrides:
             overrides["from"] = self.l1_signer.account.address
 
-        tx_hash = sequencer_inbox.functions.forceInclusion(
+        force_inclusion = sequencer_inbox.functions.forceInclusion(
             event_info.event.message_index + 1,
             event_info.event.kind,
             [event_info.block_number, block.timestamp],
             event_info.event.base_fee_l1,
             event_info.event.sender,
             event_info.event.message_data_hash,
-        ).transact(overrides)
-        return self.l1_provider.eth.wait_for_transaction_receipt(tx_hash)
+        )
+        tx_hash = await call_rpc(force_inclusion.transact, overrides)
+        return await call_rpc(self.l1_provider.eth.wait_for_transaction_receipt, tx_hash)
 
     async def send_l2_signed_tx(self, signed_tx):
         delayed_inbox = load_contract(
@@ -225,13 +229,14 @@ class InboxTools:
 
         send_data_bytes = packed_message_type + signed_tx_bytes
 
-        transaction = delayed_inbox.functions.sendL2Message(send_data_bytes).transact(
+        transaction = await call_rpc(
+            delayed_inbox.functions.sendL2Message(send_data_bytes).transact,
             {
                 "from": self.l1_signer.account.address,
-            }
+            },
         )
 
-        tx_receipt = self.l1_provider.eth.wait_for_transaction_receipt(transaction)
+        tx_receipt = await call_rpc(self.l1_provider.eth.wait_for_transaction_receipt, transaction)
         return tx_receipt
 
     async def sign_l2_tx(self, tx_request, l2_signer):
@@ -239,14 +244,14 @@ class InboxTools:
         contract_creation = self.is_contract_creation(tx)
 
         if not is_defined(tx.get("nonce", None)):
-            tx["nonce"] = l2_signer.provider.eth.get_transaction_count(l2_signer.account.address)
+            tx["nonce"] = await call_rpc(l2_signer.provider.eth.get_transaction_count, l2_signer.account.address)
 
         if tx.get("type") == 1 or "gasPrice" in tx:
             if "gasPrice" in tx:
-                tx["gasPrice"] = l2_signer.provider.eth.gas_price
+                tx["gasPrice"] = await call_rpc(lambda: l2_signer.provider.eth.gas_price)
         else:
             if not is_defined(tx.get("maxFeePerGas", None)):
-                fee_data = l2_signer.provider.eth.fee_history(1, "latest", reward_percentiles=[])
+                fee_data = await call_rpc(l2_signer.provider.eth.fee_history, 1, "latest", reward_percentiles=[])
                 base_fee = fee_data["baseFeePerGas"][0]
                 priority_fee = Web3.to_wei(2, "gwei")
 
@@ -256,7 +261,7 @@ class InboxTools:
             tx["type"] = 2
 
         tx["from"] = l2_signer.account.address
-        tx["chainId"] = l2_signer.provider.eth.chain_id
+        tx["chainId"] = await fetch_chain_id(l2_signer.provider)
 
         if not is_defined(tx.get("to", None)):
             tx["to"] = Web3.to_checksum_address("0x0000000000000000000000000000000000000000")
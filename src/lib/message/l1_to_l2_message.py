@@ -6,11 +6,14 @@ from web3.exceptions import ContractCustomError
 
 from src.lib.data_entities.constants import ADDRESS_ZERO, ARB_RETRYABLE_TX_ADDRESS
 from src.lib.data_entities.errors import ArbSdkError
-from src.lib.data_entities.networks import get_l2_network
+from src.lib.data_entities.networks import fetch_l2_network, get_l2_network
 from src.lib.data_entities.signer_or_provider import SignerProviderUtils
 from src.lib.message.l2_transaction import L2TransactionReceipt
+from src.lib.utils.chain_id import get_chain_id
 from src.lib.utils.event_fetcher import EventFetcher
+from src.lib.utils.executor import call_rpc, gather_or_cancel
 from src.lib.utils.helper import get_address, load_contract
+from src.lib.utils.instrumentation import instrumented_operation
 from src.lib.utils.lib import get_transaction_receipt, is_defined
 
 
@@ -190,7 +193,9 @@ class L1ToL2MessageReader(L1ToL2Message):
 
             if len(redeem_events) == 1:
                 try:
-                    return self.l2_provider.eth.get_transaction_receipt(redeem_events[0]["retryTxHash"])
+                    return await call_rpc(
+                        self.l2_provider.eth.get_transaction_receipt, redeem_events[0]["retryTxHash"]
+                    )
 
                 except Exception:
                     pass
@@ -201,8 +206,9 @@ class L1ToL2MessageReader(L1ToL2Message):
 
         return None
 
+    @instrumented_operation("l1_to_l2_message.get_successful_redeem")
     async def get_successful_redeem(self):
-        l2_network = get_l2_network(self.l2_provider)
+        l2_network = await fetch_l2_network(self.l2_provider)
         event_fetcher = EventFetcher(self.l2_provider)
         creation_receipt = await self.get_retryable_creation_receipt()
 
@@ -222,24 +228,26 @@ class L1ToL2MessageReader(L1ToL2Message):
 
         increment = 1000
 
-        from_block = self.l2_provider.eth.get_block(creation_receipt.blockNumber)
+        from_block = await call_rpc(self.l2_provider.eth.get_block, creation_receipt.blockNumber)
 
         timeout = from_block.timestamp + l2_network.retryable_lifetime_seconds
 
         queried_range = []
-        max_block = self.l2_provider.eth.block_number
+        max_block = await call_rpc(lambda: self.l2_provider.eth.block_number)
 
         while from_block.number < max_block:
             to_block_number = min(from_block.number + increment, max_block)
 
             outer_block_range = {"from": from_block.number, "to": to_block_number}
 
-            queried_range.append(outer_block_range)
-
-            redeem_events = await event_fetcher.get_events(
+            # LifetimeExtended is fetched in the same query so the ranges never need to be scanned twice.
+            events = await event_fetcher.get_events_multi(
                 contract_factory="ArbRetryableTx",
-                event_name="RedeemScheduled",
-                argument_filters={"ticketId": self.retryable_creation_id},
+                event_names=["RedeemScheduled", "LifetimeExtended"],
+                argument_filters={
+                    "RedeemScheduled": {"ticketId": self.retryable_creation_id},
+                    "LifetimeExtended": {"ticketId": self.retryable_creation_id},
+                },
                 filter={
                     "fromBlock": outer_block_range["from"],
                     "toBlock": outer_block_range["to"],
@@ -247,8 +255,14 @@ class L1ToL2MessageReader(L1ToL2Message):
                 },
                 is_classic=False,
             )
+            redeem_events = events["RedeemScheduled"]
+            outer_block_range["keepAliveEvents"] = events["LifetimeExtended"]
 
-            reedems = [await get_transaction_receipt(self.l2_provider, e.event["retryTxHash"]) for e in redeem_events]
+            queried_range.append(outer_block_range)
+
+            reedems = await gather_or_cancel(
+                *[get_transaction_receipt(self.l2_provider, e.event["retryTxHash"]) for e in redeem_events]
+            )
 
             successful_redeems = [r for r in reedems if r is not None and r.status == 1]
 
@@ -263,22 +277,12 @@ class L1ToL2MessageReader(L1ToL2Message):
                     "status": L1ToL2MessageStatus.REDEEMED,
                 }
 
-            to_block = self.l2_provider.eth.get_block(to_block_number)
+            to_block = await call_rpc(self.l2_provider.eth.get_block, to_block_number)
             if to_block.timestamp > timeout:
                 while len(queried_range) > 0:
                     block_range = queried_range.pop(0)
 
-                    keep_alive_events = await event_fetcher.get_events(
-                        contract_factory="ArbRetryableTx",
-                        event_name="LifetimeExtended",
-                        argument_filters={"retryableCreationId": self.retryable_creation_id},
-                        filter={
-                            "fromBlock": block_range["from"],
-                            "toBlock": block_range["to"],
-                            "address": ARB_RETRYABLE_TX_ADDRESS,
-                        },
-                        is_classic=False,
-                    )
+                    keep_alive_events = block_range["keepAliveEvents"]
 
                     if len(keep_alive_events) > 0:
                         timeout = sorted(
@@ -305,7 +309,7 @@ class L1ToL2MessageReader(L1ToL2Message):
         return await self.retryable_exists()
 
     async def retryable_exists(self):
-        current_timestamp = (self.l2_provider.eth.get_block("latest")).timestamp
+        current_timestamp = (await call_rpc(self.l2_provider.eth.get_block, "latest")).timestamp
         try:
             timeout_timestamp = await self.get_timeout()
             return current_timestamp <= timeout_timestamp
@@ -317,6 +321,7 @@ class L1ToL2MessageReader(L1ToL2Message):
         except Exception as err:
             raise err
 
+    @instrumented_operation("l1_to_l2_message.status")
     async def status(self):
         return (await self.get_successful_redeem())["status"]
 
@@ -345,7 +350,7 @@ class L1ToL2MessageReader(L1ToL2Message):
             provider=l2_provider,
             is_classic=False,
         )
-        return arb_retryable_tx_contract.functions.getLifetime().call()
+        return await call_rpc(arb_retryable_tx_contract.functions.getLifetime().call)
 
     async def get_timeout(self):
         arb_retryable_tx_contract = load_contract(
@@ -354,7 +359,7 @@ class L1ToL2MessageReader(L1ToL2Message):
             provider=self.l2_provider,
             is_classic=False,
         )
-        return arb_retryable_tx_contract.functions.getTimeout(self.retryable_creation_id).call()
+        return await call_rpc(arb_retryable_tx_contract.functions.getTimeout(self.retryable_creation_id).call)
 
     async def get_beneficiary(self):
         arb_retryable_tx_contract = load_contract(
@@ -363,7 +368,7 @@ class L1ToL2MessageReader(L1ToL2Message):
             provider=self.l2_provider,
             is_classic=False,
         )
-        return arb_retryable_tx_contract.functions.getBeneficiary(self.retryable_creation_id).call()
+        return await call_rpc(arb_retryable_tx_contract.functions.getBeneficiary(self.retryable_creation_id).call)
 
 
 class L1ToL2MessageReaderClassic:
@@ -421,6 +426,7 @@ class L1ToL2MessageReaderClassic:
             )
         return self.retryable_creation_receipt
 
+    @instrumented_operation("l1_to_l2_message.status")
     async def status(self):
         creation_receipt = await self.get_retryable_creation_receipt()
 
@@ -476,9 +482,11 @@ class L1ToL2MessageWriter(L1ToL2MessageReader):
                 if not overrides["gas"]:
                     del overrides["gas"]
 
-            redeem_hash = arb_retryable_tx.functions.redeem(self.retryable_creation_id).transact(overrides)
+            redeem_hash = await call_rpc(
+                arb_retryable_tx.functions.redeem(self.retryable_creation_id).transact, overrides
+            )
 
-            tx_receipt = self.l2_signer.provider.eth.wait_for_transaction_receipt(redeem_hash)
+            tx_receipt = await call_rpc(self.l2_signer.provider.eth.wait_for_transaction_receipt, redeem_hash)
 
             return L2TransactionReceipt.to_redeem_transaction(
                 L2TransactionReceipt.monkey_patch_wait(tx_receipt), self.l2_provider
@@ -508,9 +516,9 @@ class L1ToL2MessageWriter(L1ToL2MessageReader):
                 overrides["gas"] = overrides.pop("gasLimit")
                 if not overrides["gas"]:
                     del overrides["gas"]
-            tx_hash = await arb_retryable_tx.functions.cancel(self.retryable_creation_id).transact(overrides)
+            tx_hash = await call_rpc(arb_retryable_tx.functions.cancel(self.retryable_creation_id).transact, overrides)
 
-            receipt = await self.l2_signer.provider.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await call_rpc(self.l2_signer.provider.eth.wait_for_transaction_receipt, tx_hash)
 
             return receipt
         else:
@@ -538,10 +546,12 @@ class L1ToL2MessageWriter(L1ToL2MessageReader):
                 overrides["gas"] = overrides.pop("gasLimit")
                 if not overrides["gas"]:
                     del overrides["gas"]
-                    
-            keepalive_tx = await arb_retryable_tx.functions.keepalive(self.retryable_creation_id).transact(overrides)
 
-            receipt = await self.l2_signer.provider.eth.wait_for_transaction_receipt(keepalive_tx)
+            keepalive_tx = await call_rpc(
+                arb_retryable_tx.functions.keepalive(self.retryable_creation_id).transact, overrides
+            )
+
+            receipt = await call_rpc(self.l2_signer.provider.eth.wait_for_transaction_receipt, keepalive_tx)
 
             return receipt
         else:
@@ -584,7 +594,7 @@ class EthDepositMessage:
 
     @staticmethod
     def from_event_components(l2_provider, message_number, sender_addr, inbox_message_event_data):
-        chain_id = l2_provider.eth.chain_id
+        chain_id = get_chain_id(l2_provider)
         parsed_data = EthDepositMessage.parse_eth_deposit_data(inbox_message_event_data)
         return EthDepositMessage(
             l2_provider,
@@ -609,6 +619,7 @@ class EthDepositMessage:
         value = int("0x" + value_hex, 16)
         return {"to": to_address, "value": value}
 
+    @instrumented_operation("eth_deposit_message.status")
     async def status(self):
         receipt = await get_transaction_receipt(self.l2_provider, self.l2_deposit_tx_hash)
         if receipt is None:
@@ -1,9 +1,10 @@
 from src.lib.data_entities.errors import MissingProviderArbSdkError
-from src.lib.data_entities.networks import get_l2_network
+from src.lib.data_entities.networks import fetch_l2_network
 from src.lib.data_entities.signer_or_provider import SignerProviderUtils
 from src.lib.data_entities.transaction_request import is_l1_to_l2_transaction_request
 from src.lib.message.l1_to_l2_message_gas_estimator import L1ToL2MessageGasEstimator
 from src.lib.message.l1_transaction import L1TransactionReceipt
+from src.lib.utils.executor import call_rpc
 from src.lib.utils.helper import load_contract
 from src.lib.utils.lib import get_base_fee
 
@@ -39,7 +40,7 @@ class L1ToL2MessageCreator:
 
         estimates = await L1ToL2MessageCreator.get_ticket_estimate(parsed_params, l1_provider, l2_provider, options)
 
-        l2_network = get_l2_network(l2_provider)
+        l2_network = await fetch_l2_network(l2_provider)
         inbox_contract = load_contract(
             contract_name="Inbox",
             address=l2_network.eth_bridge.inbox,
@@ -108,7 +109,7 @@ class L1ToL2MessageCreator:
         if "from" not in tx:
             tx["from"] = self.l1_signer.account.address
 
-        tx_hash = self.l1_signer.provider.eth.send_transaction(tx)
+        tx_hash = await call_rpc(self.l1_signer.provider.eth.send_transaction, tx)
 
-        tx_receipt = self.l1_signer.provider.eth.wait_for_transaction_receipt(tx_hash)
+        tx_receipt = await call_rpc(self.l1_signer.provider.eth.wait_for_transaction_receipt, tx_hash)
         return L1TransactionReceipt.monkey_patch_wait(tx_receipt)
@@ -2,8 +2,9 @@ from web3 import Web3
 
 from src.lib.data_entities.constants import NODE_INTERFACE_ADDRESS
 from src.lib.data_entities.errors import ArbSdkError
-from src.lib.data_entities.networks import get_l2_network
+from src.lib.data_entities.networks import fetch_l2_network
 from src.lib.data_entities.retryable_data import RetryableDataTools
+from src.lib.utils.executor import call_rpc
 from src.lib.utils.helper import CaseDict, load_contract
 from src.lib.utils.lib import get_base_fee, is_defined
 
@@ -60,7 +61,7 @@ class L1ToL2MessageGasEstimator:
         options=None,
     ):
         defaulted_options = self.apply_submission_price_defaults(options)
-        network = get_l2_network(self.l2_provider)
+        network = await fetch_l2_network(self.l2_provider)
         inbox = load_contract(
             contract_name="Inbox",
             address=network.ethBridge.inbox,
@@ -70,7 +71,7 @@ class L1ToL2MessageGasEstimator:
 
         base = defaulted_options.get("base", None)
         if base is None:
-            base = inbox.functions.calculateRetryableSubmissionFee(call_data_size, l1_base_fee).call()
+            base = await call_rpc(inbox.functions.calculateRetryableSubmissionFee(call_data_size, l1_base_fee).call)
 
         return self.percent_increase(base, defaulted_options["percentIncrease"])
 
@@ -85,15 +86,17 @@ class L1ToL2MessageGasEstimator:
             is_classic=False,
         )
 
-        return node_interface.functions.estimateRetryableTicket(
-            retryable_data["from"],
-            sender_deposit,
-            retryable_data["to"],
-            retryable_data["l2CallValue"],
-            retryable_data["excessFeeRefundAddress"],
-            retryable_data["callValueRefundAddress"],
-            retryable_data["data"],
-        ).estimate_gas()
+        return await call_rpc(
+            node_interface.functions.estimateRetryableTicket(
+                retryable_data["from"],
+                sender_deposit,
+                retryable_data["to"],
+                retryable_data["l2CallValue"],
+                retryable_data["excessFeeRefundAddress"],
+                retryable_data["callValueRefundAddress"],
+                retryable_data["data"],
+            ).estimate_gas
+        )
 
     async def estimate_max_fee_per_gas(self, options=None):
         if options is None:
@@ -102,7 +105,7 @@ class L1ToL2MessageGasEstimator:
 
         base = max_fee_per_gas_defaults.get("base", None)
         if base is None:
-            base = self.l2_provider.eth.gas_price
+            base = await call_rpc(lambda: self.l2_provider.eth.gas_price)
 
         return self.percent_increase(base, max_fee_per_gas_defaults["percentIncrease"])
 
@@ -168,7 +171,7 @@ class L1ToL2MessageGasEstimator:
         retryable = None
 
         try:
-            res = l1_provider.eth.call(null_data_request)
+            res = await call_rpc(l1_provider.eth.call, null_data_request)
             retryable = RetryableDataTools.try_parse_error(res)
             if not is_defined(retryable):
                 raise ArbSdkError(f"No retryable data found in error: {res}")
@@ -1,7 +1,7 @@
 from src.lib.data_entities.errors import ArbSdkError
-from src.lib.data_entities.event import parse_typed_logs
+from src.lib.data_entities.event import decode_logs, parse_typed_logs, select_decoded_events
 from src.lib.data_entities.message import InboxMessageKind
-from src.lib.data_entities.networks import get_l2_network
+from src.lib.data_entities.networks import fetch_l2_network
 from src.lib.data_entities.signer_or_provider import (
     SignerProviderUtils,
 )
@@ -46,7 +46,7 @@ class L1TransactionReceipt(CaseDict):
 
     async def is_classic(self, l2_signer_or_provider):
         provider = SignerProviderUtils.get_provider_or_throw(l2_signer_or_provider)
-        network = get_l2_network(provider)
+        network = await fetch_l2_network(provider)
         return self.block_number < network.nitro_genesis_l1_block
 
     def get_message_delivered_events(self, provider):
@@ -62,8 +62,9 @@ class L1TransactionReceipt(CaseDict):
         )
 
     def get_message_events(self, provider):
-        bridge_messages = self.get_message_delivered_events(provider)
-        inbox_messages = self.get_inbox_message_delivered_events(provider)
+        decoded_events = decode_logs(self.logs)
+        bridge_messages = select_decoded_events(decoded_events, "Bridge", "MessageDelivered")
+        inbox_messages = select_decoded_events(decoded_events, "Inbox", "InboxMessageDelivered")
 
         if len(bridge_messages) != len(inbox_messages):
             raise ArbSdkError(
@@ -105,7 +106,7 @@ class L1TransactionReceipt(CaseDict):
         return eth_deposit_messages
 
     async def get_l1_to_l2_messages_classic(self, l2_provider):
-        network = get_l2_network(l2_provider)
+        network = await fetch_l2_network(l2_provider)
         chain_id = network.chain_id
         is_classic = await self.is_classic(l2_provider)
 
@@ -120,7 +121,7 @@ class L1TransactionReceipt(CaseDict):
 
     async def get_l1_to_l2_messages(self, l2_signer_or_provider):
         provider = SignerProviderUtils.get_provider_or_throw(l2_signer_or_provider)
-        network = get_l2_network(provider)
+        network = await fetch_l2_network(provider)
         chain_id = network.chain_id
         is_classic = await self.is_classic(provider)
 
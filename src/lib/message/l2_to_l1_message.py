@@ -5,9 +5,12 @@ from web3.providers import BaseProvider
 
 import src.lib.message.l2_to_l1_message_classic as classic
 import src.lib.message.l2_to_l1_message_nitro as nitro
+from src.lib.data_entities.constants import ARB_SYS_ADDRESS
 from src.lib.data_entities.errors import ArbSdkError
-from src.lib.data_entities.networks import get_l2_network
+from src.lib.data_entities.networks import fetch_l2_network
 from src.lib.data_entities.signer_or_provider import SignerProviderUtils
+from src.lib.utils.event_fetcher import DEFAULT_STREAM_BLOCK_RANGE_SIZE, EventFetcher
+from src.lib.utils.instrumentation import instrumented_operation
 
 
 class L2ToL1Message:
@@ -16,23 +19,14 @@ class L2ToL1Message:
         return "indexInBatch" in event
 
     @staticmethod
-    def from_event(l1_signer_or_provider, event, l1_provider: Optional[BaseProvider] = None):
+    def from_event(l1_signer_or_provider, event, l1_provider: Optional[BaseProvider] = None, l2_network=None):
         if SignerProviderUtils.is_signer(l1_signer_or_provider):
-            return L2ToL1MessageWriter(l1_signer_or_provider, event, l1_provider)
+            return L2ToL1MessageWriter(l1_signer_or_provider, event, l1_provider, l2_network)
         else:
-            return L2ToL1MessageReader(l1_signer_or_provider, event)
+            return L2ToL1MessageReader(l1_signer_or_provider, event, l2_network)
 
     @staticmethod
-    async def get_l2_to_l1_events(
-        l2_provider,
-        filter,
-        position=None,
-        destination=None,
-        hash=None,
-        index_in_batch=None,
-    ):
-        l2_network = get_l2_network(l2_provider)
-
+    def split_filter_at_nitro_genesis(l2_network, filter):
         def in_classic_range(block_tag, nitro_gen_block):
             if isinstance(block_tag, str):
                 if block_tag == "earliest":
@@ -63,6 +57,48 @@ class L2ToL1Message:
             "toBlock": in_nitro_range(filter["toBlock"], l2_network.nitro_genesis_block),
         }
 
+        return classic_filter, nitro_filter
+
+    @staticmethod
+    async def get_l2_to_l1_events(
+        l2_provider,
+        filter,
+        position=None,
+        destination=None,
+        hash=None,
+        index_in_batch=None,
+        block_range_size=None,
+    ):
+        l2_network = await fetch_l2_network(l2_provider)
+        classic_filter, nitro_filter = L2ToL1Message.split_filter_at_nitro_genesis(l2_network, filter)
+
+        if (
+            classic_filter["fromBlock"] != classic_filter["toBlock"]
+            and nitro_filter["fromBlock"] != nitro_filter["toBlock"]
+        ):
+            # The range spans the nitro upgrade: fetch both event types with a single query over the union.
+            events = await EventFetcher(l2_provider).get_events_multi(
+                contract_factory="ArbSys",
+                event_names=["L2ToL1Transaction", "L2ToL1Tx"],
+                argument_filters={
+                    "L2ToL1Transaction": classic.L2ToL1MessageClassic.get_l2_to_l1_event_arguments(
+                        position, destination, hash
+                    ),
+                    "L2ToL1Tx": nitro.L2ToL1MessageNitro.get_l2_to_l1_event_arguments(position, destination, hash),
+                },
+                filter={
+                    "fromBlock": classic_filter["fromBlock"],
+                    "toBlock": nitro_filter["toBlock"],
+                    "address": ARB_SYS_ADDRESS,
+                },
+                is_classic=False,
+                block_range_size=block_range_size,
+            )
+            return (
+                classic.L2ToL1MessageClassic.format_l2_to_l1_events(events["L2ToL1Transaction"], index_in_batch)
+                + events["L2ToL1Tx"]
+            )
+
         log_queries = []
         if classic_filter["fromBlock"] != classic_filter["toBlock"]:
             log_queries.append(
@@ -73,28 +109,73 @@ class L2ToL1Message:
                     destination,
                     hash,
                     index_in_batch,
+                    block_range_size,
                 )
             )
 
         if nitro_filter["fromBlock"] != nitro_filter["toBlock"]:
             log_queries.append(
-                nitro.L2ToL1MessageNitro.get_l2_to_l1_events(l2_provider, nitro_filter, position, destination, hash)
+                nitro.L2ToL1MessageNitro.get_l2_to_l1_events(
+                    l2_provider, nitro_filter, position, destination, hash, block_range_size
+                )
             )
 
         results = await asyncio.gather(*log_queries)
         return [event for result in results for event in result]
 
+    @staticmethod
+    async def iter_l2_to_l1_events(
+        l2_provider,
+        filter,
+        position=None,
+        destination=None,
+        hash=None,
+        index_in_batch=None,
+        block_range_size=DEFAULT_STREAM_BLOCK_RANGE_SIZE,
+    ):
+        l2_network = await fetch_l2_network(l2_provider)
+        classic_filter, nitro_filter = L2ToL1Message.split_filter_at_nitro_genesis(l2_network, filter)
+
+        streams = []
+        if classic_filter["fromBlock"] != classic_filter["toBlock"]:
+            streams.append(
+                classic.L2ToL1MessageClassic.iter_l2_to_l1_events(
+                    l2_provider,
+                    classic_filter,
+                    position,
+                    destination,
+                    hash,
+                    index_in_batch,
+                    block_range_size,
+                )
+            )
+
+        if nitro_filter["fromBlock"] != nitro_filter["toBlock"]:
+            streams.append(
+                nitro.L2ToL1MessageNitro.iter_l2_to_l1_events(
+                    l2_provider, nitro_filter, position, destination, hash, block_range_size
+                )
+            )
+
+        try:
+            for stream in streams:
+                async for event in stream:
+                    yield event
+        finally:
+            for stream in streams:
+                await stream.aclose()
+
 
 class L2ToL1MessageReader(L2ToL1Message):
-    def __init__(self, l1_provider, event):
+    def __init__(self, l1_provider, event, l2_network=None):
         super().__init__()
         if self.is_classic(event):
             self.classic_reader = classic.L2ToL1MessageReaderClassic(
-                l1_provider, event["batchNumber"], event["indexInBatch"]
+                l1_provider, event["batchNumber"], event["indexInBatch"], l2_network
             )
             self.nitro_reader = None
         else:
-            self.nitro_reader = nitro.L2ToL1MessageReaderNitro(l1_provider, event)
+            self.nitro_reader = nitro.L2ToL1MessageReaderNitro(l1_provider, event, l2_network)
             self.classic_reader = None
 
     async def get_outbox_proof(self, l2_provider):
@@ -103,6 +184,7 @@ class L2ToL1MessageReader(L2ToL1Message):
         else:
             return await self.classic_reader.try_get_proof(l2_provider)
 
+    @instrumented_operation("l2_to_l1_message.status")
     async def status(self, l2_provider):
         if self.nitro_reader:
             return await self.nitro_reader.status(l2_provider)
@@ -123,15 +205,15 @@ class L2ToL1MessageReader(L2ToL1Message):
 
 
 class L2ToL1MessageWriter(L2ToL1MessageReader):
-    def __init__(self, l1_signer, event, l1_provider=None):
-        super().__init__(l1_provider or l1_signer.provider, event)
+    def __init__(self, l1_signer, event, l1_provider=None, l2_network=None):
+        super().__init__(l1_provider or l1_signer.provider, event, l2_network)
         if self.is_classic(event):
             self.classic_writer = classic.L2ToL1MessageWriterClassic(
-                l1_signer, event["batchNumber"], event["indexInBatch"], l1_provider
+                l1_signer, event["batchNumber"], event["indexInBatch"], l1_provider, l2_network
             )
             self.nitro_writer = None
         else:
-            self.nitro_writer = nitro.L2ToL1MessageWriterNitro(l1_signer, event, l1_provider)
+            self.nitro_writer = nitro.L2ToL1MessageWriterNitro(l1_signer, event, l1_provider, l2_network)
             self.classic_writer = None
 
     async def execute(self, l2_provider, overrides=None):
@@ -3,10 +3,12 @@ import asyncio
 from src.lib.data_entities.constants import ARB_SYS_ADDRESS, NODE_INTERFACE_ADDRESS
 from src.lib.data_entities.errors import ArbSdkError
 from src.lib.data_entities.message import L2ToL1MessageStatus
-from src.lib.data_entities.networks import get_l2_network
+from src.lib.data_entities.networks import fetch_l2_network
 from src.lib.data_entities.signer_or_provider import SignerProviderUtils
-from src.lib.utils.event_fetcher import EventFetcher
+from src.lib.utils.event_fetcher import DEFAULT_STREAM_BLOCK_RANGE_SIZE, EventFetcher
+from src.lib.utils.executor import call_rpc
 from src.lib.utils.helper import load_contract
+from src.lib.utils.instrumentation import instrumented_operation
 from src.lib.utils.lib import is_defined
 
 
@@ -40,11 +42,24 @@ class L2ToL1MessageClassic:
         self.index_in_batch = index_in_batch
 
     @staticmethod
-    def from_batch_number(l1_signer_or_provider, batch_number, index_in_batch, l1_provider=None):
+    def from_batch_number(l1_signer_or_provider, batch_number, index_in_batch, l1_provider=None, l2_network=None):
         if SignerProviderUtils.is_signer(l1_signer_or_provider):
-            return L2ToL1MessageWriterClassic(l1_signer_or_provider, batch_number, index_in_batch, l1_provider)
+            return L2ToL1MessageWriterClassic(
+                l1_signer_or_provider, batch_number, index_in_batch, l1_provider, l2_network
+            )
         else:
-            return L2ToL1MessageReaderClassic(l1_signer_or_provider, batch_number, index_in_batch)
+            return L2ToL1MessageReaderClassic(l1_signer_or_provider, batch_number, index_in_batch, l2_network)
+
+    @staticmethod
+    def get_l2_to_l1_event_arguments(batch_number=None, destination=None, unique_id=None):
+        argument_filters = {}
+        if batch_number:
+            argument_filters["batchNumber"] = batch_number
+        if destination:
+            argument_filters["destination"] = destination
+        if unique_id:
+            argument_filters["uniqueId"] = unique_id
+        return argument_filters
 
     @staticmethod
     async def get_l2_to_l1_events(
@@ -54,53 +69,90 @@ class L2ToL1MessageClassic:
         destination=None,
         unique_id=None,
         index_in_batch=None,
+        block_range_size=None,
     ):
         event_fetcher = EventFetcher(l2_provider)
 
-        argument_filters = {}
-        if batch_number:
-            argument_filters["batchNumber"] = batch_number
-        if destination:
-            argument_filters["destination"] = destination
-        if unique_id:
-            argument_filters["uniqueId"] = unique_id
+        fetched_events = await event_fetcher.get_events(
+            contract_factory="ArbSys",
+            event_name="L2ToL1Transaction",
+            argument_filters=L2ToL1MessageClassic.get_l2_to_l1_event_arguments(batch_number, destination, unique_id),
+            filter={
+                "fromBlock": filter["fromBlock"],
+                "toBlock": filter["toBlock"],
+                "address": ARB_SYS_ADDRESS,
+                **filter,
+            },
+            is_classic=False,
+            block_range_size=block_range_size,
+        )
+        return L2ToL1MessageClassic.format_l2_to_l1_events(fetched_events, index_in_batch)
 
-        events = [
-            {**l.event, "transactionHash": l.transactionHash}
-            for l in await event_fetcher.get_events(
-                contract_factory="ArbSys",
-                event_name="L2ToL1Transaction",
-                argument_filters=argument_filters,
-                filter={
-                    "fromBlock": filter["fromBlock"],
-                    "toBlock": filter["toBlock"],
-                    "address": ARB_SYS_ADDRESS,
-                    **filter,
-                },
-                is_classic=False,
-            )
-        ]
+    @staticmethod
+    def format_l2_to_l1_events(fetched_events, index_in_batch=None):
+        events = [{**l.event, "transactionHash": l.transactionHash} for l in fetched_events]
+        return L2ToL1MessageClassic.filter_index_in_batch(events, index_in_batch)
 
-        if index_in_batch is not None:
-            index_items = [event for event in events if event.args.indexInBatch == index_in_batch]
-            if index_items:
-                raise ArbSdkError("More than one indexed item found in batch.")
-            else:
-                return []
-        else:
+    @staticmethod
+    def filter_index_in_batch(events, index_in_batch):
+        if index_in_batch is None:
             return events
 
+        index_items = [event for event in events if event["indexInBatch"] == index_in_batch]
+        if len(index_items) > 1:
+            raise ArbSdkError("More than one indexed item found in batch.")
+        return index_items
+
+    @staticmethod
+    async def iter_l2_to_l1_events(
+        l2_provider,
+        filter,
+        batch_number=None,
+        destination=None,
+        unique_id=None,
+        index_in_batch=None,
+        block_range_size=DEFAULT_STREAM_BLOCK_RANGE_SIZE,
+    ):
+        event_fetcher = EventFetcher(l2_provider)
+
+        events = event_fetcher.iter_events(
+            contract_factory="ArbSys",
+            event_name="L2ToL1Transaction",
+            argument_filters=L2ToL1MessageClassic.get_l2_to_l1_event_arguments(batch_number, destination, unique_id),
+            filter={
+                "fromBlock": filter["fromBlock"],
+                "toBlock": filter["toBlock"],
+                "address": ARB_SYS_ADDRESS,
+                **filter,
+            },
+            is_classic=False,
+            block_range_size=block_range_size,
+        )
+        try:
+            async for l in events:
+                if index_in_batch is not None and l.event["indexInBatch"] != index_in_batch:
+                    continue
+                yield {**l.event, "transactionHash": l.transactionHash}
+        finally:
+            await events.aclose()
+
 
 class L2ToL1MessageReaderClassic(L2ToL1MessageClassic):
-    def __init__(self, l1_provider, batch_number, index_in_batch):
+    def __init__(self, l1_provider, batch_number, index_in_batch, l2_network=None):
         super().__init__(batch_number, index_in_batch)
         self.l1_provider = l1_provider
+        self.l2_network = l2_network
         self.outbox_address = None
         self.proof = None
 
+    async def get_l2_network(self, l2_provider):
+        if self.l2_network is None:
+            self.l2_network = await fetch_l2_network(l2_provider)
+        return self.l2_network
+
     async def get_outbox_address(self, l2_provider, batch_number):
         if not is_defined(self.outbox_address):
-            l2_network = get_l2_network(l2_provider)
+            l2_network = await self.get_l2_network(l2_provider)
 
             outboxes = (
                 l2_network.eth_bridge.classic_outboxes.items()
@@ -136,7 +188,7 @@ class L2ToL1MessageReaderClassic(L2ToL1MessageClassic):
             is_classic=False,
         )
 
-        return outbox_contract.functions.outboxEntryExists(self.batch_number).call()
+        return await call_rpc(outbox_contract.functions.outboxEntryExists(self.batch_number).call)
 
     @staticmethod
     async def try_get_proof_static(l2_provider, batch_number, index_in_batch):
@@ -147,7 +199,9 @@ class L2ToL1MessageReaderClassic(L2ToL1MessageClassic):
             is_classic=False,
         )
         try:
-            return node_interface_contract.functions.legacyLookupMessageBatchProof(batch_number, index_in_batch).call()
+            return await call_rpc(
+                node_interface_contract.functions.legacyLookupMessageBatchProof(batch_number, index_in_batch).call
+            )
 
         except Exception as e:
             if "batch doesn't exist" in str(e):
@@ -199,6 +253,7 @@ class L2ToL1MessageReaderClassic(L2ToL1MessageClassic):
                 return False
             raise e
 
+    @instrumented_operation("l2_to_l1_message.status")
     async def status(self, l2_provider):
         try:
             message_executed = await self.has_executed(l2_provider)
@@ -223,11 +278,12 @@ class L2ToL1MessageReaderClassic(L2ToL1MessageClassic):
 
 
 class L2ToL1MessageWriterClassic(L2ToL1MessageReaderClassic):
-    def __init__(self, l1_signer, batch_number, index_in_batch, l1_provider=None):
+    def __init__(self, l1_signer, batch_number, index_in_batch, l1_provider=None, l2_network=None):
         super().__init__(
             l1_provider if l1_provider else l1_signer.provider,
             batch_number,
             index_in_batch,
+            l2_network,
         )
         self.l1_signer = l1_signer
 
@@ -255,7 +311,7 @@ class L2ToL1MessageWriterClassic(L2ToL1MessageReaderClassic):
         if "from" not in overrides:
             overrides["from"] = self.l1_signer.account.address
 
-        transaction_hash = outbox_contract.functions.executeTransaction(
+        execute_transaction = outbox_contract.functions.executeTransaction(
             self.batch_number,
             proof_info.proof,
             proof_info.path,
@@ -266,7 +322,8 @@ class L2ToL1MessageWriterClassic(L2ToL1MessageReaderClassic):
             proof_info.timestamp,
             proof_info.amount,
             proof_info.calldata_for_l1,
-        ).transact(overrides)
+        )
+        transaction_hash = await call_rpc(execute_transaction.transact, overrides)
 
-        tx_receipt = self.l1_signer.provider.eth.wait_for_transaction_receipt(transaction_hash)
+        tx_receipt = await call_rpc(self.l1_signer.provider.eth.wait_for_transaction_receipt, transaction_hash)
         return tx_receipt
@@ -4,15 +4,19 @@ from web3 import Web3
 
 from src.lib.data_entities.constants import ARB_SYS_ADDRESS, NODE_INTERFACE_ADDRESS
 from src.lib.data_entities.message import L2ToL1MessageStatus
-from src.lib.data_entities.networks import get_l2_network
+from src.lib.data_entities.networks import fetch_l2_network
 from src.lib.data_entities.signer_or_provider import SignerProviderUtils
 from src.lib.utils.arb_provider import ArbitrumProvider
-from src.lib.utils.event_fetcher import EventFetcher
+from src.lib.utils.chain_id import fetch_chain_id
+from src.lib.utils.event_fetcher import DEFAULT_STREAM_BLOCK_RANGE_SIZE, EventFetcher
+from src.lib.utils.executor import call_rpc, can_overlap_rpc, gather_or_cancel
 from src.lib.utils.helper import (
     format_contract_output,
     load_contract,
 )
-from src.lib.utils.lib import get_block_ranges_for_l1_block, is_arbitrum_chain
+from src.lib.utils.instrumentation import instrumented_operation
+from src.lib.utils.lib import DEFAULT_BLOCK_SEARCH_WIDTH, get_block_ranges_for_l1_block, is_arbitrum_chain
+from src.lib.utils.multi_call_batcher import read_contract
 
 ASSERTION_CREATED_PADDING = 50
 ASSERTION_CONFIRMED_PADDING = 20
@@ -30,7 +34,7 @@ def set_l2_block_range_cache(key, value):
 
 
 async def get_block_ranges_for_l1_block_with_cache(l1_provider, l2_provider, for_l1_block):
-    l2_chain_id = l2_provider.eth.chainId
+    l2_chain_id = await fetch_chain_id(l2_provider)
     key = get_l2_block_range_cache_key(l2_chain_id, for_l1_block)
 
     if key in l2_block_range_cache:
@@ -51,16 +55,14 @@ class L2ToL1MessageNitro:
         self.event = event
 
     @classmethod
-    async def from_event(cls, l1_signer_or_provider, event, l1_provider=None):
+    async def from_event(cls, l1_signer_or_provider, event, l1_provider=None, l2_network=None):
         if SignerProviderUtils.is_signer(l1_signer_or_provider):
-            return L2ToL1MessageWriterNitro(l1_signer_or_provider, event, l1_provider)
+            return L2ToL1MessageWriterNitro(l1_signer_or_provider, event, l1_provider, l2_network)
         else:
-            return L2ToL1MessageReaderNitro(l1_signer_or_provider, event)
+            return L2ToL1MessageReaderNitro(l1_signer_or_provider, event, l2_network)
 
     @staticmethod
-    async def get_l2_to_l1_events(l2_provider, filter, position=None, destination=None, hash=None):
-        event_fetcher = EventFetcher(l2_provider)
-
+    def get_l2_to_l1_event_arguments(position=None, destination=None, hash=None):
         argument_filters = {}
         if position:
             argument_filters["position"] = position
@@ -68,11 +70,18 @@ class L2ToL1MessageNitro:
             argument_filters["destination"] = destination
         if hash:
             argument_filters["hash"] = hash
+        return argument_filters
+
+    @staticmethod
+    async def get_l2_to_l1_events(
+        l2_provider, filter, position=None, destination=None, hash=None, block_range_size=None
+    ):
+        event_fetcher = EventFetcher(l2_provider)
 
         events = await event_fetcher.get_events(
             contract_factory="ArbSys",
             event_name="L2ToL1Tx",
-            argument_filters=argument_filters,
+            argument_filters=L2ToL1MessageNitro.get_l2_to_l1_event_arguments(position, destination, hash),
             filter={
                 "fromBlock": filter["fromBlock"],
                 "toBlock": filter["toBlock"],
@@ -80,20 +89,58 @@ class L2ToL1MessageNitro:
                 **filter,
             },
             is_classic=False,
+            block_range_size=block_range_size,
         )
         return events
 
+    @staticmethod
+    async def iter_l2_to_l1_events(
+        l2_provider,
+        filter,
+        position=None,
+        destination=None,
+        hash=None,
+        block_range_size=DEFAULT_STREAM_BLOCK_RANGE_SIZE,
+    ):
+        event_fetcher = EventFetcher(l2_provider)
+
+        events = event_fetcher.iter_events(
+            contract_factory="ArbSys",
+            event_name="L2ToL1Tx",
+            argument_filters=L2ToL1MessageNitro.get_l2_to_l1_event_arguments(position, destination, hash),
+            filter={
+                "fromBlock": filter["fromBlock"],
+                "toBlock": filter["toBlock"],
+                "address": ARB_SYS_ADDRESS,
+                **filter,
+            },
+            is_classic=False,
+            block_range_size=block_range_size,
+        )
+        try:
+            async for event in events:
+                yield event
+        finally:
+            await events.aclose()
+
 
 class L2ToL1MessageReaderNitro(L2ToL1MessageNitro):
-    def __init__(self, l1_provider, event):
+    def __init__(self, l1_provider, event, l2_network=None):
         super().__init__(event)
         self.l1_provider = l1_provider
+        self.l2_network = l2_network
         self.send_root_hash = None
         self.send_root_size = None
         self.send_root_confirmed = None
         self.outbox_address = None
         self.l1_batch_number = None
 
+    async def get_l2_network(self, l2_provider):
+        # Resolved once and bound to the reader, so later calls skip the network lookup.
+        if self.l2_network is None:
+            self.l2_network = await fetch_l2_network(l2_provider)
+        return self.l2_network
+
     async def get_outbox_proof(self, l2_provider):
         send_props = await self.get_send_props(l2_provider)
         send_root_size = send_props.get("sendRootSize", None)
@@ -108,16 +155,16 @@ class L2ToL1MessageReaderNitro(L2ToL1MessageNitro):
             is_classic=False,
         )
 
-        outbox_proof_params = node_interface_contract.functions.constructOutboxProof(
-            send_root_size, self.event["position"]
-        ).call()
+        outbox_proof_params = await call_rpc(
+            node_interface_contract.functions.constructOutboxProof(send_root_size, self.event["position"]).call
+        )
         outbox_proof_params = format_contract_output(
             node_interface_contract, "constructOutboxProof", outbox_proof_params
         )
         return outbox_proof_params["proof"]
 
     async def has_executed(self, l2_provider):
-        l2_network = get_l2_network(l2_provider)
+        l2_network = await self.get_l2_network(l2_provider)
 
         outbox_contract = load_contract(
             provider=self.l1_provider,
@@ -125,8 +172,9 @@ class L2ToL1MessageReaderNitro(L2ToL1MessageNitro):
             address=l2_network.ethBridge.outbox,
             is_classic=False,
         )
-        return outbox_contract.functions.isSpent(self.event["position"]).call()
+        return await call_rpc(outbox_contract.functions.isSpent(self.event["position"]).call)
 
+    @instrumented_operation("l2_to_l1_message.status")
     async def status(self, l2_provider):
         send_props = await self.get_send_props(l2_provider)
 
@@ -163,7 +211,7 @@ class L2ToL1MessageReaderNitro(L2ToL1MessageNitro):
         return l2_block
 
     async def get_block_from_node_num(self, rollup, node_num, l2_provider):
-        node = rollup.functions.getNode(node_num).call()
+        node = await read_contract(rollup.functions.getNode(node_num))
         node = format_contract_output(rollup, "getNode", node)
 
         created_at_block = node["createdAtBlock"]
@@ -214,7 +262,9 @@ class L2ToL1MessageReaderNitro(L2ToL1MessageNitro):
                     address=NODE_INTERFACE_ADDRESS,
                     is_classic=False,
                 )
-                res = node_interface_contract.functions.findBatchContainingBlock(self.event["arbBlockNum"]).call()
+                res = await call_rpc(
+                    node_interface_contract.functions.findBatchContainingBlock(self.event["arbBlockNum"]).call
+                )
                 self.l1_batch_number = int(res)
 
             except Exception:
@@ -223,7 +273,7 @@ class L2ToL1MessageReaderNitro(L2ToL1MessageNitro):
 
     async def get_send_props(self, l2_provider):
         if not self.send_root_confirmed:
-            l2_network = get_l2_network(l2_provider)
+            l2_network = await self.get_l2_network(l2_provider)
 
             rollup_contract = load_contract(
                 provider=self.l1_provider,
@@ -232,7 +282,7 @@ class L2ToL1MessageReaderNitro(L2ToL1MessageNitro):
                 is_classic=False,
             )
 
-            latest_confirmed_node_num = rollup_contract.functions.latestConfirmed().call()
+            latest_confirmed_node_num = await read_contract(rollup_contract.functions.latestConfirmed())
             ("latest_confirmed_node_num", latest_confirmed_node_num)
             l2_block_confirmed = await self.get_block_from_node_num(
                 rollup_contract, latest_confirmed_node_num, l2_provider
@@ -245,7 +295,7 @@ class L2ToL1MessageReaderNitro(L2ToL1MessageNitro):
                 self.send_root_hash = l2_block_confirmed["sendRoot"]
                 self.send_root_confirmed = True
             else:
-                latest_node_num = rollup_contract.functions.latestNodeCreated().call()
+                latest_node_num = await read_contract(rollup_contract.functions.latestNodeCreated())
 
                 if latest_node_num > latest_confirmed_node_num:
                     l2_block = await self.get_block_from_node_num(rollup_contract, latest_node_num, l2_provider)
@@ -271,7 +321,7 @@ class L2ToL1MessageReaderNitro(L2ToL1MessageNitro):
             await self.wait_until_ready_to_execute(l2_provider, retry_delay)
 
     async def get_first_executable_block(self, l2_provider):
-        l2_network = get_l2_network(l2_provider)
+        l2_network = await self.get_l2_network(l2_provider)
 
         rollup_contract = load_contract(
             provider=self.l1_provider,
@@ -287,7 +337,7 @@ class L2ToL1MessageReaderNitro(L2ToL1MessageNitro):
         if status != L2ToL1MessageStatus.UNCONFIRMED:
             raise Exception("L2ToL1Msg expected to be unconfirmed")
 
-        latest_block = self.l1_provider.eth.block_number
+        latest_block = await call_rpc(lambda: self.l1_provider.eth.block_number)
         event_fetcher = EventFetcher(self.l1_provider)
 
         argument_filters = {}
@@ -309,7 +359,7 @@ class L2ToL1MessageReaderNitro(L2ToL1MessageNitro):
         logs.sort(key=lambda x: x["event"]["nodeNum"])
 
         last_l2_block = await self.get_block_from_node_log(l2_provider, logs[-1] if logs else None)
-        last_send_count = last_l2_block["sendCount"] if last_l2_block else 0
+        last_send_count = Web3.to_int(hexstr=last_l2_block["sendCount"]) if last_l2_block else 0
 
         if last_send_count <= self.event["position"]:
             return (
@@ -319,27 +369,35 @@ class L2ToL1MessageReaderNitro(L2ToL1MessageNitro):
                 + latest_block
             )
 
-        left, right = 0, len(logs) - 1
-        found_log = logs[-1]
-        while left <= right:
-            mid = (left + right) // 2
-            log = logs[mid]
-            l2_block = await self.get_block_from_node_log(l2_provider, log)
-            send_count = l2_block["sendCount"]
-            if send_count > self.event["position"]:
-                found_log = log
-                right = mid - 1
-            else:
-                left = mid + 1
+        # The last log is known to include the message. As in k_ary_search, each round probes
+        # search_width evenly spaced logs at once when requests can overlap.
+        search_width = DEFAULT_BLOCK_SEARCH_WIDTH if can_overlap_rpc(l2_provider) else 1
+        start, end = 0, len(logs) - 1
+        while start < end:
+            probes = sorted({start + (end - start) * (i + 1) // (search_width + 1) for i in range(search_width)})
+            l2_blocks = await gather_or_cancel(
+                *[self.get_block_from_node_log(l2_provider, logs[probe]) for probe in probes]
+            )
+
+            next_start = start
+            for probe, l2_block in zip(probes, l2_blocks):
+                if Web3.to_int(hexstr=l2_block["sendCount"]) > self.event["position"]:
+                    end = probe
+                    break
+                next_start = probe + 1
+            start = next_start
+
+        found_log = logs[end]
 
         earliest_node_with_exit = found_log["event"]["nodeNum"]
-        node = rollup_contract.functions.getNode(earliest_node_with_exit).call()
+        node = await read_contract(rollup_contract.functions.getNode(earliest_node_with_exit))
+        node = format_contract_output(rollup_contract, "getNode", node)
         return node["deadlineBlock"] + ASSERTION_CONFIRMED_PADDING
 
 
 class L2ToL1MessageWriterNitro(L2ToL1MessageReaderNitro):
-    def __init__(self, l1_signer, event, l1_provider=None):
-        super().__init__(l1_provider if l1_provider else l1_signer.provider, event)
+    def __init__(self, l1_signer, event, l1_provider=None, l2_network=None):
+        super().__init__(l1_provider if l1_provider else l1_signer.provider, event, l2_network)
         self.l1_signer = l1_signer
 
     async def execute(self, l2_provider, overrides=None):
@@ -348,7 +406,7 @@ class L2ToL1MessageWriterNitro(L2ToL1MessageReaderNitro):
             raise Exception(f"Cannot execute message. Status is: {status} but must be {L2ToL1MessageStatus.CONFIRMED}.")
 
         proof = await self.get_outbox_proof(l2_provider)
-        l2_network = get_l2_network(l2_provider)
+        l2_network = await self.get_l2_network(l2_provider)
 
         outbox_contract = load_contract(
             provider=self.l1_signer.provider,
@@ -363,7 +421,7 @@ class L2ToL1MessageWriterNitro(L2ToL1MessageReaderNitro):
         if "from" not in overrides:
             overrides["from"] = self.l1_signer.account.address
 
-        transaction_hash = outbox_contract.functions.executeTransaction(
+        execute_transaction = outbox_contract.functions.executeTransaction(
             proof,
             self.event["position"],
             self.event["caller"],
@@ -373,7 +431,8 @@ class L2ToL1MessageWriterNitro(L2ToL1MessageReaderNitro):
             self.event["timestamp"],
             self.event["callvalue"],
             self.event["data"],
-        ).transact(overrides)
+        )
+        transaction_hash = await call_rpc(execute_transaction.transact, overrides)
 
-        tx_receipt = self.l1_signer.provider.eth.wait_for_transaction_receipt(transaction_hash)
+        tx_receipt = await call_rpc(self.l1_signer.provider.eth.wait_for_transaction_receipt, transaction_hash)
         return tx_receipt
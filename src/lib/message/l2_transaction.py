@@ -1,11 +1,12 @@
 from src.lib.data_entities.constants import NODE_INTERFACE_ADDRESS
 from src.lib.data_entities.errors import ArbSdkError
-from src.lib.data_entities.event import parse_typed_logs
+from src.lib.data_entities.event import decode_logs, parse_typed_logs, select_decoded_events
 from src.lib.data_entities.signer_or_provider import (
     SignerProviderUtils,
 )
 from src.lib.message.l2_to_l1_message import L2ToL1Message
 from src.lib.utils.arb_provider import ArbitrumProvider
+from src.lib.utils.executor import call_rpc
 from src.lib.utils.helper import CaseDict, load_contract
 
 
@@ -25,7 +26,7 @@ class RedeemTransaction:
         if len(redeem_scheduled_events) != 1:
             raise ArbSdkError(f"Transaction is not a redeem transaction: {self.transaction.transactionHash}")
 
-        return self.l2_provider.eth.get_transaction_receipt(redeem_scheduled_events[0]["retryTxHash"])
+        return await call_rpc(self.l2_provider.eth.get_transaction_receipt, redeem_scheduled_events[0]["retryTxHash"])
 
 
 class L2TransactionReceipt(CaseDict):
@@ -53,9 +54,9 @@ class L2TransactionReceipt(CaseDict):
         )
 
     def get_l2_to_l1_events(self, provider):
-        classic_logs = parse_typed_logs(provider, "ArbSys", self.logs, "L2ToL1Transaction", is_classic=False)
-
-        nitro_logs = parse_typed_logs(provider, "ArbSys", self.logs, "L2ToL1Tx", is_classic=False)
+        decoded_events = decode_logs(self.logs)
+        classic_logs = select_decoded_events(decoded_events, "ArbSys", "L2ToL1Transaction")
+        nitro_logs = select_decoded_events(decoded_events, "ArbSys", "L2ToL1Tx")
 
         return [*classic_logs, *nitro_logs]
 
@@ -69,14 +70,14 @@ class L2TransactionReceipt(CaseDict):
 
         return [L2ToL1Message.from_event(l1_signer_or_provider, log) for log in self.get_l2_to_l1_events(provider)]
 
-    def get_batch_confirmations(self, l2_provider):
+    async def get_batch_confirmations(self, l2_provider):
         node_interface = load_contract(
             contract_name="NodeInterface",
             address=NODE_INTERFACE_ADDRESS,
             provider=l2_provider,
             is_classic=False,
         )
-        return node_interface.functions.getL1Confirmations(self.block_hash).call()
+        return await call_rpc(node_interface.functions.getL1Confirmations(self.block_hash).call)
 
     async def get_batch_number(self, l2_provider):
         arb_provider = ArbitrumProvider(l2_provider)
@@ -91,10 +92,10 @@ class L2TransactionReceipt(CaseDict):
         if rec is None:
             raise ArbSdkError("No receipt available for current transaction")
 
-        return node_interface.functions.findBatchContainingBlock(rec.blockNumber).call()
+        return await call_rpc(node_interface.functions.findBatchContainingBlock(rec.blockNumber).call)
 
     async def is_data_available(self, l2_provider, confirmations=10):
-        batch_confirmations = self.get_batch_confirmations(l2_provider)
+        batch_confirmations = await self.get_batch_confirmations(l2_provider)
         return int(batch_confirmations) > confirmations
 
     @staticmethod
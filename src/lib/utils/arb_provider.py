@@ -1,9 +1,15 @@
+from web3 import AsyncWeb3, Web3
+
 from src.lib.data_entities.rpc import (
     ArbBlock,
     ArbBlockWithTransactions,
     ArbTransactionReceipt,
 )
 from src.lib.data_entities.signer_or_provider import SignerOrProvider
+from src.lib.utils.block_cache import get_block_cache
+from src.lib.utils.executor import call_rpc
+from src.lib.utils.instrumentation import measure
+from src.lib.utils.multi_endpoint_provider import AsyncMultiEndpointProvider, MultiEndpointProvider
 
 
 class ArbFormatter:
@@ -44,15 +50,43 @@ class ArbitrumProvider:
 
         self.provider = provider
         self.formatter = ArbFormatter()
+        self.block_cache = get_block_cache(provider)
+
+    @classmethod
+    def from_endpoints(cls, endpoint_uris, is_async=False, request_kwargs=None, **options):
+        # Reads are routed across all endpoints (see MultiEndpointProvider); writes use the pinned one.
+        if is_async:
+            return cls(AsyncWeb3(AsyncMultiEndpointProvider(endpoint_uris, request_kwargs, **options)))
+        return cls(Web3(MultiEndpointProvider(endpoint_uris, request_kwargs, **options)))
 
     async def get_transaction_receipt(self, transaction_hash):
-        receipt = self.provider.eth.get_transaction_receipt(transaction_hash)
-        return self.formatter.receipt(receipt)
+        with measure(self.provider, "provider", "get_transaction_receipt"):
+            if self.block_cache is not None:
+                receipt = self.block_cache.get_transaction_receipt(transaction_hash)
+                if receipt is not None:
+                    return receipt
+
+            receipt = await call_rpc(self.provider.eth.get_transaction_receipt, transaction_hash)
+            receipt = self.formatter.receipt(receipt)
+            if self.block_cache is not None:
+                self.block_cache.store_transaction_receipt(receipt)
+            return receipt
 
     async def get_block_with_transactions(self, block_identifier):
-        block = self.provider.eth.get_block(block_identifier, full_transactions=True)
-        return self.formatter.block_with_transactions(block)
+        return await self._get_block(block_identifier, self.formatter.block_with_transactions, full_transactions=True)
 
     async def get_block(self, block_identifier):
-        block = self.provider.eth.get_block(block_identifier)
-        return self.formatter.block(block)
+        return await self._get_block(block_identifier, self.formatter.block)
+
+    async def _get_block(self, block_identifier, format_block, full_transactions=False):
+        with measure(self.provider, "provider", "get_block_with_transactions" if full_transactions else "get_block"):
+            if self.block_cache is not None:
+                block = self.block_cache.get_block(block_identifier, full_transactions)
+                if block is not None:
+                    return block
+
+            block = await call_rpc(self.provider.eth.get_block, block_identifier, full_transactions=full_transactions)
+            block = format_block(block)
+            if self.block_cache is not None:
+                self.block_cache.store_block(block_identifier, block, full_transactions)
+            return block
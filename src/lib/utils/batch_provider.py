@@ -0,0 +1,207 @@
+import asyncio
+import threading
+
+from eth_utils import to_bytes
+from web3 import AsyncHTTPProvider, HTTPProvider
+from web3._utils.encoding import FriendlyJsonSerde, Web3JsonEncoder
+from web3._utils.request import async_make_post_request, make_post_request
+
+BATCHABLE_METHODS = frozenset(
+    [
+        "eth_getBlockByNumber",
+        "eth_getBlockByHash",
+        "eth_getTransactionReceipt",
+        "eth_call",
+    ]
+)
+
+DEFAULT_MAX_BATCH_SIZE = 100
+
+# Seconds a request waits for others to join its batch before the batch is sent.
+DEFAULT_BATCH_FLUSH_INTERVAL = 0.002
+
+
+def encode_rpc_batch(request_counter, requests):
+    rpc_requests = [
+        {"jsonrpc": "2.0", "method": method, "params": params or [], "id": next(request_counter)}
+        for method, params in requests
+    ]
+    return rpc_requests, to_bytes(text=FriendlyJsonSerde().json_encode(rpc_requests, cls=Web3JsonEncoder))
+
+
+def split_rpc_batch_response(rpc_requests, responses):
+    # Nodes may answer a batch in any order. Returns None when the node did not answer with a
+    # batch at all (e.g. it rejects batch requests), so the caller can fall back to single requests.
+    if not isinstance(responses, list):
+        return None
+
+    responses_by_id = {response.get("id"): response for response in responses if isinstance(response, dict)}
+    return [
+        responses_by_id.get(
+            rpc_request["id"],
+            {
+                "jsonrpc": "2.0",
+                "id": rpc_request["id"],
+                "error": {"code": -32603, "message": "Missing response in JSON-RPC batch."},
+            },
+        )
+        for rpc_request in rpc_requests
+    ]
+
+
+class BatchHTTPProvider(HTTPProvider):
+    # Sends concurrent block, receipt and eth_call requests as JSON-RPC batches: a request waits up
+    # to flush_interval for others to join, and a full batch is sent at once. Requests only overlap
+    # when they are made from several threads, e.g. with enable_thread_offload. Other methods are
+    # sent on their own.
+    def __init__(
+        self,
+        endpoint_uri=None,
+        request_kwargs=None,
+        session=None,
+        max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+        flush_interval=DEFAULT_BATCH_FLUSH_INTERVAL,
+    ):
+        super().__init__(endpoint_uri, request_kwargs, session)
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.queue = []
+        self.flush_timer = None
+        self.stats = {"requests": 0, "batches": 0}
+
+    def make_request(self, method, params):
+        if method not in BATCHABLE_METHODS:
+            return super().make_request(method, params)
+
+        slot = {"done": threading.Event(), "response": None, "error": None}
+        with self.lock:
+            self.queue.append((method, params, slot))
+            if len(self.queue) >= self.max_batch_size:
+                queue = self._take_queue()
+            else:
+                queue = None
+                if self.flush_timer is None:
+                    self.flush_timer = threading.Timer(self.flush_interval, self._flush_queue)
+                    self.flush_timer.daemon = True
+                    self.flush_timer.start()
+
+        if queue:
+            self._send(queue)
+
+        slot["done"].wait()
+        if slot["error"] is not None:
+            raise slot["error"]
+        return slot["response"]
+
+    def _take_queue(self):
+        if self.flush_timer is not None:
+            self.flush_timer.cancel()
+            self.flush_timer = None
+        queue, self.queue = self.queue, []
+        return queue
+
+    def _flush_queue(self):
+        with self.lock:
+            queue = self._take_queue()
+        if queue:
+            self._send(queue)
+
+    def _send(self, queue):
+        try:
+            responses = self._send_batch([(method, params) for method, params, _ in queue])
+        except Exception as err:
+            for _, _, slot in queue:
+                slot["error"] = err
+                slot["done"].set()
+            return
+
+        for (_, _, slot), response in zip(queue, responses):
+            slot["response"] = response
+            slot["done"].set()
+
+    def _send_batch(self, requests):
+        if len(requests) == 1:
+            return [super().make_request(*requests[0])]
+
+        self.stats["requests"] += len(requests)
+        self.stats["batches"] += 1
+
+        rpc_requests, data = encode_rpc_batch(self.request_counter, requests)
+        raw_response = make_post_request(self.endpoint_uri, data, **self.get_request_kwargs())
+        responses = split_rpc_batch_response(rpc_requests, self.decode_rpc_response(raw_response))
+        if responses is None:
+            return [super(BatchHTTPProvider, self).make_request(method, params) for method, params in requests]
+        return responses
+
+
+class AsyncBatchHTTPProvider(AsyncHTTPProvider):
+    # The AsyncWeb3 counterpart of BatchHTTPProvider: requests issued within flush_interval of each
+    # other on the event loop are sent as one JSON-RPC batch.
+    def __init__(
+        self,
+        endpoint_uri=None,
+        request_kwargs=None,
+        max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+        flush_interval=DEFAULT_BATCH_FLUSH_INTERVAL,
+    ):
+        super().__init__(endpoint_uri, request_kwargs)
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.queue = []
+        self.flush_handle = None
+        # The event loop only keeps weak references to tasks.
+        self.flush_tasks = set()
+        self.stats = {"requests": 0, "batches": 0}
+
+    async def make_request(self, method, params):
+        if method not in BATCHABLE_METHODS:
+            return await super().make_request(method, params)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.queue.append((method, params, future))
+
+        if len(self.queue) >= self.max_batch_size:
+            self._schedule_flush()
+        elif self.flush_handle is None:
+            self.flush_handle = loop.call_later(self.flush_interval, self._schedule_flush)
+        return await future
+
+    def _schedule_flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        queue, self.queue = self.queue, []
+        task = asyncio.ensure_future(self._flush(queue))
+        self.flush_tasks.add(task)
+        task.add_done_callback(self.flush_tasks.discard)
+
+    async def _flush(self, queue):
+        try:
+            responses = await self._send_batch([(method, params) for method, params, _ in queue])
+        except Exception as err:
+            for _, _, future in queue:
+                if not future.done():
+                    future.set_exception(err)
+            return
+
+        for (_, _, future), response in zip(queue, responses):
+            if not future.done():
+                future.set_result(response)
+
+    async def _send_batch(self, requests):
+        if len(requests) == 1:
+            return [await super().make_request(*requests[0])]
+
+        self.stats["requests"] += len(requests)
+        self.stats["batches"] += 1
+
+        rpc_requests, data = encode_rpc_batch(self.request_counter, requests)
+        raw_response = await async_make_post_request(self.endpoint_uri, data, **self.get_request_kwargs())
+        responses = split_rpc_batch_response(rpc_requests, self.decode_rpc_response(raw_response))
+        if responses is None:
+            return [
+                await super(AsyncBatchHTTPProvider, self).make_request(method, params) for method, params in requests
+            ]
+        return responses
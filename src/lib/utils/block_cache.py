@@ -0,0 +1,146 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+from hexbytes import HexBytes
+from web3 import Web3
+
+from src.lib.utils.log_cache import DEFAULT_FINALITY_DEPTH
+
+DEFAULT_BLOCK_CACHE_SIZE = 4096
+
+block_cache_registry = weakref.WeakKeyDictionary()
+
+
+def enable_block_cache(provider, block_cache=None):
+    block_cache = block_cache if block_cache is not None else BlockCache()
+    block_cache_registry[provider] = block_cache
+    return block_cache
+
+
+def disable_block_cache(provider):
+    block_cache_registry.pop(provider, None)
+
+
+def get_block_cache(provider):
+    try:
+        return block_cache_registry.get(provider)
+    except TypeError:
+        return None
+
+
+def to_block_hash(block_identifier):
+    if isinstance(block_identifier, (bytes, bytearray)) and len(block_identifier) == 32:
+        return Web3.to_hex(block_identifier)
+    if isinstance(block_identifier, str) and block_identifier.startswith("0x") and len(block_identifier) == 66:
+        return block_identifier.lower()
+    return None
+
+
+def to_block_number(block_identifier):
+    if isinstance(block_identifier, int):
+        return block_identifier
+    if isinstance(block_identifier, str) and block_identifier.startswith("0x") and len(block_identifier) < 66:
+        return int(block_identifier, 16)
+    return None
+
+
+class BlockCache:
+    # Formatted blocks and receipts shared by every ArbitrumProvider over the same web3 provider.
+    # Blocks are keyed by hash, so a block fetched by hash is always served from the cache; a block
+    # number is only resolved from the cache once it is finality_depth blocks behind the highest
+    # block seen. A block number that comes back with a new hash is a reorg: every cached block and
+    # receipt from that height up is dropped. Finalized entries only leave through the LRU bound.
+    def __init__(self, max_size=DEFAULT_BLOCK_CACHE_SIZE, finality_depth=DEFAULT_FINALITY_DEPTH):
+        self.max_size = max_size
+        self.finality_depth = finality_depth
+        self.lock = threading.Lock()
+        # (block hash, full_transactions) -> block, least recently used first.
+        self.blocks = OrderedDict()
+        # Canonical block number -> block hash, as last returned by the node.
+        self.hashes = {}
+        # Transaction hash -> receipt, only for receipts in finalized blocks.
+        self.receipts = OrderedDict()
+        self.head = None
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "reorgs": 0}
+
+    def is_final(self, block_number):
+        return self.head is not None and block_number <= self.head - self.finality_depth
+
+    def get_block(self, block_identifier, full_transactions=False):
+        with self.lock:
+            block_hash = to_block_hash(block_identifier)
+            if block_hash is None:
+                block_number = to_block_number(block_identifier)
+                if block_number is not None and self.is_final(block_number):
+                    block_hash = self.hashes.get(block_number)
+
+            block = self.blocks.get((block_hash, full_transactions)) if block_hash is not None else None
+            if block is None:
+                self.stats["misses"] += 1
+                return None
+
+            self.blocks.move_to_end((block_hash, full_transactions))
+            self.stats["hits"] += 1
+            return block
+
+    def store_block(self, block_identifier, block, full_transactions=False):
+        block_number = block["number"]
+        block_hash = Web3.to_hex(HexBytes(block["hash"]))
+
+        with self.lock:
+            self.head = block_number if self.head is None else max(self.head, block_number)
+
+            # Only a lookup by number or tag says which block is canonical at that height.
+            if to_block_hash(block_identifier) is None:
+                known_hash = self.hashes.get(block_number)
+                if known_hash is not None and known_hash != block_hash:
+                    self.stats["reorgs"] += 1
+                    self._evict_from(block_number)
+                self.hashes[block_number] = block_hash
+
+            self.blocks[(block_hash, full_transactions)] = block
+            self.blocks.move_to_end((block_hash, full_transactions))
+            while len(self.blocks) > self.max_size:
+                (evicted_hash, _), evicted = self.blocks.popitem(last=False)
+                if self.hashes.get(evicted["number"]) == evicted_hash:
+                    del self.hashes[evicted["number"]]
+                self.stats["evictions"] += 1
+
+    def get_transaction_receipt(self, transaction_hash):
+        with self.lock:
+            receipt = self.receipts.get(Web3.to_hex(HexBytes(transaction_hash)))
+            if receipt is None:
+                self.stats["misses"] += 1
+                return None
+
+            self.receipts.move_to_end(Web3.to_hex(HexBytes(transaction_hash)))
+            self.stats["hits"] += 1
+            return receipt
+
+    def store_transaction_receipt(self, receipt):
+        with self.lock:
+            if not self.is_final(receipt.blockNumber):
+                return
+
+            key = Web3.to_hex(HexBytes(receipt.transactionHash))
+            self.receipts[key] = receipt
+            self.receipts.move_to_end(key)
+            while len(self.receipts) > self.max_size:
+                self.receipts.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def _evict_from(self, block_number):
+        for key in [key for key, block in self.blocks.items() if block["number"] >= block_number]:
+            del self.blocks[key]
+        for number in [number for number in self.hashes if number >= block_number]:
+            del self.hashes[number]
+        for key in [key for key, receipt in self.receipts.items() if receipt.blockNumber >= block_number]:
+            del self.receipts[key]
+
+    def clear(self):
+        with self.lock:
+            self.blocks.clear()
+            self.hashes.clear()
+            self.receipts.clear()
+            self.head = None
@@ -5,6 +5,7 @@ from web3 import Web3
 
 from src.lib.data_entities.constants import ARB_ADDRESS_TABLE_ADDRESS
 from src.lib.data_entities.errors import ArbSdkError
+from src.lib.utils.executor import call_rpc
 from src.lib.utils.helper import load_contract
 
 address_to_index_memo = {}
@@ -21,10 +22,10 @@ async def get_address_index(address, provider):
         is_classic=False,
     )
 
-    is_registered = await arb_address_table.functions.addressExists(address).call()
+    is_registered = await call_rpc(arb_address_table.functions.addressExists(address).call)
 
     if is_registered:
-        index = await arb_address_table.functions.lookup(address).call()
+        index = await call_rpc(arb_address_table.functions.lookup(address).call)
         address_to_index_memo[address] = index
         return index
     else:
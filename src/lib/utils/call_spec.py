@@ -0,0 +1,100 @@
+from eth_abi.decoding import ContextFramesBytesIO, TupleDecoder
+from eth_abi.encoding import TupleEncoder
+from eth_abi.registry import registry as default_abi_registry
+from eth_utils.abi import collapse_if_tuple
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.abi import map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+
+from src.lib.data_entities.errors import ArbSdkError
+from src.lib.utils.helper import load_abi
+
+call_spec_registry = {}
+abi_call_spec_registry = {}
+
+
+def to_checksum_output(value):
+    return Web3.to_checksum_address(value)
+
+
+def identity_output(value):
+    return value
+
+
+class CallSpec:
+    # Selector, argument encoder and output decoder for one contract function, built once so that
+    # encoding a call is a byte concatenation and decoding never goes through web3's ABI lookup.
+    def __init__(self, function_abi):
+        self.abi = function_abi
+        self.name = function_abi["name"]
+        self.input_types = [collapse_if_tuple(i) for i in function_abi.get("inputs", [])]
+        self.output_types = [collapse_if_tuple(o) for o in function_abi.get("outputs", [])]
+        self.signature = f"{self.name}({','.join(self.input_types)})"
+        self.selector = bytes(Web3.keccak(text=self.signature)[:4])
+
+        self.encoder = TupleEncoder(encoders=[default_abi_registry.get_encoder(t) for t in self.input_types])
+        self.decoder = TupleDecoder(decoders=[default_abi_registry.get_decoder(t) for t in self.output_types])
+
+        if all(t == "address" or "address" not in t for t in self.output_types):
+            self.output_normalizers = [
+                to_checksum_output if t == "address" else identity_output for t in self.output_types
+            ]
+        else:
+            self.output_normalizers = None
+
+    def encode(self, args=()):
+        return self.selector + self.encoder(args)
+
+    def decode(self, return_data):
+        values = self.decoder(ContextFramesBytesIO(bytes(HexBytes(return_data))))
+
+        if self.output_normalizers is None:
+            values = map_abi_data(BASE_RETURN_NORMALIZERS, self.output_types, values)
+        else:
+            values = [normalize(value) for normalize, value in zip(self.output_normalizers, values)]
+
+        if len(values) == 1:
+            return values[0]
+        return values
+
+    def call_input(self, address, args=()):
+        calldata = self.encode(args)
+        return {
+            "targetAddr": address,
+            "callData": calldata,
+            "encoder": lambda: calldata,
+            "decoder": self.decode,
+        }
+
+
+def get_call_spec_for_abi(function_abi):
+    key = (
+        function_abi["name"],
+        tuple(collapse_if_tuple(i) for i in function_abi.get("inputs", [])),
+        tuple(collapse_if_tuple(o) for o in function_abi.get("outputs", [])),
+    )
+    if key not in abi_call_spec_registry:
+        abi_call_spec_registry[key] = CallSpec(function_abi)
+    return abi_call_spec_registry[key]
+
+
+def get_call_spec(contract_name, function_name, is_classic=False, input_types=None):
+    key = (contract_name, function_name, is_classic, tuple(input_types) if input_types is not None else None)
+    if key not in call_spec_registry:
+        contract_abi, _ = load_abi(contract_name, is_classic=is_classic)
+        function_abi = next(
+            (
+                item
+                for item in contract_abi
+                if item.get("type") == "function"
+                and item.get("name") == function_name
+                and (input_types is None or [collapse_if_tuple(i) for i in item["inputs"]] == list(input_types))
+            ),
+            None,
+        )
+        if function_abi is None:
+            raise ArbSdkError(f"Function {function_name} not found in {contract_name} ABI.")
+
+        call_spec_registry[key] = get_call_spec_for_abi(function_abi)
+    return call_spec_registry[key]
@@ -0,0 +1,39 @@
+import weakref
+
+from src.lib.utils.executor import call_rpc
+
+# A provider's chain id never changes while it points at the same node, so it is read once per
+# provider instance. Call invalidate_chain_id after repointing a provider at another chain.
+chain_id_registry = weakref.WeakKeyDictionary()
+
+
+def get_chain_id(provider):
+    try:
+        chain_id = chain_id_registry.get(provider)
+    except TypeError:
+        return provider.eth.chain_id
+
+    if chain_id is None:
+        chain_id = provider.eth.chain_id
+        chain_id_registry[provider] = chain_id
+    return chain_id
+
+
+async def fetch_chain_id(provider):
+    # Like get_chain_id, but also awaits the chain id of AsyncWeb3 providers.
+    try:
+        chain_id = chain_id_registry.get(provider)
+    except TypeError:
+        return await call_rpc(lambda: provider.eth.chain_id)
+
+    if chain_id is None:
+        chain_id = await call_rpc(lambda: provider.eth.chain_id)
+        chain_id_registry[provider] = chain_id
+    return chain_id
+
+
+def invalidate_chain_id(provider=None):
+    if provider is None:
+        chain_id_registry.clear()
+    else:
+        chain_id_registry.pop(provider, None)
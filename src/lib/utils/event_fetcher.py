@@ -1,10 +1,66 @@
-from web3 import Web3
-from web3.contract import Contract
+import asyncio
+from collections import deque
+from functools import partial
+
+from requests.exceptions import Timeout as RequestTimeout
+from web3 import AsyncWeb3, Web3
+from web3.contract import AsyncContract, Contract
 
 from src.lib.data_entities.errors import ArbSdkError
+from src.lib.data_entities.event import (
+    get_event_decoder_for_abi,
+    merge_topic_filters,
+    to_topic_hex,
+    topics_match,
+)
 from src.lib.data_entities.signer_or_provider import SignerOrProvider
 from src.lib.utils.arb_provider import ArbitrumProvider
+from src.lib.utils.chain_id import fetch_chain_id
+from src.lib.utils.event_follower import DEFAULT_FOLLOW_POLL_INTERVAL, DEFAULT_MAX_REORG_DEPTH, EventFollower
+from src.lib.utils.executor import call_rpc, gather_or_cancel, is_async_provider, run_blocking
 from src.lib.utils.helper import CaseDict, load_contract
+from src.lib.utils.instrumentation import measure
+from src.lib.utils.log_cache import DEFAULT_FINALITY_DEPTH, get_log_cache
+
+DEFAULT_LOG_QUERY_CONCURRENCY = 4
+
+DEFAULT_STREAM_BLOCK_RANGE_SIZE = 10_000
+
+LOG_RANGE_ERROR_CODES = (-32005,)
+
+LOG_RANGE_ERROR_MESSAGES = (
+    "more than",
+    "too many",
+    "limit exceeded",
+    "block range",
+    "range is too large",
+    "response size",
+    "timeout",
+    "timed out",
+)
+
+
+def is_log_range_error(err):
+    if isinstance(err, (asyncio.TimeoutError, TimeoutError, RequestTimeout)):
+        return True
+
+    if err.args and isinstance(err.args[0], dict) and err.args[0].get("code") in LOG_RANGE_ERROR_CODES:
+        return True
+
+    message = str(err).lower()
+    return any(m in message for m in LOG_RANGE_ERROR_MESSAGES)
+
+
+def iter_block_ranges(from_block, to_block, block_range_size):
+    start = from_block
+    while start <= to_block:
+        end = min(start + block_range_size - 1, to_block)
+        yield start, end
+        start = end + 1
+
+
+def split_block_range(from_block, to_block, block_range_size):
+    return list(iter_block_ranges(from_block, to_block, block_range_size))
 
 
 class FetchedEvent(CaseDict):
@@ -19,6 +75,8 @@ class FetchedEvent(CaseDict):
         address,
         topics,
         data,
+        log_index=None,
+        removed=False,
     ):
         self.event = event
         self.topic = topic
@@ -29,6 +87,8 @@ class FetchedEvent(CaseDict):
         self.address = address
         self.topics = topics
         self.data = data
+        self.log_index = log_index
+        self.removed = removed
 
         super().__init__(
             {
@@ -41,38 +101,84 @@ class FetchedEvent(CaseDict):
                 "address": address,
                 "topics": topics,
                 "data": data,
+                "logIndex": log_index,
+                "removed": removed,
             }
         )
 
+    def as_removed(self):
+        return FetchedEvent(
+            event=self.event,
+            topic=self.topic,
+            name=self.name,
+            block_number=self.block_number,
+            block_hash=self.block_hash,
+            transaction_hash=self.transaction_hash,
+            address=self.address,
+            topics=self.topics,
+            data=self.data,
+            log_index=self.log_index,
+            removed=True,
+        )
+
 
 class EventFetcher:
-    def __init__(self, provider):
-        if isinstance(provider, Web3):
+    def __init__(self, provider, use_filters=False, log_cache=None):
+        self.use_filters = use_filters
+        self.chain_id = None
+
+        if isinstance(provider, (Web3, AsyncWeb3)):
             self.provider = provider
 
         elif isinstance(provider, SignerOrProvider):
             self.provider = provider.provider
 
         elif isinstance(provider, ArbitrumProvider):
-            provider = provider.provider
+            self.provider = provider.provider
 
         else:
             raise Exception("Invalid provider type")
 
-    async def get_events(
-        self,
-        contract_factory,
-        event_name,
-        argument_filters=None,
-        filter=None,
-        is_classic=False,
-    ):
-        if filter is None:
-            filter = {}
+        self.is_async = is_async_provider(self.provider)
+        self.log_cache = log_cache if log_cache is not None else get_log_cache(self.provider)
 
-        if argument_filters is None:
-            argument_filters = {}
+    async def _call_rpc(self, fn, *args, **kwargs):
+        # Synchronous providers run on the executor so that concurrent windows overlap.
+        return await call_rpc(fn, *args, offload=not self.is_async, **kwargs)
+
+    async def get_chain_id(self):
+        if self.chain_id is None:
+            self.chain_id = await fetch_chain_id(self.provider)
+        return self.chain_id
+
+    async def get_block_number(self):
+        return await self._call_rpc(lambda: self.provider.eth.block_number)
+
+    async def get_finalized_block_number(self):
+        if self.log_cache.finality_depth is None:
+            try:
+                return (await self._call_rpc(self.provider.eth.get_block, "finalized"))["number"]
+            except Exception:
+                return await self.get_block_number() - DEFAULT_FINALITY_DEPTH
 
+        return await self.get_block_number() - self.log_cache.finality_depth
+
+    async def resolve_block_number(self, block_tag):
+        if isinstance(block_tag, int):
+            return block_tag
+
+        if block_tag == "earliest":
+            return 0
+
+        if isinstance(block_tag, str) and block_tag.startswith("0x"):
+            return int(block_tag, 16)
+
+        if block_tag in (None, "latest", "pending"):
+            return await self.get_block_number()
+
+        return (await self._call_rpc(self.provider.eth.get_block, block_tag))["number"]
+
+    def _resolve_contract(self, contract_factory, filter, is_classic):
         if isinstance(contract_factory, str):
             contract_address = filter.get(
                 "address",
@@ -86,20 +192,344 @@ class EventFetcher:
                 is_classic=is_classic,
             )
 
-        elif isinstance(contract_factory, Contract):
+        elif isinstance(contract_factory, (Contract, AsyncContract)):
             contract = contract_factory
         else:
             raise ArbSdkError("Invalid contract factory type")
 
-        event = getattr(contract.events, event_name, None)
-        if not event:
+        return contract
+
+    def _get_decoder(self, contract, event_name, is_classic):
+        event_abi = next(
+            (item for item in contract.abi if item.get("type") == "event" and item.get("name") == event_name),
+            None,
+        )
+        if not event_abi:
             raise ValueError(f"Event {event_name} not found in contract")
 
-        event_filter = event().create_filter(
+        return get_event_decoder_for_abi(event_abi, is_classic=is_classic)
+
+    def _build_fetch(self, contract_factory, event_name, argument_filters, filter, is_classic):
+        contract = self._resolve_contract(contract_factory, filter, is_classic)
+
+        if self.use_filters:
+            event = getattr(contract.events, event_name, None)
+            if not event:
+                raise ValueError(f"Event {event_name} not found in contract")
+            return partial(self._get_filter_entries, event, argument_filters, filter)
+
+        decoder = self._get_decoder(contract, event_name, is_classic)
+        log_filter = {
             **filter,
+            "address": filter.get("address", contract.address),
+            "topics": decoder.build_topics(argument_filters),
+        }
+        if self.log_cache is not None and isinstance(log_filter["address"], str) and "blockHash" not in log_filter:
+            return partial(self._get_cached_logs, decoder, argument_filters, log_filter)
+        return partial(self._get_decoded_logs, decoder, argument_filters, log_filter)
+
+    async def get_events(
+        self,
+        contract_factory,
+        event_name,
+        argument_filters=None,
+        filter=None,
+        is_classic=False,
+        block_range_size=None,
+        concurrency=DEFAULT_LOG_QUERY_CONCURRENCY,
+    ):
+        if filter is None:
+            filter = {}
+
+        if argument_filters is None:
+            argument_filters = {}
+
+        with measure(self.provider, "logs", event_name) as measurement:
+            fetch = self._build_fetch(contract_factory, event_name, argument_filters, filter, is_classic)
+            events = await self._fetch_windows(fetch, filter, block_range_size, concurrency)
+            if measurement is not None:
+                measurement.size = len(events)
+            return events
+
+    async def get_events_multi(
+        self,
+        contract_factory,
+        event_names,
+        argument_filters=None,
+        filter=None,
+        is_classic=False,
+        block_range_size=None,
+        concurrency=DEFAULT_LOG_QUERY_CONCURRENCY,
+    ):
+        # argument_filters maps each event name to the argument filters of that event.
+        if filter is None:
+            filter = {}
+
+        if argument_filters is None:
+            argument_filters = {}
+
+        if self.use_filters or self.log_cache is not None:
+            results = await gather_or_cancel(
+                *[
+                    self.get_events(
+                        contract_factory,
+                        event_name,
+                        argument_filters=argument_filters.get(event_name),
+                        filter=filter,
+                        is_classic=is_classic,
+                        block_range_size=block_range_size,
+                        concurrency=concurrency,
+                    )
+                    for event_name in event_names
+                ]
+            )
+            return dict(zip(event_names, results))
+
+        contract = self._resolve_contract(contract_factory, filter, is_classic)
+        decoders = {}
+        topic_filters = {}
+        for event_name in event_names:
+            decoder = self._get_decoder(contract, event_name, is_classic)
+            decoders[decoder.topic] = decoder
+            topic_filters[decoder.topic] = decoder.build_topics(argument_filters.get(event_name))
+
+        log_filter = {
+            **filter,
+            "address": filter.get("address", contract.address),
+            "topics": merge_topic_filters(list(topic_filters.values())),
+        }
+        fetch = partial(self._get_demultiplexed_logs, decoders, topic_filters, argument_filters, log_filter)
+        with measure(self.provider, "logs", ",".join(event_names)) as measurement:
+            fetched_events = await self._fetch_windows(fetch, filter, block_range_size, concurrency)
+            if measurement is not None:
+                measurement.size = len(fetched_events)
+
+        events = {event_name: [] for event_name in event_names}
+        for fetched_event in fetched_events:
+            events[fetched_event.name].append(fetched_event)
+        return events
+
+    async def _bind_finality(self, fetch):
+        # Cached queries split each window at the finalized block, resolved once for all windows of a call.
+        if isinstance(fetch, partial) and fetch.func == self._get_cached_logs:
+            return partial(fetch, finalized_number=await self.get_finalized_block_number())
+        return fetch
+
+    async def _fetch_windows(self, fetch, filter, block_range_size, concurrency):
+        fetch = await self._bind_finality(fetch)
+        from_block = filter.get("fromBlock", "earliest")
+        to_block = filter.get("toBlock", "latest")
+        if block_range_size:
+            windows = split_block_range(
+                await self.resolve_block_number(from_block),
+                await self.resolve_block_number(to_block),
+                block_range_size,
+            )
+        else:
+            windows = [(from_block, to_block)]
+
+        semaphore = asyncio.Semaphore(concurrency)
+        results = await gather_or_cancel(
+            *[self._fetch_logs_in_range(fetch, window_from, window_to, semaphore) for window_from, window_to in windows]
+        )
+        return [fetched_event for result in results for fetched_event in result]
+
+    async def iter_events(
+        self,
+        contract_factory,
+        event_name,
+        argument_filters=None,
+        filter=None,
+        is_classic=False,
+        block_range_size=DEFAULT_STREAM_BLOCK_RANGE_SIZE,
+        concurrency=DEFAULT_LOG_QUERY_CONCURRENCY,
+    ):
+        # Windows are fetched ahead of the consumer, but never more than `concurrency` of them,
+        # so memory stays bounded by the window size no matter how long the scanned range is.
+        if filter is None:
+            filter = {}
+
+        if argument_filters is None:
+            argument_filters = {}
+
+        fetch = await self._bind_finality(
+            self._build_fetch(contract_factory, event_name, argument_filters, filter, is_classic)
+        )
+
+        windows = iter_block_ranges(
+            await self.resolve_block_number(filter.get("fromBlock", "earliest")),
+            await self.resolve_block_number(filter.get("toBlock", "latest")),
+            block_range_size,
+        )
+        semaphore = asyncio.Semaphore(concurrency)
+        pending = deque()
+
+        def schedule_next_window():
+            window = next(windows, None)
+            if window is not None:
+                pending.append(asyncio.ensure_future(self._fetch_logs_in_range(fetch, *window, semaphore)))
+
+        try:
+            for _ in range(max(concurrency, 1)):
+                schedule_next_window()
+
+            while pending:
+                fetched_events = await pending.popleft()
+                schedule_next_window()
+                for fetched_event in fetched_events:
+                    yield fetched_event
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def follower(
+        self,
+        contract_factory,
+        event_name,
+        argument_filters=None,
+        filter=None,
+        is_classic=False,
+        confirmations=0,
+        max_reorg_depth=DEFAULT_MAX_REORG_DEPTH,
+        block_range_size=None,
+        concurrency=DEFAULT_LOG_QUERY_CONCURRENCY,
+    ):
+        if filter is None:
+            filter = {}
+
+        if argument_filters is None:
+            argument_filters = {}
+
+        fetch = self._build_fetch(contract_factory, event_name, argument_filters, filter, is_classic)
+        return EventFollower(
+            self,
+            fetch,
+            from_block=filter.get("fromBlock"),
+            confirmations=confirmations,
+            max_reorg_depth=max_reorg_depth,
+            block_range_size=block_range_size,
+            concurrency=concurrency,
+        )
+
+    async def follow(
+        self,
+        contract_factory,
+        event_name,
+        argument_filters=None,
+        filter=None,
+        is_classic=False,
+        confirmations=0,
+        poll_interval=DEFAULT_FOLLOW_POLL_INTERVAL,
+        max_reorg_depth=DEFAULT_MAX_REORG_DEPTH,
+        block_range_size=None,
+        concurrency=DEFAULT_LOG_QUERY_CONCURRENCY,
+    ):
+        # Yields new events as blocks reach `confirmations` depth; events from blocks dropped by a
+        # reorg are yielded again with removed=True before the replacement events.
+        follower = self.follower(
+            contract_factory,
+            event_name,
             argument_filters=argument_filters,
+            filter=filter,
+            is_classic=is_classic,
+            confirmations=confirmations,
+            max_reorg_depth=max_reorg_depth,
+            block_range_size=block_range_size,
+            concurrency=concurrency,
         )
-        logs = event_filter.get_all_entries()
+        async for fetched_event in follower.follow(poll_interval):
+            yield fetched_event
+
+    async def _get_decoded_logs(self, decoder, argument_filters, log_filter, from_block, to_block):
+        logs = await self._call_rpc(
+            self.provider.eth.get_logs, {**log_filter, "fromBlock": from_block, "toBlock": to_block}
+        )
+        return self._decode_logs(decoder, argument_filters, logs)
+
+    async def _get_cached_logs(self, decoder, argument_filters, log_filter, from_block, to_block, finalized_number):
+        # Finalized blocks are fetched once per (address, topic0) and served from the cache afterwards;
+        # the cache stores every log of the event so any argument filter can be answered locally.
+        from_number = await self.resolve_block_number(from_block)
+        to_number = await self.resolve_block_number(to_block)
+        finalized_number = min(to_number, finalized_number)
+
+        chain_id = await self.get_chain_id()
+        address = log_filter["address"]
+
+        logs = []
+        if from_number <= finalized_number:
+            for gap_from, gap_to in await run_blocking(
+                self.log_cache.missing_ranges, chain_id, address, decoder.topic, from_number, finalized_number
+            ):
+                gap_logs = await self._call_rpc(
+                    self.provider.eth.get_logs,
+                    {"address": address, "topics": [decoder.topic], "fromBlock": gap_from, "toBlock": gap_to},
+                )
+                await run_blocking(self.log_cache.store, chain_id, address, decoder.topic, gap_from, gap_to, gap_logs)
+
+            cached_logs = await run_blocking(
+                self.log_cache.get_logs, chain_id, address, decoder.topic, from_number, finalized_number
+            )
+            logs.extend(log for log in cached_logs if topics_match(log_filter["topics"], log["topics"]))
+
+        if finalized_number < to_number:
+            logs.extend(
+                await self._call_rpc(
+                    self.provider.eth.get_logs,
+                    {**log_filter, "fromBlock": max(from_number, finalized_number + 1), "toBlock": to_number},
+                )
+            )
+
+        return self._decode_logs(decoder, argument_filters, logs)
+
+    async def _get_demultiplexed_logs(
+        self, decoders, topic_filters, argument_filters, log_filter, from_block, to_block
+    ):
+        logs = await self._call_rpc(
+            self.provider.eth.get_logs, {**log_filter, "fromBlock": from_block, "toBlock": to_block}
+        )
+
+        fetched_events = []
+        for log in logs:
+            topic = to_topic_hex(log["topics"][0])
+            decoder = decoders[topic]
+            if topics_match(topic_filters[topic], log["topics"]):
+                fetched_events.extend(self._decode_logs(decoder, argument_filters.get(decoder.name) or {}, [log]))
+        return fetched_events
+
+    def _decode_logs(self, decoder, argument_filters, logs):
+        fetched_events = []
+        for log in logs:
+            args = decoder.decode(log)
+            if not decoder.matches_arguments(args, argument_filters):
+                continue
+
+            fetched_events.append(
+                FetchedEvent(
+                    event=args,
+                    name=decoder.name,
+                    topic=log["topics"][0],
+                    block_number=log["blockNumber"],
+                    block_hash=log["blockHash"],
+                    transaction_hash=log["transactionHash"],
+                    address=log["address"],
+                    topics=log["topics"],
+                    data=log["data"],
+                    log_index=log["logIndex"],
+                )
+            )
+        return fetched_events
+
+    async def _get_filter_entries(self, event, argument_filters, filter, from_block, to_block):
+        event_filter = await self._call_rpc(
+            event().create_filter,
+            **{**filter, "fromBlock": from_block, "toBlock": to_block},
+            argument_filters=argument_filters,
+        )
+        logs = await self._call_rpc(event_filter.get_all_entries)
+
         fetched_events = []
         for log in logs:
             fetched_events.append(
@@ -113,6 +543,28 @@ class EventFetcher:
                     address=log["address"],
                     topics=log.get("topics", None),
                     data=log.get("data", None),
+                    log_index=log["logIndex"],
                 )
             )
         return fetched_events
+
+    async def _fetch_logs_in_range(self, fetch, from_block, to_block, semaphore):
+        try:
+            async with semaphore:
+                return await fetch(from_block, to_block)
+
+        except Exception as err:
+            if not is_log_range_error(err):
+                raise err
+
+            from_number = await self.resolve_block_number(from_block)
+            to_number = await self.resolve_block_number(to_block)
+            if from_number >= to_number:
+                raise ArbSdkError(f"Log query for block {from_number} failed and cannot be split further.", err)
+
+            mid = from_number + (to_number - from_number) // 2
+            results = await gather_or_cancel(
+                self._fetch_logs_in_range(fetch, from_number, mid, semaphore),
+                self._fetch_logs_in_range(fetch, mid + 1, to_number, semaphore),
+            )
+            return [fetched_event for result in results for fetched_event in result]
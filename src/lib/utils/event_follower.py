@@ -0,0 +1,114 @@
+import asyncio
+
+from src.lib.data_entities.errors import ArbSdkError
+
+DEFAULT_MAX_REORG_DEPTH = 128
+
+DEFAULT_FOLLOW_POLL_INTERVAL = 1.0
+
+
+class EventFollower:
+    def __init__(
+        self,
+        event_fetcher,
+        fetch,
+        from_block=None,
+        confirmations=0,
+        max_reorg_depth=DEFAULT_MAX_REORG_DEPTH,
+        block_range_size=None,
+        concurrency=1,
+    ):
+        self.event_fetcher = event_fetcher
+        self.fetch = fetch
+        self.from_block = from_block
+        self.confirmations = confirmations
+        self.max_reorg_depth = max_reorg_depth
+        self.block_range_size = block_range_size
+        self.concurrency = concurrency
+
+        self.next_block = None
+        # (block number, block hash) pairs known to be canonical when they were fetched, oldest first.
+        self.checkpoints = []
+        # Events emitted within the tracked history, kept so they can be retracted after a reorg.
+        self.emitted = []
+
+    @property
+    def provider(self):
+        return self.event_fetcher.provider
+
+    async def poll(self):
+        head = await self.event_fetcher.get_block_number()
+        target = head - self.confirmations
+
+        if self.next_block is None:
+            if self.from_block is None:
+                self.next_block = target
+            else:
+                self.next_block = await self.event_fetcher.resolve_block_number(self.from_block)
+
+        events = await self.rewind()
+        if target < self.next_block:
+            return events
+
+        # The tip hash is read before the logs so a reorg racing the query is caught on the next poll.
+        tip = await self.event_fetcher._call_rpc(self.provider.eth.get_block, target)
+        fetched_events = await self.event_fetcher._fetch_windows(
+            self.fetch,
+            {"fromBlock": self.next_block, "toBlock": target},
+            self.block_range_size,
+            self.concurrency,
+        )
+
+        for fetched_event in fetched_events:
+            self.add_checkpoint(fetched_event.block_number, fetched_event.block_hash)
+        self.add_checkpoint(target, tip["hash"])
+
+        self.emitted.extend(fetched_events)
+        self.next_block = target + 1
+        self.prune(target)
+        return events + fetched_events
+
+    async def rewind(self):
+        if not self.checkpoints:
+            return []
+
+        invalidated = False
+        while self.checkpoints:
+            number, block_hash = self.checkpoints[-1]
+            block = await self.event_fetcher._call_rpc(self.provider.eth.get_block, number)
+            if block is not None and block["hash"] == block_hash:
+                break
+            self.checkpoints.pop()
+            invalidated = True
+
+        if not invalidated:
+            return []
+
+        if not self.checkpoints:
+            raise ArbSdkError(f"Chain reorganisation is deeper than the {self.max_reorg_depth} tracked blocks.")
+
+        last_valid_block = self.checkpoints[-1][0]
+        retracted = [e for e in self.emitted if e.block_number > last_valid_block]
+        self.emitted = [e for e in self.emitted if e.block_number <= last_valid_block]
+        self.next_block = last_valid_block + 1
+
+        return [fetched_event.as_removed() for fetched_event in reversed(retracted)]
+
+    def add_checkpoint(self, block_number, block_hash):
+        if self.checkpoints and self.checkpoints[-1][0] == block_number:
+            return
+        self.checkpoints.append((block_number, block_hash))
+
+    def prune(self, target):
+        oldest = target - self.max_reorg_depth
+        while len(self.checkpoints) > 1 and self.checkpoints[0][0] < oldest:
+            self.checkpoints.pop(0)
+
+        oldest_tracked = self.checkpoints[0][0]
+        self.emitted = [e for e in self.emitted if e.block_number >= oldest_tracked]
+
+    async def follow(self, poll_interval=DEFAULT_FOLLOW_POLL_INTERVAL):
+        while True:
+            for fetched_event in await self.poll():
+                yield fetched_event
+            await asyncio.sleep(poll_interval)
@@ -0,0 +1,74 @@
+import asyncio
+import contextvars
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from web3 import AsyncWeb3
+
+DEFAULT_EXECUTOR_MAX_WORKERS = 16
+
+# Set by enable_thread_offload: the pool blocking calls run on, and whether call_rpc offloads by default.
+executor_config = {"executor": None, "offload": False}
+
+
+def enable_thread_offload(max_workers=DEFAULT_EXECUTOR_MAX_WORKERS):
+    # Opt-in mode for synchronous Web3 providers: RPC calls made from the SDK's coroutines run on a
+    # bounded thread pool, so that asyncio.gather over them actually overlaps the requests.
+    disable_thread_offload()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="arb-sdk-rpc")
+    executor_config["executor"] = executor
+    executor_config["offload"] = True
+    return executor
+
+
+def disable_thread_offload(wait=True):
+    executor = executor_config["executor"]
+    executor_config["executor"] = None
+    executor_config["offload"] = False
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def is_async_provider(provider):
+    return isinstance(provider, AsyncWeb3)
+
+
+def can_overlap_rpc(provider):
+    # Whether concurrent call_rpc calls against provider actually run at the same time.
+    return is_async_provider(provider) or executor_config["offload"]
+
+
+async def run_blocking(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    # Runs in the caller's context, so context variables such as the instrumentation operation carry over.
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(executor_config["executor"], partial(context.run, fn, *args, **kwargs))
+
+
+async def resolve(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+async def call_rpc(fn, *args, offload=None, **kwargs):
+    # Awaits AsyncWeb3 calls natively. Synchronous web3 calls run inline, or on the executor when
+    # offload is set (by default only in thread offload mode) so concurrent callers overlap.
+    if offload is None:
+        offload = executor_config["offload"] and not inspect.iscoroutinefunction(fn)
+
+    if offload:
+        return await resolve(await run_blocking(fn, *args, **kwargs))
+    return await resolve(fn(*args, **kwargs))
+
+
+async def gather_or_cancel(*aws):
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
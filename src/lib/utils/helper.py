@@ -1,4 +1,5 @@
 import json
+import weakref
 from typing import cast
 
 import rlp
@@ -13,6 +14,9 @@ from web3.types import AccessList, Nonce, Wei
 
 from src.lib.data_entities.signer_or_provider import SignerOrProvider
 from src.lib.utils.arb_provider import ArbitrumProvider
+from src.lib.utils.chain_id import get_chain_id
+from src.lib.utils.executor import call_rpc
+from src.lib.utils.instrumentation import measure
 
 
 def format_contract_output(contract, function_name, output):
@@ -94,6 +98,44 @@ def parse_raw_tx(raw_tx):
     }
 
 
+abi_registry = {}
+contract_factory_registry = weakref.WeakKeyDictionary()
+abi_registry_stats = {"abiHits": 0, "abiMisses": 0, "factoryHits": 0, "factoryMisses": 0}
+
+
+def get_abi_registry_stats():
+    return CaseDict(dict(abi_registry_stats))
+
+
+def clear_abi_registry():
+    abi_registry.clear()
+    contract_factory_registry.clear()
+    for key in abi_registry_stats:
+        abi_registry_stats[key] = 0
+
+
+def get_contract_factory(provider, contract_name, is_classic=False):
+    key = (contract_name, is_classic)
+    try:
+        factories = contract_factory_registry.setdefault(provider, {})
+    except TypeError:
+        factories = {}
+
+    if key in factories:
+        abi_registry_stats["factoryHits"] += 1
+        return factories[key]
+
+    abi_registry_stats["factoryMisses"] += 1
+    abi, bytecode = load_abi(contract_name, is_classic=is_classic)
+    if not bytecode:
+        contract_factory = provider.eth.contract(abi=abi)
+    else:
+        contract_factory = provider.eth.contract(abi=abi, bytecode=bytecode)
+
+    factories[key] = contract_factory
+    return contract_factory
+
+
 def load_contract(contract_name, provider, address=None, is_classic=False):
     if isinstance(provider, SignerOrProvider):
         provider = provider.provider
@@ -104,35 +146,23 @@ def load_contract(contract_name, provider, address=None, is_classic=False):
     else:
         provider = provider
 
-    if is_classic:
-        file_path = f"src/abi/classic/{contract_name}.json"
-    else:
-        file_path = f"src/abi/{contract_name}.json"
-
-    with open(file_path, "r") as abi_file:
-        contract_data = json.load(abi_file)
-        if not contract_data.get("abi"):
-            raise Exception(f"No ABI found for contract: {contract_name}")
-        abi = contract_data.get("abi", None)
-        bytecode = contract_data.get("bytecode", None)
+    with measure(provider, "load_contract", contract_name):
+        contract_factory = get_contract_factory(provider, contract_name, is_classic=is_classic)
 
-    if address is not None:
-        if isinstance(address, str):
-            contract_address = Web3.to_checksum_address(address)
+        if address is not None:
+            if isinstance(address, str):
+                contract_address = Web3.to_checksum_address(address)
 
-        elif isinstance(address, Contract):
-            contract_address = Web3.to_checksum_address(address.address)
+            elif isinstance(address, Contract):
+                contract_address = Web3.to_checksum_address(address.address)
 
-        else:
-            contract_address = address
+            else:
+                contract_address = address
 
-        return provider.eth.contract(address=contract_address, abi=abi)
+            return contract_factory(address=contract_address)
 
-    else:
-        if not bytecode:
-            return provider.eth.contract(abi=abi)
         else:
-            return provider.eth.contract(abi=abi, bytecode=bytecode)
+            return contract_factory
 
 
 def deploy_abi_contract(
@@ -157,6 +187,12 @@ def deploy_abi_contract(
 
 
 def load_abi(contract_name, is_classic=False):
+    key = (contract_name, is_classic)
+    if key in abi_registry:
+        abi_registry_stats["abiHits"] += 1
+        return abi_registry[key]
+
+    abi_registry_stats["abiMisses"] += 1
     if is_classic:
         file_path = f"src/abi/classic/{contract_name}.json"
     else:
@@ -170,6 +206,7 @@ def load_abi(contract_name, is_classic=False):
         abi = contract_data.get("abi", None)
         bytecode = contract_data.get("bytecode", None)
 
+    abi_registry[key] = (abi, bytecode)
     return abi, bytecode
 
 
@@ -178,6 +215,12 @@ def is_contract_deployed(provider, address):
     return bytecode != "0x" and len(bytecode) > 2
 
 
+async def fetch_is_contract_deployed(provider, address):
+    # Like is_contract_deployed, but also awaits the code of AsyncWeb3 providers.
+    bytecode = await call_rpc(provider.eth.get_code, Web3.to_checksum_address(address))
+    return len(HexBytes(bytecode)) > 0
+
+
 def snake_to_camel(name):
     special_cases = {"id": "ID", "ids": "IDs", "erc20": "ERC20"}
     components = name.split("_")
@@ -196,7 +239,7 @@ def sign_and_sent_raw_transaction(signer, tx):
         tx["nonce"] = signer.provider.eth.get_transaction_count(signer.account.address)
 
     if "chainId" not in tx:
-        tx["chainId"] = signer.provider.eth.chain_id
+        tx["chainId"] = get_chain_id(signer.provider)
 
     gas_estimate = signer.provider.eth.estimate_gas(tx)
 
@@ -0,0 +1,294 @@
+import bisect
+import contextvars
+import functools
+import threading
+import time
+import weakref
+from contextlib import contextmanager, nullcontext
+
+from src.lib.data_entities.errors import ArbSdkError
+from src.lib.utils.executor import is_async_provider
+
+# Upper bounds, in seconds, of the latency histogram buckets. Slower calls land in a last bucket.
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+INSTRUMENTATION_MIDDLEWARE = "instrumentation"
+
+OPENTELEMETRY_TRACER_NAME = "arbitrum_sdk"
+
+instrumentation_registry = weakref.WeakKeyDictionary()
+
+current_operation = contextvars.ContextVar("arb_sdk_operation", default=None)
+
+NO_MEASUREMENT = nullcontext()
+
+
+def enable_instrumentation(provider, instrumentation=None):
+    instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+    if is_async_provider(provider):
+        middleware = instrumentation.async_middleware
+    else:
+        middleware = instrumentation.middleware
+
+    disable_instrumentation(provider)
+    provider.middleware_onion.inject(middleware, name=INSTRUMENTATION_MIDDLEWARE, layer=0)
+    instrumentation_registry[provider] = instrumentation
+    return instrumentation
+
+
+def disable_instrumentation(provider):
+    instrumentation_registry.pop(provider, None)
+    if INSTRUMENTATION_MIDDLEWARE in provider.middleware_onion:
+        provider.middleware_onion.remove(INSTRUMENTATION_MIDDLEWARE)
+
+
+def get_instrumentation(provider):
+    try:
+        return instrumentation_registry.get(provider)
+    except TypeError:
+        return None
+
+
+def measure(provider, kind, name, size=None):
+    # The empty registry check keeps uninstrumented calls down to one function call.
+    if not instrumentation_registry:
+        return NO_MEASUREMENT
+    instrumentation = get_instrumentation(provider)
+    if instrumentation is None:
+        return NO_MEASUREMENT
+    return Measurement(instrumentation, kind, name, size)
+
+
+def rpc_error(response):
+    if isinstance(response, dict) and response.get("error") is not None:
+        return ValueError(response["error"])
+    return None
+
+
+class Operation:
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+
+    @property
+    def path(self):
+        return self.name if self.parent is None else f"{self.parent.path}/{self.name}"
+
+
+@contextmanager
+def operation(name):
+    # Attributes every instrumented call made inside the block, including from tasks it starts and
+    # calls offloaded to threads, to the operation name. Operations nest.
+    parent = current_operation.get()
+    if parent is not None and parent.name == name:
+        # A method delegating to its namesake, e.g. a reader wrapper's status().
+        yield parent
+        return
+
+    scope = Operation(name, parent)
+    token = current_operation.set(scope)
+    try:
+        yield scope
+    finally:
+        current_operation.reset(token)
+
+
+def instrumented_operation(name):
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            if not instrumentation_registry:
+                return await fn(*args, **kwargs)
+            with operation(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class LatencyHistogram:
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, latency):
+        self.counts[bisect.bisect_left(self.buckets, latency)] += 1
+        self.count += 1
+        self.sum += latency
+
+    def quantile(self, q):
+        # The upper bound of the bucket holding the q-th latency, None past the last bound.
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def as_dict(self):
+        return {
+            "buckets": list(self.buckets),
+            "counts": list(self.counts),
+            "count": self.count,
+            "sum": self.sum,
+        }
+
+
+class CallMetrics:
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.count = 0
+        self.errors = 0
+        # Inner calls of multicalls, events of log queries.
+        self.size = 0
+        self.latency = LatencyHistogram(buckets)
+
+
+class Measurement:
+    def __init__(self, instrumentation, kind, name, size=None):
+        self.instrumentation = instrumentation
+        self.kind = kind
+        self.name = name
+        self.size = size
+        # Set by the caller for failures that are not raised, such as JSON-RPC error responses.
+        self.error = None
+
+    def __enter__(self):
+        self.start_time = time.time_ns()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.instrumentation.record(
+            self.kind,
+            self.name,
+            time.perf_counter() - self.started,
+            self.start_time,
+            error=exc if exc is not None else self.error,
+            size=self.size,
+        )
+        return False
+
+
+class Instrumentation:
+    # Counts and times JSON-RPC requests, multicalls, log queries and contract loads made through an
+    # instrumented provider, per operation (see operation). Every call is also handed to each exporter
+    # as a record dict; an exporter is any callable, e.g. OpenTelemetryExporter.
+    def __init__(self, exporters=None, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.exporters = list(exporters or [])
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        # (operation name, kind, name) -> CallMetrics.
+        self.metrics = {}
+
+    def record(self, kind, name, latency, start_time, error=None, size=None):
+        scope = current_operation.get()
+        key = (scope.name if scope is not None else None, kind, name)
+
+        with self.lock:
+            metrics = self.metrics.get(key)
+            if metrics is None:
+                metrics = self.metrics[key] = CallMetrics(self.buckets)
+            metrics.count += 1
+            metrics.errors += int(error is not None)
+            metrics.size += size or 0
+            metrics.latency.observe(latency)
+
+        if not self.exporters:
+            return
+
+        record = {
+            "operation": key[0],
+            "path": scope.path if scope is not None else None,
+            "kind": kind,
+            "name": name,
+            "latency": latency,
+            "startTime": start_time,
+            "endTime": start_time + int(latency * 1e9),
+            "error": error,
+            "size": size,
+        }
+        for exporter in self.exporters:
+            exporter(record)
+
+    def snapshot(self, operation_name=None):
+        with self.lock:
+            return [
+                {
+                    "operation": operation_key,
+                    "kind": kind,
+                    "name": name,
+                    "count": metrics.count,
+                    "errors": metrics.errors,
+                    "size": metrics.size,
+                    "latency": metrics.latency.as_dict(),
+                    "p50": metrics.latency.quantile(0.5),
+                    "p95": metrics.latency.quantile(0.95),
+                }
+                for (operation_key, kind, name), metrics in self.metrics.items()
+                if operation_name is None or operation_key == operation_name
+            ]
+
+    def count(self, operation_name=None, kind=None, name=None):
+        with self.lock:
+            return sum(
+                metrics.count
+                for (operation_key, metrics_kind, metrics_name), metrics in self.metrics.items()
+                if (operation_name is None or operation_key == operation_name)
+                and (kind is None or metrics_kind == kind)
+                and (name is None or metrics_name == name)
+            )
+
+    def reset(self):
+        with self.lock:
+            self.metrics.clear()
+
+    def middleware(self, make_request, w3):
+        def middleware(method, params):
+            with Measurement(self, "rpc", method) as measurement:
+                response = make_request(method, params)
+                measurement.error = rpc_error(response)
+                return response
+
+        return middleware
+
+    async def async_middleware(self, make_request, w3):
+        async def middleware(method, params):
+            with Measurement(self, "rpc", method) as measurement:
+                response = await make_request(method, params)
+                measurement.error = rpc_error(response)
+                return response
+
+        return middleware
+
+
+class OpenTelemetryExporter:
+    # Emits each record as a span, parented to the active OpenTelemetry span. The tracer defaults to
+    # one from opentelemetry-api, which must then be installed.
+    def __init__(self, tracer=None):
+        if tracer is None:
+            try:
+                from opentelemetry import trace
+            except ImportError as err:
+                raise ArbSdkError("OpenTelemetryExporter requires the opentelemetry-api package.", err)
+            tracer = trace.get_tracer(OPENTELEMETRY_TRACER_NAME)
+        self.tracer = tracer
+
+    def __call__(self, record):
+        attributes = {"arb_sdk.kind": record["kind"], "arb_sdk.name": record["name"]}
+        if record["operation"] is not None:
+            attributes["arb_sdk.operation"] = record["path"]
+        if record["size"] is not None:
+            attributes["arb_sdk.size"] = record["size"]
+        if record["error"] is not None:
+            attributes["error.type"] = type(record["error"]).__name__
+
+        span = self.tracer.start_span(
+            f"{record['kind']} {record['name']}", start_time=record["startTime"], attributes=attributes
+        )
+        span.end(end_time=record["endTime"])
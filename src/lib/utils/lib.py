@@ -1,4 +1,5 @@
 import asyncio
+import math
 
 from web3.exceptions import TimeExhausted, TransactionNotFound
 
@@ -6,7 +7,24 @@ from src.lib.data_entities.constants import ARB_SYS_ADDRESS
 from src.lib.data_entities.errors import ArbSdkError
 from src.lib.data_entities.networks import l2_networks
 from src.lib.utils.arb_provider import ArbitrumProvider
-from src.lib.utils.helper import load_contract
+from src.lib.utils.chain_id import fetch_chain_id
+from src.lib.utils.executor import call_rpc, can_overlap_rpc
+from src.lib.utils.helper import CaseDict, load_contract
+
+DEFAULT_BLOCK_SEARCH_WIDTH = 8
+
+# Totals over every get_first_block_for_l1_block search: a round is one set of concurrent probes,
+# a probe one L2 block lookup.
+block_search_stats = {"searches": 0, "rounds": 0, "probes": 0}
+
+
+def get_block_search_stats():
+    return CaseDict(dict(block_search_stats))
+
+
+def clear_block_search_stats():
+    for key in block_search_stats:
+        block_search_stats[key] = 0
 
 
 def get_contract_instance(provider, contract_address, contract_abi):
@@ -14,7 +32,7 @@ def get_contract_instance(provider, contract_address, contract_abi):
 
 
 async def get_base_fee(provider):
-    latest_block = provider.eth.get_block("latest")
+    latest_block = await call_rpc(provider.eth.get_block, "latest")
     base_fee = latest_block["baseFeePerGas"]
     if not base_fee:
         raise ArbSdkError(
@@ -30,9 +48,9 @@ async def wait(ms):
 async def get_transaction_receipt(provider, tx_hash, confirmations=None, timeout=None):
     if confirmations or timeout:
         try:
-            receipt = provider.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout / 1000)
+            receipt = await call_rpc(provider.eth.wait_for_transaction_receipt, tx_hash, timeout=timeout / 1000)
             if confirmations:
-                latest_block = provider.eth.block_number
+                latest_block = await call_rpc(lambda: provider.eth.block_number)
                 if latest_block - receipt.blockNumber < confirmations:
                     return None
             return receipt
@@ -44,7 +62,7 @@ async def get_transaction_receipt(provider, tx_hash, confirmations=None, timeout
             raise e
     else:
         try:
-            receipt = provider.eth.get_transaction_receipt(tx_hash)
+            receipt = await call_rpc(provider.eth.get_transaction_receipt, tx_hash)
             return receipt
 
         except TransactionNotFound:
@@ -66,7 +84,7 @@ async def is_arbitrum_chain(provider):
             address=ARB_SYS_ADDRESS,
             is_classic=False,
         )
-        arb_sys_contract.functions.arbOSVersion().call()
+        await call_rpc(arb_sys_contract.functions.arbOSVersion().call)
         return True
 
     except Exception:
@@ -79,20 +97,27 @@ async def get_first_block_for_l1_block(
     allow_greater=False,
     min_l2_block=None,
     max_l2_block="latest",
+    search_width=None,
+    interpolate=True,
 ):
     if not (await is_arbitrum_chain(provider)):
         return for_l1_block
 
     arb_provider = ArbitrumProvider(provider)
 
-    current_arb_block = arb_provider.provider.eth.get_block_number()
-    arbitrum_chain_id = arb_provider.provider.eth.chain_id
+    current_arb_block = await call_rpc(arb_provider.provider.eth.get_block_number)
+    arbitrum_chain_id = await fetch_chain_id(arb_provider.provider)
     nitro_genesis_block = l2_networks[arbitrum_chain_id].nitro_genesis_block
 
     async def get_l1_block(for_l2_block):
         block = await arb_provider.get_block(for_l2_block)
         return int(block["l1BlockNumber"], 16)
 
+    async def get_l1_blocks(for_l2_blocks):
+        block_search_stats["rounds"] += 1
+        block_search_stats["probes"] += len(for_l2_blocks)
+        return await asyncio.gather(*[get_l1_block(for_l2_block) for for_l2_block in for_l2_blocks])
+
     if not min_l2_block:
         min_l2_block = nitro_genesis_block
 
@@ -107,26 +132,86 @@ async def get_first_block_for_l1_block(
             f"'minL2Block' ({min_l2_block}) cannot be below 'nitroGenesisBlock', which is {nitro_genesis_block} for the current network."
         )
 
-    start = min_l2_block
-    end = max_l2_block
+    if search_width is None:
+        search_width = DEFAULT_BLOCK_SEARCH_WIDTH if can_overlap_rpc(arb_provider.provider) else 1
 
-    result_for_target_block = None
-    result_for_greater_block = None
+    block_search_stats["searches"] += 1
+    if interpolate:
+        end, end_l1_block = await interpolation_search(
+            get_l1_blocks, for_l1_block, min_l2_block, max_l2_block, search_width
+        )
+    else:
+        end, end_l1_block = await k_ary_search(get_l1_blocks, for_l1_block, min_l2_block, max_l2_block, search_width)
+
+    if end_l1_block is None:
+        return None
+    if end_l1_block == for_l1_block or allow_greater:
+        return end
+    return None
+
+
+async def k_ary_search(get_l1_blocks, for_l1_block, start, max_l2_block, search_width):
+    # Searches for the first L2 block whose L1 block is at least for_l1_block. Each round probes
+    # search_width evenly spaced blocks at once, which a batching transport sends as one request.
+    end = max_l2_block + 1
+    end_l1_block = None
+
+    while start < end:
+        probes = sorted({start + (end - start) * (i + 1) // (search_width + 1) for i in range(search_width)})
+        l1_blocks = await get_l1_blocks(probes)
+
+        next_start = start
+        for probe, l1_block in zip(probes, l1_blocks):
+            if l1_block >= for_l1_block:
+                end, end_l1_block = probe, l1_block
+                break
+            next_start = probe + 1
+        start = next_start
+
+    return end, end_l1_block
+
+
+async def interpolation_search(get_l1_blocks, for_l1_block, min_l2_block, max_l2_block, search_width):
+    # The same search, but L1 block numbers grow almost linearly with L2 block numbers, so each round
+    # probes where the line through the bracket crosses for_l1_block (false position, with the Illinois
+    # correction for a bracket end that is kept twice in a row). If that takes more rounds than a binary
+    # search would, the rest of the bracket goes to k_ary_search.
+    low_l1_block, high_l1_block = await get_l1_blocks([min_l2_block, max_l2_block])
+    if low_l1_block >= for_l1_block:
+        return min_l2_block, low_l1_block
+    if high_l1_block < for_l1_block:
+        return max_l2_block + 1, None
+
+    # The answer is in (low, high]. The line is fitted to for_l1_block - 0.5, the step it is after.
+    low, high = min_l2_block, max_l2_block
+    low_distance = low_l1_block - for_l1_block + 0.5
+    high_distance = high_l1_block - for_l1_block + 0.5
+    kept = None
+
+    for _ in range((high - low).bit_length()):
+        if high - low <= 1:
+            return high, high_l1_block
+
+        guess = low + math.ceil(-low_distance * (high - low) / (high_distance - low_distance))
+        probe = min(max(guess, low + 1), high - 1)
+        (l1_block,) = await get_l1_blocks([probe])
+
+        if l1_block >= for_l1_block:
+            high, high_l1_block, high_distance = probe, l1_block, l1_block - for_l1_block + 0.5
+            if kept == "low":
+                low_distance /= 2
+            kept = "low"
+        else:
+            low, low_distance = probe, l1_block - for_l1_block + 0.5
+            if kept == "high":
+                high_distance /= 2
+            kept = "high"
 
-    while start <= end:
-        mid = start + (end - start) // 2
-        l1_block = await get_l1_block(mid)
+    if high - low <= 1:
+        return high, high_l1_block
 
-        if l1_block == for_l1_block:
-            result_for_target_block = mid
-            end = mid - 1
-        elif l1_block < for_l1_block:
-            start = mid + 1
-        else:
-            if allow_greater:
-                result_for_greater_block = mid
-            end = mid - 1
-    return result_for_target_block if result_for_target_block is not None else result_for_greater_block
+    end, end_l1_block = await k_ary_search(get_l1_blocks, for_l1_block, low + 1, high - 1, search_width)
+    return (end, end_l1_block) if end_l1_block is not None else (high, high_l1_block)
 
 
 async def get_block_ranges_for_l1_block(
@@ -135,27 +220,31 @@ async def get_block_ranges_for_l1_block(
     allow_greater=False,
     min_l2_block=None,
     max_l2_block="latest",
+    interpolate=True,
 ):
     arb_provider = ArbitrumProvider(provider)
 
-    current_l2_block = arb_provider.provider.eth.block_number
+    current_l2_block = await call_rpc(lambda: arb_provider.provider.eth.block_number)
     if not max_l2_block or max_l2_block == "latest":
         max_l2_block = current_l2_block
 
-    start_block = await get_first_block_for_l1_block(
-        provider=provider,
-        for_l1_block=for_l1_block,
-        allow_greater=False,
-        min_l2_block=min_l2_block,
-        max_l2_block=max_l2_block,
-    )
-
-    end_block = await get_first_block_for_l1_block(
-        provider=provider,
-        for_l1_block=for_l1_block + 1,
-        allow_greater=True,
-        min_l2_block=min_l2_block,
-        max_l2_block=max_l2_block,
+    start_block, end_block = await asyncio.gather(
+        get_first_block_for_l1_block(
+            provider=provider,
+            for_l1_block=for_l1_block,
+            allow_greater=False,
+            min_l2_block=min_l2_block,
+            max_l2_block=max_l2_block,
+            interpolate=interpolate,
+        ),
+        get_first_block_for_l1_block(
+            provider=provider,
+            for_l1_block=for_l1_block + 1,
+            allow_greater=True,
+            min_l2_block=min_l2_block,
+            max_l2_block=max_l2_block,
+            interpolate=interpolate,
+        ),
     )
     if not start_block:
         return [None, None]
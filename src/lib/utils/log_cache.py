@@ -0,0 +1,165 @@
+import json
+import sqlite3
+import threading
+import weakref
+
+from hexbytes import HexBytes
+from web3 import Web3
+
+DEFAULT_FINALITY_DEPTH = 64
+
+log_cache_registry = weakref.WeakKeyDictionary()
+
+
+def enable_log_cache(provider, log_cache):
+    log_cache_registry[provider] = log_cache
+    return log_cache
+
+
+def disable_log_cache(provider):
+    log_cache_registry.pop(provider, None)
+
+
+def get_log_cache(provider):
+    try:
+        return log_cache_registry.get(provider)
+    except TypeError:
+        return None
+
+
+class LogCache:
+    # With no finality_depth the node's "finalized" block tag decides what may be cached,
+    # falling back to DEFAULT_FINALITY_DEPTH blocks behind the head when the tag is unsupported.
+    def __init__(self, path=":memory:", finality_depth=None):
+        self.path = path
+        self.finality_depth = finality_depth
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+
+        with self.lock, self.connection:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS logs (
+                    chain_id INTEGER NOT NULL,
+                    address TEXT NOT NULL,
+                    topic0 TEXT NOT NULL,
+                    block_number INTEGER NOT NULL,
+                    log_index INTEGER NOT NULL,
+                    block_hash TEXT NOT NULL,
+                    transaction_hash TEXT NOT NULL,
+                    transaction_index INTEGER,
+                    topics TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (chain_id, address, topic0, block_number, log_index)
+                )
+                """
+            )
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS coverage (
+                    chain_id INTEGER NOT NULL,
+                    address TEXT NOT NULL,
+                    topic0 TEXT NOT NULL,
+                    from_block INTEGER NOT NULL,
+                    to_block INTEGER NOT NULL
+                )
+                """
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS coverage_key ON coverage (chain_id, address, topic0, from_block)"
+            )
+
+    @staticmethod
+    def _key(chain_id, address, topic0):
+        return chain_id, address.lower(), Web3.to_hex(HexBytes(topic0))
+
+    def covered_ranges(self, chain_id, address, topic0):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT from_block, to_block FROM coverage WHERE chain_id = ? AND address = ? AND topic0 = ? "
+                "ORDER BY from_block",
+                self._key(chain_id, address, topic0),
+            ).fetchall()
+        return [tuple(row) for row in rows]
+
+    def missing_ranges(self, chain_id, address, topic0, from_block, to_block):
+        missing = []
+        start = from_block
+        for covered_from, covered_to in self.covered_ranges(chain_id, address, topic0):
+            if covered_to < start:
+                continue
+            if covered_from > to_block:
+                break
+            if covered_from > start:
+                missing.append((start, covered_from - 1))
+            start = max(start, covered_to + 1)
+
+        if start <= to_block:
+            missing.append((start, to_block))
+        return missing
+
+    def store(self, chain_id, address, topic0, from_block, to_block, logs):
+        key = self._key(chain_id, address, topic0)
+        rows = [
+            (
+                *key,
+                log["blockNumber"],
+                log["logIndex"],
+                Web3.to_hex(HexBytes(log["blockHash"])),
+                Web3.to_hex(HexBytes(log["transactionHash"])),
+                log.get("transactionIndex"),
+                json.dumps([Web3.to_hex(HexBytes(topic)) for topic in log["topics"]]),
+                Web3.to_hex(HexBytes(log["data"])),
+            )
+            for log in logs
+        ]
+
+        with self.lock, self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO logs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+            # Merge the new range with every covered range it overlaps or touches.
+            overlapping = self.connection.execute(
+                "SELECT rowid, from_block, to_block FROM coverage WHERE chain_id = ? AND address = ? AND topic0 = ? "
+                "AND to_block >= ? AND from_block <= ?",
+                (*key, from_block - 1, to_block + 1),
+            ).fetchall()
+            merged_from = min([from_block] + [row[1] for row in overlapping])
+            merged_to = max([to_block] + [row[2] for row in overlapping])
+
+            self.connection.executemany("DELETE FROM coverage WHERE rowid = ?", [(row[0],) for row in overlapping])
+            self.connection.execute("INSERT INTO coverage VALUES (?, ?, ?, ?, ?)", (*key, merged_from, merged_to))
+
+    def get_logs(self, chain_id, address, topic0, from_block, to_block):
+        key = self._key(chain_id, address, topic0)
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT block_number, log_index, block_hash, transaction_hash, transaction_index, topics, data "
+                "FROM logs WHERE chain_id = ? AND address = ? AND topic0 = ? AND block_number BETWEEN ? AND ? "
+                "ORDER BY block_number, log_index",
+                (*key, from_block, to_block),
+            ).fetchall()
+
+        checksum_address = Web3.to_checksum_address(address)
+        return [
+            {
+                "address": checksum_address,
+                "blockNumber": block_number,
+                "logIndex": log_index,
+                "blockHash": HexBytes(block_hash),
+                "transactionHash": HexBytes(transaction_hash),
+                "transactionIndex": transaction_index,
+                "topics": [HexBytes(topic) for topic in json.loads(topics)],
+                "data": HexBytes(data),
+                "removed": False,
+            }
+            for block_number, log_index, block_hash, transaction_hash, transaction_index, topics, data in rows
+        ]
+
+    def clear(self):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM logs")
+            self.connection.execute("DELETE FROM coverage")
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
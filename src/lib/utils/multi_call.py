@@ -1,31 +1,134 @@
-from web3 import Web3
+import asyncio
 
+from eth_abi.exceptions import DecodingError
+from hexbytes import HexBytes
+from web3 import AsyncWeb3, Web3
+from web3.exceptions import ContractLogicError
+
+from src.lib.data_entities.constants import ADDRESS_ZERO, MULTICALL3_ADDRESS
 from src.lib.data_entities.errors import ArbSdkError
 from src.lib.data_entities.networks import is_l1_network, l1_networks, l2_networks
 from src.lib.data_entities.signer_or_provider import SignerOrProvider
 from src.lib.utils.arb_provider import ArbitrumProvider
-from src.lib.utils.helper import load_contract
+from src.lib.utils.call_spec import get_call_spec
+from src.lib.utils.chain_id import fetch_chain_id
+from src.lib.utils.event_fetcher import is_log_range_error
+from src.lib.utils.executor import call_rpc, gather_or_cancel, is_async_provider
+from src.lib.utils.instrumentation import measure
+from src.lib.utils.multi_call_batcher import MultiCallBatcher, multi_call_batchers
+from src.lib.utils.multi_endpoint_provider import is_retryable_error
+from src.lib.utils.rate_limiter import is_rate_limit_error
+
+DEFAULT_MAX_CHUNK_CALLDATA_SIZE = 64 * 1024
+
+DEFAULT_MAX_CHUNK_GAS = 20_000_000
+
+DEFAULT_CALL_GAS_ESTIMATE = 60_000
+
+DEFAULT_MULTI_CALL_CONCURRENCY = 4
+
+# Retries of a chunk failing for a transient reason, e.g. a 429 or a node behind the others.
+DEFAULT_MULTI_CALL_RETRIES = 3
+
+# Seconds before the first retry of a chunk, doubled on every further retry.
+DEFAULT_MULTI_CALL_RETRY_BACKOFF = 0.25
+
+# Each (address, bytes) tuple adds an offset, the address, a bytes offset and a length word.
+CALL_ENCODING_OVERHEAD = 4 * 32
+
+CALLDATA_GAS_PER_BYTE = 16
+
+# Rejections of a multicall for its gas or payload, on top of the size and timeout errors of log queries.
+MULTI_CALL_SIZE_ERROR_MESSAGES = (
+    "gas required exceeds",
+    "out of gas",
+    "gas limit",
+    "too large",
+)
+
+
+def is_multi_call_size_error(err):
+    # A smaller chunk may pass these. Rate limits also read "too many", but are not about size.
+    if is_rate_limit_error(err):
+        return False
+    if is_log_range_error(err):
+        return True
+
+    message = str(err).lower()
+    return any(m in message for m in MULTI_CALL_SIZE_ERROR_MESSAGES)
+
+
+def chunk_calls(
+    calls,
+    gas_estimates=None,
+    max_chunk_calldata_size=DEFAULT_MAX_CHUNK_CALLDATA_SIZE,
+    max_chunk_gas=DEFAULT_MAX_CHUNK_GAS,
+):
+    chunks = []
+    start = 0
+    chunk_size = 0
+    chunk_gas = 0
+    for index, call in enumerate(calls):
+        calldata = call[1]
+        call_size = len(calldata) + CALL_ENCODING_OVERHEAD
+        call_gas = (gas_estimates[index] if gas_estimates else None) or DEFAULT_CALL_GAS_ESTIMATE
+        call_gas += CALLDATA_GAS_PER_BYTE * len(calldata)
+
+        if index > start and (chunk_size + call_size > max_chunk_calldata_size or chunk_gas + call_gas > max_chunk_gas):
+            chunks.append((start, index))
+            start = index
+            chunk_size = 0
+            chunk_gas = 0
+
+        chunk_size += call_size
+        chunk_gas += call_gas
+
+    if start < len(calls):
+        chunks.append((start, len(calls)))
+    return chunks
 
 
 class MultiCaller:
-    def __init__(self, provider, address):
-        if isinstance(provider, Web3):
+    def __init__(self, provider, address, is_multicall3=False, block_identifier=None):
+        if isinstance(provider, (Web3, AsyncWeb3)):
             self.provider = provider
 
         elif isinstance(provider, SignerOrProvider):
             self.provider = provider.provider
 
         elif isinstance(provider, ArbitrumProvider):
-            provider = provider.provider
+            self.provider = provider.provider
 
         else:
             raise ArbSdkError("Invalid provider type")
 
         self.address = address
+        self.is_multicall3 = is_multicall3
+        self.block_identifier = block_identifier
+        self.is_async = is_async_provider(self.provider)
+
+    async def _call_rpc(self, fn, *args, **kwargs):
+        return await call_rpc(fn, *args, offload=not self.is_async, **kwargs)
 
     @staticmethod
-    async def from_provider(provider):
-        chain_id = provider.eth.chain_id
+    def multicall3(provider, address=MULTICALL3_ADDRESS, block_identifier=None):
+        return MultiCaller(provider, address, is_multicall3=True, block_identifier=block_identifier)
+
+    async def pinned(self, block_identifier="latest"):
+        # Returns a caller whose batches all read the same block, resolving tags to a number once.
+        if not isinstance(block_identifier, int) and block_identifier in ("latest", "pending", "safe", "finalized"):
+            block_identifier = (await self._call_rpc(self.provider.eth.get_block, block_identifier))["number"]
+
+        return MultiCaller(
+            self.provider, self.address, is_multicall3=self.is_multicall3, block_identifier=block_identifier
+        )
+
+    @staticmethod
+    async def from_provider(provider, use_multicall3=False):
+        if use_multicall3:
+            return MultiCaller.multicall3(provider)
+
+        chain_id = await fetch_chain_id(get_web3(provider))
 
         l2_network = l2_networks.get(chain_id, None)
         l1_network = l1_networks.get(chain_id, None)
@@ -51,74 +154,211 @@ class MultiCaller:
         return MultiCaller(provider, multi_call_addr)
 
     def get_block_number_input(self):
-        iface = load_contract(
-            provider=self.provider,
-            contract_name="Multicall2",
-            address=self.address,
-            is_classic=True,
-        )
-        return {
-            "targetAddr": self.address,
-            "encoder": lambda: iface.encodeABI(fn_name="getBlockNumber"),
-            "decoder": lambda return_data: iface.decode_function_input("getBlockNumber", return_data)[1],
-        }
+        return get_call_spec("Multicall2", "getBlockNumber", is_classic=True).call_input(self.address)
 
     def get_current_block_timestamp_input(self):
-        iface = load_contract(
-            provider=self.provider,
-            contract_name="Multicall2",
-            address=self.address,
-            is_classic=True,
+        return get_call_spec("Multicall2", "getCurrentBlockTimestamp", is_classic=True).call_input(self.address)
+
+    def aggregate(self, calls, block_identifier=None):
+        # calls are (target, calldata, allow_failure, value) tuples.
+        with measure(self.provider, "multicall", "aggregate", size=len(calls)):
+            call_spec, transaction = self._encode_aggregate(calls)
+            return_data = self.provider.eth.call(transaction, self._resolve_block_identifier(block_identifier))
+            return self._decode_aggregate(call_spec, calls, return_data)
+
+    async def aggregate_async(self, calls, block_identifier=None):
+        with measure(self.provider, "multicall", "aggregate", size=len(calls)):
+            call_spec, transaction = self._encode_aggregate(calls)
+            return_data = await self._call_rpc(
+                self.provider.eth.call, transaction, self._resolve_block_identifier(block_identifier)
+            )
+            return self._decode_aggregate(call_spec, calls, return_data)
+
+    def _resolve_block_identifier(self, block_identifier):
+        if block_identifier is None:
+            return self.block_identifier or "latest"
+        return block_identifier
+
+    def _encode_aggregate(self, calls):
+        transaction = {"to": Web3.to_checksum_address(self.address)}
+        if self.is_multicall3:
+            total_value = sum(value for _, _, _, value in calls)
+            if total_value:
+                call_spec = get_call_spec("Multicall3", "aggregate3Value")
+                transaction["value"] = total_value
+                transaction["data"] = call_spec.encode(
+                    [[(target, allow_failure, value, calldata) for target, calldata, allow_failure, value in calls]]
+                )
+            else:
+                call_spec = get_call_spec("Multicall3", "aggregate3")
+                transaction["data"] = call_spec.encode(
+                    [[(target, allow_failure, calldata) for target, calldata, allow_failure, _ in calls]]
+                )
+            return call_spec, transaction
+
+        if any(value for _, _, _, value in calls):
+            raise ArbSdkError("Multicall2 cannot forward call value, use a Multicall3 caller.")
+
+        call_spec = get_call_spec("Multicall2", "tryAggregate", is_classic=True)
+        require_success = not any(allow_failure for _, _, allow_failure, _ in calls)
+        transaction["data"] = call_spec.encode(
+            [require_success, [(target, calldata) for target, calldata, _, _ in calls]]
         )
+        return call_spec, transaction
 
-        return {
-            "targetAddr": self.address,
-            "encoder": lambda: iface.encodeABI(fn_name="getCurrentBlockTimestamp"),
-            "decoder": lambda return_data: iface.decode_function_input("getCurrentBlockTimestamp", return_data)[1],
-        }
-
-    async def multi_call(self, params, require_success=False):
-        multi_call_contract = load_contract(
-            provider=self.provider,
-            contract_name="Multicall2",
-            address=self.address,
-            is_classic=True,
+    def _decode_aggregate(self, call_spec, calls, return_data):
+        outputs = call_spec.decode(return_data)
+        if self.is_multicall3:
+            return outputs
+
+        for (target, _, allow_failure, _), (success, _) in zip(calls, outputs):
+            if not success and not allow_failure:
+                raise ArbSdkError(f"Multicall to {target} failed and the call does not allow failure.")
+        return outputs
+
+    def try_aggregate(self, calls, require_success=False, block_identifier=None):
+        return self.aggregate(
+            [(target, calldata, not require_success, 0) for target, calldata in calls], block_identifier
+        )
+
+    async def try_aggregate_async(self, calls, require_success=False, block_identifier=None):
+        return await self.aggregate_async(
+            [(target, calldata, not require_success, 0) for target, calldata in calls], block_identifier
+        )
+
+    async def aggregate_chunked(
+        self,
+        calls,
+        gas_estimates=None,
+        block_identifier=None,
+        max_chunk_calldata_size=DEFAULT_MAX_CHUNK_CALLDATA_SIZE,
+        max_chunk_gas=DEFAULT_MAX_CHUNK_GAS,
+        concurrency=DEFAULT_MULTI_CALL_CONCURRENCY,
+    ):
+        chunks = chunk_calls(calls, gas_estimates, max_chunk_calldata_size, max_chunk_gas)
+
+        if block_identifier is None:
+            block_identifier = self.block_identifier
+        if len(chunks) > 1 and block_identifier in (None, "latest"):
+            # Chunks run as separate eth_calls; pin them to one block so the results are consistent.
+            block_identifier = await self._call_rpc(lambda: self.provider.eth.block_number)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        results = await gather_or_cancel(
+            *[self._aggregate_chunk(calls[start:end], block_identifier, semaphore) for start, end in chunks]
+        )
+        return [output for result in results for output in result]
+
+    async def _aggregate_chunk(self, calls, block_identifier, semaphore):
+        # Only the failing chunk is retried, so the chunks that succeeded are not sent again.
+        for attempt in range(DEFAULT_MULTI_CALL_RETRIES + 1):
+            try:
+                async with semaphore:
+                    return await self.aggregate_async(calls, block_identifier)
+
+            except (ContractLogicError, ArbSdkError):
+                raise
+
+            except Exception as err:
+                # The chunk was rejected as a whole (gas cap, response size, timeout): retry its halves.
+                if is_multi_call_size_error(err):
+                    return await self._split_chunk(calls, block_identifier, semaphore, err)
+                # A transient failure is retried as is. Any other, such as a refused connection, is raised.
+                if not is_retryable_error(err) or attempt == DEFAULT_MULTI_CALL_RETRIES:
+                    raise
+
+            await asyncio.sleep(DEFAULT_MULTI_CALL_RETRY_BACKOFF * 2**attempt)
+
+    async def _split_chunk(self, calls, block_identifier, semaphore, err):
+        if len(calls) == 1:
+            raise ArbSdkError(f"Multicall to {calls[0][0]} failed and cannot be split further.", err)
+
+        mid = len(calls) // 2
+        results = await gather_or_cancel(
+            self._aggregate_chunk(calls[:mid], block_identifier, semaphore),
+            self._aggregate_chunk(calls[mid:], block_identifier, semaphore),
         )
+        return results[0] + results[1]
+
+    async def multi_call(
+        self,
+        params,
+        require_success=False,
+        block_identifier=None,
+        max_chunk_calldata_size=DEFAULT_MAX_CHUNK_CALLDATA_SIZE,
+        max_chunk_gas=DEFAULT_MAX_CHUNK_GAS,
+        concurrency=DEFAULT_MULTI_CALL_CONCURRENCY,
+    ):
+        # Each input may set "allowFailure" (defaults to not require_success) and, on Multicall3, "value".
+        if not params:
+            return []
 
-        args = [{"target": p["targetAddr"], "callData": p["encoder"]()} for p in params]
+        calls = [
+            (
+                p["targetAddr"],
+                p["callData"] if "callData" in p else HexBytes(p["encoder"]()),
+                p.get("allowFailure", not require_success),
+                p.get("value", 0),
+            )
+            for p in params
+        ]
+        outputs = await self.aggregate_chunked(
+            calls,
+            gas_estimates=[p.get("gasEstimate") for p in params],
+            block_identifier=block_identifier,
+            max_chunk_calldata_size=max_chunk_calldata_size,
+            max_chunk_gas=max_chunk_gas,
+            concurrency=concurrency,
+        )
 
-        outputs = multi_call_contract.functions.tryAggregate(require_success, args).call()
+        results = []
+        for (success, return_data), p, (_, _, allow_failure, _) in zip(outputs, params, calls):
+            if not success:
+                results.append(None)
+                continue
 
-        return [p["decoder"](output["returnData"]) if output["success"] else None for output, p in zip(outputs, params)]
+            try:
+                results.append(p["decoder"](return_data))
+            except DecodingError:
+                # A target that answers with data of the wrong shape counts as a failed call.
+                if not allow_failure:
+                    raise
+                results.append(None)
+        return results
 
     async def get_token_data(self, erc20_addresses, defaulted_options=None):
         if defaulted_options is None:
             defaulted_options = {"name": True}
 
-        erc20_iface = load_contract(provider=self.provider, contract_name="ERC20", is_classic=True)
         inputs = []
         for address in erc20_addresses:
             if defaulted_options.get("balanceOf"):
                 account = defaulted_options["balanceOf"]["account"]
-                inputs.append(self._create_call_input(address, erc20_iface, "balanceOf", [account]))
+                inputs.append(self._create_call_input(address, "ERC20", "balanceOf", [account]))
 
             if defaulted_options.get("allowance"):
                 owner = defaulted_options["allowance"]["owner"]
                 spender = defaulted_options["allowance"]["spender"]
-                inputs.append(self._create_call_input(address, erc20_iface, "allowance", [owner, spender]))
+                inputs.append(self._create_call_input(address, "ERC20", "allowance", [owner, spender]))
 
             if defaulted_options.get("symbol"):
-                inputs.append(self._create_call_input(address, erc20_iface, "symbol", []))
+                inputs.append(self._create_call_input(address, "ERC20", "symbol", []))
 
             if defaulted_options.get("decimals"):
-                inputs.append(self._create_call_input(address, erc20_iface, "decimals", []))
+                inputs.append(self._create_call_input(address, "ERC20", "decimals", []))
 
             if defaulted_options.get("name"):
-                inputs.append(self._create_call_input(address, erc20_iface, "name", []))
+                inputs.append(self._create_call_input(address, "ERC20", "name", []))
+
+        stride = sum(
+            1 for option in ("balanceOf", "allowance", "symbol", "decimals", "name") if defaulted_options.get(option)
+        )
+        if not stride:
+            return []
 
         results = await self.multi_call(inputs)
         token_data = []
-        for i in range(0, len(results), len(defaulted_options)):
+        for i in range(0, len(results), stride):
             token_info = {}
             if defaulted_options.get("balanceOf"):
                 token_info["balance"] = results[i]
@@ -139,9 +379,82 @@ class MultiCaller:
 
         return token_data
 
-    def _create_call_input(self, address, contract, method, args):
-        return {
-            "targetAddr": address,
-            "encoder": lambda: contract.encodeABI(fn_name=method, args=args),
-            "decoder": lambda return_data: contract.decode_function_input(method, return_data)[1],
-        }
+    async def get_balance_matrix(
+        self,
+        accounts,
+        tokens,
+        block_identifier=None,
+        spenders=None,
+        max_chunk_calldata_size=DEFAULT_MAX_CHUNK_CALLDATA_SIZE,
+        max_chunk_gas=DEFAULT_MAX_CHUNK_GAS,
+        concurrency=DEFAULT_MULTI_CALL_CONCURRENCY,
+    ):
+        # balances[i][j] is the balance of accounts[i] in tokens[j] and allowances[i][j][k] what
+        # accounts[i] has approved spenders[k] to move of tokens[j]. A token of None or the zero
+        # address is native ETH, read through the multicall contract's getEthBalance. Failed reads are None.
+        spenders = spenders or []
+        eth_balance = get_call_spec("Multicall2", "getEthBalance", is_classic=True)
+        balance_of = get_call_spec("ERC20", "balanceOf", is_classic=True)
+        allowance = get_call_spec("ERC20", "allowance", is_classic=True)
+
+        inputs = []
+        for account in accounts:
+            for token in tokens:
+                if token is None or token == ADDRESS_ZERO:
+                    inputs.append(eth_balance.call_input(self.address, [account]))
+                    continue
+
+                inputs.append(balance_of.call_input(token, [account]))
+                for spender in spenders:
+                    inputs.append(allowance.call_input(token, [account, spender]))
+
+        results = await self.multi_call(
+            inputs,
+            block_identifier=block_identifier,
+            max_chunk_calldata_size=max_chunk_calldata_size,
+            max_chunk_gas=max_chunk_gas,
+            concurrency=concurrency,
+        )
+        results = iter(results)
+
+        balances = []
+        allowances = []
+        for _ in accounts:
+            balance_row = []
+            allowance_row = []
+            for token in tokens:
+                balance_row.append(next(results))
+                if token is None or token == ADDRESS_ZERO:
+                    allowance_row.append([None] * len(spenders))
+                else:
+                    allowance_row.append([next(results) for _ in spenders])
+            balances.append(balance_row)
+            allowances.append(allowance_row)
+
+        matrix = {"balances": balances}
+        if spenders:
+            matrix["allowances"] = allowances
+        return matrix
+
+    def _create_call_input(self, address, contract_name, method, args, is_classic=True):
+        return get_call_spec(contract_name, method, is_classic=is_classic).call_input(address, args)
+
+
+def get_web3(provider):
+    if isinstance(provider, (SignerOrProvider, ArbitrumProvider)):
+        return provider.provider
+    return provider
+
+
+async def enable_multi_call_batching(provider, multi_caller=None):
+    provider = get_web3(provider)
+    if multi_caller is None:
+        multi_caller = await MultiCaller.from_provider(provider)
+
+    batcher = MultiCallBatcher(multi_caller)
+    multi_call_batchers[provider] = batcher
+    return batcher
+
+
+def disable_multi_call_batching(provider):
+    multi_call_batchers.pop(get_web3(provider), None)
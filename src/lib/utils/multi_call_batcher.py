@@ -0,0 +1,186 @@
+import asyncio
+import weakref
+
+from eth_abi.exceptions import DecodingError, EncodingError
+from hexbytes import HexBytes
+from web3.exceptions import BadFunctionCallOutput
+
+from src.lib.utils.call_spec import get_call_spec_for_abi
+from src.lib.utils.executor import call_rpc, gather_or_cancel, is_async_provider
+
+multi_call_batchers = weakref.WeakKeyDictionary()
+
+
+def get_multi_call_batcher(provider):
+    try:
+        return multi_call_batchers.get(provider)
+    except TypeError:
+        return None
+
+
+def encode_function_call(contract_function):
+    call_spec = get_call_spec_for_abi(contract_function.abi)
+    args = list(contract_function.args or ())
+    kwargs = contract_function.kwargs or {}
+    args += [kwargs[i["name"]] for i in contract_function.abi.get("inputs", [])[len(args) :]]
+    try:
+        return HexBytes(call_spec.encode(args))
+    except EncodingError:
+        # web3 also takes arguments eth_abi does not, such as hex strings for bytes.
+        contract = contract_function.w3.eth.contract(abi=contract_function.contract_abi)
+        return HexBytes(contract.encodeABI(fn_name=contract_function.fn_name, args=args))
+
+
+def decode_function_output(contract_function, return_data):
+    call_spec = get_call_spec_for_abi(contract_function.abi)
+    try:
+        return call_spec.decode(return_data)
+    except DecodingError as err:
+        raise BadFunctionCallOutput(
+            f"Could not decode contract function call to {contract_function.fn_name} "
+            f"with return data: {str(return_data)}, output_types: {call_spec.output_types}"
+        ) from err
+
+
+def is_batchable(contract_function, block_identifier):
+    return block_identifier in (None, "latest") and not contract_function.transaction
+
+
+class MultiCallBatcher:
+    # Collects the contract reads issued within one event-loop tick and sends them as a single
+    # tryAggregate. Reads that fail inside the aggregate are retried on their own so callers
+    # still see the node's revert error.
+    def __init__(self, multi_caller):
+        self.multi_caller = multi_caller
+        self.queue = []
+        self.flush_handle = None
+        # The event loop only keeps weak references to tasks.
+        self.flush_tasks = set()
+        self.stats = {"calls": 0, "batches": 0}
+
+    def load(self, contract_function):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.queue.append((contract_function, future))
+
+        if self.flush_handle is None:
+            self.flush_handle = loop.call_soon(self._schedule_flush)
+        return future
+
+    def _schedule_flush(self):
+        self.flush_handle = None
+        queue, self.queue = self.queue, []
+        task = asyncio.ensure_future(self._flush(queue))
+        self.flush_tasks.add(task)
+        task.add_done_callback(self.flush_tasks.discard)
+
+    async def _flush(self, queue):
+        # Identical reads queued in the same tick, e.g. latestConfirmed() from many message readers,
+        # are sent once and share the result.
+        futures_by_call = {}
+        for contract_function, future in queue:
+            key = (contract_function.address, encode_function_call(contract_function))
+            futures_by_call.setdefault(key, (contract_function, []))[1].append(future)
+        calls = list(futures_by_call.values())
+
+        try:
+            results = await self.call_all_async([contract_function for contract_function, _ in calls])
+        except Exception as err:
+            for _, future in queue:
+                if not future.done():
+                    future.set_exception(err)
+            return
+
+        for (_, futures), (success, value) in zip(calls, results):
+            for future in futures:
+                if future.done():
+                    continue
+                if success:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    def call_all(self, contract_functions):
+        self.stats["calls"] += len(contract_functions)
+        self.stats["batches"] += 1
+
+        if len(contract_functions) == 1:
+            return [self._call_directly(contract_functions[0])]
+
+        try:
+            outputs = self.multi_caller.try_aggregate(self._aggregate_calls(contract_functions))
+        except Exception:
+            return [self._call_directly(f) for f in contract_functions]
+
+        return [
+            self._decode_output(f, return_data) if success else self._call_directly(f)
+            for f, (success, return_data) in zip(contract_functions, outputs)
+        ]
+
+    async def call_all_async(self, contract_functions):
+        self.stats["calls"] += len(contract_functions)
+        self.stats["batches"] += 1
+
+        if len(contract_functions) == 1:
+            return [await self._call_directly_async(contract_functions[0])]
+
+        try:
+            outputs = await self.multi_caller.try_aggregate_async(self._aggregate_calls(contract_functions))
+        except Exception:
+            return await gather_or_cancel(*[self._call_directly_async(f) for f in contract_functions])
+
+        failed = [f for f, (success, _) in zip(contract_functions, outputs) if not success]
+        retried = iter(await gather_or_cancel(*[self._call_directly_async(f) for f in failed]))
+        return [
+            self._decode_output(f, return_data) if success else next(retried)
+            for f, (success, return_data) in zip(contract_functions, outputs)
+        ]
+
+    @staticmethod
+    def _aggregate_calls(contract_functions):
+        return [(f.address, encode_function_call(f)) for f in contract_functions]
+
+    @staticmethod
+    def _decode_output(contract_function, return_data):
+        try:
+            return True, decode_function_output(contract_function, return_data)
+        except Exception as err:
+            return False, err
+
+    @staticmethod
+    def _call_directly(contract_function):
+        try:
+            return True, contract_function.call()
+        except Exception as err:
+            return False, err
+
+    @staticmethod
+    async def _call_directly_async(contract_function):
+        try:
+            offload = not is_async_provider(contract_function.w3)
+            return True, await call_rpc(contract_function.call, offload=offload)
+        except Exception as err:
+            return False, err
+
+
+async def read_contract(contract_function, block_identifier="latest"):
+    batcher = get_multi_call_batcher(contract_function.w3)
+    if batcher is None or not is_batchable(contract_function, block_identifier):
+        return await call_rpc(contract_function.call, block_identifier=block_identifier)
+    return await batcher.load(contract_function)
+
+
+def read_contracts(contract_functions):
+    if not contract_functions:
+        return []
+
+    batcher = get_multi_call_batcher(contract_functions[0].w3)
+    if batcher is None or any(f.w3 is not contract_functions[0].w3 or f.transaction for f in contract_functions):
+        return [contract_function.call() for contract_function in contract_functions]
+
+    values = []
+    for success, value in batcher.call_all(contract_functions):
+        if not success:
+            raise value
+        values.append(value)
+    return values
@@ -0,0 +1,320 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from web3 import AsyncHTTPProvider, HTTPProvider
+from web3.providers import BaseProvider
+from web3.providers.async_base import AsyncBaseProvider
+
+from src.lib.data_entities.errors import ArbSdkError
+from src.lib.utils.rate_limiter import AdaptiveRateLimiter, is_rate_limit_error, is_rate_limit_rpc_error
+from src.lib.utils.request_coalescing import COALESCABLE_METHODS
+
+# Reads that may be sent to any endpoint, and twice. Everything else, including transactions and
+# filters (which live on one node), goes to the pinned endpoint.
+HEDGEABLE_METHODS = COALESCABLE_METHODS
+
+DEFAULT_EWMA_ALPHA = 0.2
+
+DEFAULT_MAX_ERROR_RATE = 0.5
+
+# Seconds to wait before hedging while an endpoint has too few samples for a p95.
+DEFAULT_HEDGE_DELAY = 0.25
+
+DEFAULT_MIN_HEDGE_DELAY = 0.01
+
+DEFAULT_LATENCY_WINDOW = 100
+
+MIN_LATENCY_SAMPLES = 10
+
+# JSON-RPC errors about the endpoint rather than the request: limits and blocks it has not seen yet.
+RETRYABLE_RPC_ERROR_CODES = (-32005, 429)
+
+RETRYABLE_RPC_ERROR_MESSAGES = ("header not found", "unknown block", "limit exceeded")
+
+
+def is_retryable_error_response(response):
+    if not isinstance(response, dict) or not isinstance(response.get("error"), dict):
+        return False
+
+    rpc_error = response["error"]
+    if rpc_error.get("code") in RETRYABLE_RPC_ERROR_CODES or is_rate_limit_rpc_error(rpc_error):
+        return True
+    message = str(rpc_error.get("message", "")).lower()
+    return any(m in message for m in RETRYABLE_RPC_ERROR_MESSAGES)
+
+
+def is_retryable_error(err):
+    # The raised counterpart of is_retryable_error_response: web3 raises error responses as ValueError.
+    if is_rate_limit_error(err):
+        return True
+    return isinstance(err, ValueError) and bool(err.args) and is_retryable_error_response({"error": err.args[0]})
+
+
+class EndpointStats:
+    def __init__(self, provider, alpha=DEFAULT_EWMA_ALPHA, latency_window=DEFAULT_LATENCY_WINDOW, rate_limiter=None):
+        self.provider = provider
+        self.rate_limiter = rate_limiter
+        self.alpha = alpha
+        self.lock = threading.Lock()
+        self.latency = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=latency_window)
+
+    def record(self, latency=None, error=False):
+        with self.lock:
+            self.requests += 1
+            self.errors += int(error)
+            self.error_rate += self.alpha * (float(error) - self.error_rate)
+            if latency is not None:
+                self.latencies.append(latency)
+                self.latency = latency if self.latency is None else self.latency + self.alpha * (latency - self.latency)
+
+    def p95(self):
+        with self.lock:
+            if len(self.latencies) < MIN_LATENCY_SAMPLES:
+                return None
+            latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    def as_dict(self):
+        return {
+            "endpoint": getattr(self.provider, "endpoint_uri", repr(self.provider)),
+            "latency": self.latency,
+            "p95": self.p95(),
+            "errorRate": self.error_rate,
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+
+class EndpointSet:
+    # Per-endpoint EWMA latency and error rate. Reads go to the fastest healthy endpoint, where
+    # endpoints without samples yet count as fastest so that every endpoint gets measured.
+    # rate_limit holds AdaptiveRateLimiter options; each endpoint then gets a limiter of its own.
+    def __init__(
+        self,
+        providers,
+        pinned_endpoint=0,
+        hedge=True,
+        hedge_delay=None,
+        alpha=DEFAULT_EWMA_ALPHA,
+        max_error_rate=DEFAULT_MAX_ERROR_RATE,
+        rate_limit=None,
+    ):
+        if not providers:
+            raise ArbSdkError("At least one endpoint is required.")
+
+        self.endpoints = [
+            EndpointStats(
+                provider, alpha, rate_limiter=AdaptiveRateLimiter(**rate_limit) if rate_limit is not None else None
+            )
+            for provider in providers
+        ]
+        self.pinned = self.endpoints[pinned_endpoint]
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.max_error_rate = max_error_rate
+
+    def ranked(self):
+        healthy = [e for e in self.endpoints if e.error_rate < self.max_error_rate]
+        if not healthy:
+            return sorted(self.endpoints, key=lambda e: e.error_rate)
+        return sorted(healthy, key=lambda e: -1 if e.latency is None else e.latency)
+
+    def get_hedge_delay(self, endpoint):
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        p95 = endpoint.p95()
+        return DEFAULT_HEDGE_DELAY if p95 is None else max(p95, DEFAULT_MIN_HEDGE_DELAY)
+
+    def stats(self):
+        return [endpoint.as_dict() for endpoint in self.endpoints]
+
+
+class MultiEndpointProvider(BaseProvider):
+    # Routes idempotent reads to the fastest healthy endpoint and, when hedge is set, sends the same
+    # read to the next endpoint once the first has taken longer than its p95 latency. The first
+    # answer wins. A failing endpoint, including one answering with a retryable JSON-RPC error, is
+    # skipped for the next one; the error is returned when no endpoint does better. Other requests go
+    # to the pinned endpoint.
+    def __init__(self, endpoints, request_kwargs=None, **options):
+        providers = [HTTPProvider(e, request_kwargs) if isinstance(e, str) else e for e in endpoints]
+        self.endpoint_set = EndpointSet(providers, **options)
+        self.executor = None
+        self.executor_lock = threading.Lock()
+
+    def stats(self):
+        return self.endpoint_set.stats()
+
+    def is_connected(self, show_traceback=False):
+        return any(e.provider.is_connected() for e in self.endpoint_set.endpoints)
+
+    def make_request(self, method, params):
+        if method not in HEDGEABLE_METHODS:
+            return self._request(self.endpoint_set.pinned, method, params)
+
+        ranked = self.endpoint_set.ranked()
+        if not self.endpoint_set.hedge or len(ranked) == 1:
+            return self._request_with_failover(ranked, method, params)
+        return self._hedged_request(ranked, method, params)
+
+    @staticmethod
+    def _request(endpoint, method, params):
+        started = time.monotonic()
+        try:
+            if endpoint.rate_limiter is not None:
+                response = endpoint.rate_limiter.call(endpoint.provider.make_request, method, params)
+            else:
+                response = endpoint.provider.make_request(method, params)
+        except Exception:
+            endpoint.record(error=True)
+            raise
+        if is_retryable_error_response(response):
+            endpoint.record(error=True)
+        else:
+            endpoint.record(time.monotonic() - started)
+        return response
+
+    def _request_with_failover(self, ranked, method, params):
+        for endpoint in ranked[:-1]:
+            try:
+                response = self._request(endpoint, method, params)
+            except Exception:
+                continue
+            if not is_retryable_error_response(response):
+                return response
+        return self._request(ranked[-1], method, params)
+
+    def _get_executor(self):
+        with self.executor_lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=2 * len(self.endpoint_set.endpoints) + 2, thread_name_prefix="arb-sdk-hedge"
+                )
+            return self.executor
+
+    def _hedged_request(self, ranked, method, params):
+        executor = self._get_executor()
+        pending = {executor.submit(self._request, ranked[0], method, params)}
+        remaining = iter(ranked[1:])
+        delay = self.endpoint_set.get_hedge_delay(ranked[0])
+        error = None
+        error_response = None
+
+        while pending:
+            done, pending = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except Exception as err:
+                    error = err
+                    continue
+                if not is_retryable_error_response(response):
+                    return response
+                error_response = response
+
+            # Hedge on timeout, fail over on error.
+            endpoint = next(remaining, None)
+            if endpoint is not None:
+                pending.add(executor.submit(self._request, endpoint, method, params))
+                delay = self.endpoint_set.get_hedge_delay(endpoint)
+            else:
+                delay = None
+
+        if error_response is not None:
+            return error_response
+        raise error
+
+
+class AsyncMultiEndpointProvider(AsyncBaseProvider):
+    # The AsyncWeb3 counterpart of MultiEndpointProvider. The losing request of a hedge is cancelled.
+    def __init__(self, endpoints, request_kwargs=None, **options):
+        providers = [AsyncHTTPProvider(e, request_kwargs) if isinstance(e, str) else e for e in endpoints]
+        self.endpoint_set = EndpointSet(providers, **options)
+
+    def stats(self):
+        return self.endpoint_set.stats()
+
+    async def is_connected(self, show_traceback=False):
+        for endpoint in self.endpoint_set.endpoints:
+            if await endpoint.provider.is_connected():
+                return True
+        return False
+
+    async def make_request(self, method, params):
+        if method not in HEDGEABLE_METHODS:
+            return await self._request(self.endpoint_set.pinned, method, params)
+
+        ranked = self.endpoint_set.ranked()
+        if not self.endpoint_set.hedge or len(ranked) == 1:
+            return await self._request_with_failover(ranked, method, params)
+        return await self._hedged_request(ranked, method, params)
+
+    @staticmethod
+    async def _request(endpoint, method, params):
+        started = time.monotonic()
+        try:
+            if endpoint.rate_limiter is not None:
+                response = await endpoint.rate_limiter.call_async(endpoint.provider.make_request, method, params)
+            else:
+                response = await endpoint.provider.make_request(method, params)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            endpoint.record(error=True)
+            raise
+        if is_retryable_error_response(response):
+            endpoint.record(error=True)
+        else:
+            endpoint.record(time.monotonic() - started)
+        return response
+
+    async def _request_with_failover(self, ranked, method, params):
+        for endpoint in ranked[:-1]:
+            try:
+                response = await self._request(endpoint, method, params)
+            except Exception:
+                continue
+            if not is_retryable_error_response(response):
+                return response
+        return await self._request(ranked[-1], method, params)
+
+    async def _hedged_request(self, ranked, method, params):
+        pending = {asyncio.ensure_future(self._request(ranked[0], method, params))}
+        remaining = iter(ranked[1:])
+        delay = self.endpoint_set.get_hedge_delay(ranked[0])
+        error = None
+        error_response = None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        response = task.result()
+                    except Exception as err:
+                        error = err
+                        continue
+                    if not is_retryable_error_response(response):
+                        return response
+                    error_response = response
+
+                # Hedge on timeout, fail over on error.
+                endpoint = next(remaining, None)
+                if endpoint is not None:
+                    pending.add(asyncio.ensure_future(self._request(endpoint, method, params)))
+                    delay = self.endpoint_set.get_hedge_delay(endpoint)
+                else:
+                    delay = None
+
+            if error_response is not None:
+                return error_response
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,244 @@
+import asyncio
+import threading
+import time
+from collections import deque
+
+from src.lib.utils.executor import is_async_provider
+
+DEFAULT_INITIAL_CONCURRENCY = 8
+
+DEFAULT_MAX_CONCURRENCY = 64
+
+# Multiplicative decrease of the concurrency window after a 429, and after a slow response.
+RATE_LIMITED_DECREASE = 0.5
+
+LATENCY_DECREASE = 0.9
+
+# Without a latency_target, a response counts as slow when the latency EWMA is this many times the
+# fastest recent response.
+DEFAULT_LATENCY_TOLERANCE = 3.0
+
+DEFAULT_RATE_LIMIT_RETRIES = 5
+
+# Seconds before the first retry of a rate limited request, doubled on every further retry.
+DEFAULT_RATE_LIMIT_BACKOFF = 0.25
+
+RATE_LIMITER_MIDDLEWARE = "rate_limiter"
+
+
+def enable_rate_limiting(provider, rate_limiter=None):
+    rate_limiter = rate_limiter or AdaptiveRateLimiter()
+    if is_async_provider(provider):
+        middleware = rate_limiter.async_middleware
+    else:
+        middleware = rate_limiter.middleware
+
+    disable_rate_limiting(provider)
+    provider.middleware_onion.inject(middleware, name=RATE_LIMITER_MIDDLEWARE, layer=0)
+    return rate_limiter
+
+
+def disable_rate_limiting(provider):
+    if RATE_LIMITER_MIDDLEWARE in provider.middleware_onion:
+        provider.middleware_onion.remove(RATE_LIMITER_MIDDLEWARE)
+
+
+def is_rate_limit_error(error):
+    # requests raises HTTPError with the response attached, aiohttp ClientResponseError with a status.
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429 or getattr(error, "status", None) == 429:
+        return True
+    if isinstance(error, ValueError) and error.args and isinstance(error.args[0], dict):
+        return is_rate_limit_rpc_error(error.args[0])
+    return False
+
+
+def is_rate_limit_rpc_error(rpc_error):
+    message = str(rpc_error.get("message", "")).lower()
+    return rpc_error.get("code") == 429 or "rate limit" in message or "too many requests" in message
+
+
+def is_rate_limit_response(response):
+    return (
+        isinstance(response, dict)
+        and isinstance(response.get("error"), dict)
+        and is_rate_limit_rpc_error(response["error"])
+    )
+
+
+def wake_future(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveRateLimiter:
+    # A token bucket of requests_per_second (unlimited when None) and an AIMD concurrency window:
+    # every response that is not slow grows the window by 1/window, a 429 halves it and a slow
+    # response shrinks it. Requests over either limit wait their turn rather than fail, and rate
+    # limited requests are retried with exponential backoff. One limiter per endpoint; it may be
+    # shared by threads and event loops.
+    def __init__(
+        self,
+        requests_per_second=None,
+        burst=None,
+        initial_concurrency=DEFAULT_INITIAL_CONCURRENCY,
+        min_concurrency=1,
+        max_concurrency=DEFAULT_MAX_CONCURRENCY,
+        latency_target=None,
+        max_retries=DEFAULT_RATE_LIMIT_RETRIES,
+        backoff=DEFAULT_RATE_LIMIT_BACKOFF,
+    ):
+        self.requests_per_second = requests_per_second
+        self.burst = burst if burst is not None else max(1.0, requests_per_second or 1.0)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self.lock = threading.Lock()
+        self.window = float(initial_concurrency)
+        self.in_flight = 0
+        self.tokens = self.burst
+        self.refilled_at = time.monotonic()
+        self.latency = None
+        self.recent_latencies = deque(maxlen=100)
+        self.waiters = []
+        self.stats = {"requests": 0, "queued": 0, "rateLimited": 0, "retries": 0}
+
+    def _try_acquire(self):
+        # Returns 0 once a slot is taken, the seconds until the next token, or None to wait for a release.
+        if self.requests_per_second is not None:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.requests_per_second)
+            self.refilled_at = now
+
+        if self.in_flight >= int(self.window):
+            return None
+        if self.requests_per_second is not None:
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.requests_per_second
+            self.tokens -= 1
+
+        self.in_flight += 1
+        self.stats["requests"] += 1
+        return 0
+
+    def acquire(self):
+        event = threading.Event()
+        queued = False
+        while True:
+            with self.lock:
+                delay = self._try_acquire()
+                if delay == 0:
+                    return
+                if not queued:
+                    self.stats["queued"] += 1
+                    queued = True
+                event.clear()
+                self.waiters.append(event.set)
+            event.wait(delay)
+
+    async def acquire_async(self):
+        loop = asyncio.get_running_loop()
+        queued = False
+        while True:
+            with self.lock:
+                delay = self._try_acquire()
+                if delay == 0:
+                    return
+                if not queued:
+                    self.stats["queued"] += 1
+                    queued = True
+                future = loop.create_future()
+                self.waiters.append(lambda: loop.call_soon_threadsafe(wake_future, future))
+            await asyncio.wait([future], timeout=delay)
+
+    def release(self, latency=None, rate_limited=False):
+        with self.lock:
+            self.in_flight -= 1
+            self._adjust_window(latency, rate_limited)
+            waiters, self.waiters = self.waiters, []
+
+        for wake in waiters:
+            try:
+                wake()
+            except RuntimeError:
+                # The waiter's event loop has already closed.
+                pass
+
+    def _adjust_window(self, latency, rate_limited):
+        if rate_limited:
+            self.stats["rateLimited"] += 1
+            self.window = max(self.min_concurrency, self.window * RATE_LIMITED_DECREASE)
+            # No burst straight after the node pushed back.
+            self.tokens = min(self.tokens, 0)
+            return
+
+        if latency is None:
+            return
+
+        self.latency = latency if self.latency is None else self.latency + 0.2 * (latency - self.latency)
+        self.recent_latencies.append(latency)
+        target = self.latency_target or min(self.recent_latencies) * DEFAULT_LATENCY_TOLERANCE
+
+        if self.latency > target:
+            self.window = max(self.min_concurrency, self.window * LATENCY_DECREASE)
+        else:
+            self.window = min(self.max_concurrency, self.window + 1 / self.window)
+
+    def _retry_delay(self, attempt):
+        self.stats["retries"] += 1
+        return self.backoff * 2**attempt
+
+    def call(self, make_request, method, params):
+        for attempt in range(self.max_retries + 1):
+            self.acquire()
+            started = time.monotonic()
+            try:
+                response = make_request(method, params)
+            except BaseException as err:
+                rate_limited = isinstance(err, Exception) and is_rate_limit_error(err)
+                self.release(rate_limited=rate_limited)
+                if not rate_limited or attempt == self.max_retries:
+                    raise
+                time.sleep(self._retry_delay(attempt))
+                continue
+
+            rate_limited = is_rate_limit_response(response)
+            self.release(time.monotonic() - started, rate_limited)
+            if not rate_limited or attempt == self.max_retries:
+                return response
+            time.sleep(self._retry_delay(attempt))
+
+    async def call_async(self, make_request, method, params):
+        for attempt in range(self.max_retries + 1):
+            await self.acquire_async()
+            started = time.monotonic()
+            try:
+                response = await make_request(method, params)
+            except BaseException as err:
+                rate_limited = isinstance(err, Exception) and is_rate_limit_error(err)
+                self.release(rate_limited=rate_limited)
+                if not rate_limited or attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self._retry_delay(attempt))
+                continue
+
+            rate_limited = is_rate_limit_response(response)
+            self.release(time.monotonic() - started, rate_limited)
+            if not rate_limited or attempt == self.max_retries:
+                return response
+            await asyncio.sleep(self._retry_delay(attempt))
+
+    def middleware(self, make_request, w3):
+        def middleware(method, params):
+            return self.call(make_request, method, params)
+
+        return middleware
+
+    async def async_middleware(self, make_request, w3):
+        async def middleware(method, params):
+            return await self.call_async(make_request, method, params)
+
+        return middleware
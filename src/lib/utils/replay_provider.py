@@ -0,0 +1,143 @@
+import asyncio
+import gzip
+import json
+import threading
+import time
+
+from web3._utils.encoding import Web3JsonEncoder
+from web3.providers import BaseProvider
+from web3.providers.async_base import AsyncBaseProvider
+
+from src.lib.data_entities.errors import ArbSdkError
+
+RPC_FIXTURE_VERSION = 1
+
+
+def rpc_request_key(method, params):
+    return json.dumps([method, params or []], cls=Web3JsonEncoder, sort_keys=True, separators=(",", ":"))
+
+
+class RpcFixture:
+    # Recorded JSON-RPC responses keyed by method and params. A request made several times keeps
+    # every response in order, and replay hands them out in that order, repeating the last one.
+    # Paths ending in .gz are gzip compressed.
+    def __init__(self, responses=None):
+        self.responses = responses if responses is not None else {}
+        self.lock = threading.Lock()
+        self.cursors = {}
+
+    @classmethod
+    def load(cls, path):
+        opener = gzip.open if str(path).endswith(".gz") else open
+        with opener(path, "rt") as f:
+            fixture = json.load(f)
+
+        if fixture.get("version") != RPC_FIXTURE_VERSION:
+            raise ArbSdkError(f"Unsupported RPC fixture version {fixture.get('version')} in {path}.")
+
+        responses = {}
+        for method, params, response in fixture["requests"]:
+            responses.setdefault(rpc_request_key(method, params), []).append(response)
+        return cls(responses)
+
+    def save(self, path):
+        with self.lock:
+            requests = [
+                [*json.loads(key), response] for key, responses in self.responses.items() for response in responses
+            ]
+
+        opener = gzip.open if str(path).endswith(".gz") else open
+        with opener(path, "wt") as f:
+            json.dump({"version": RPC_FIXTURE_VERSION, "requests": requests}, f, separators=(",", ":"))
+
+    def record(self, method, params, response):
+        # Only the result or error is kept, the request id is assigned again on replay.
+        recorded = {key: response[key] for key in ("result", "error") if key in response}
+        with self.lock:
+            self.responses.setdefault(rpc_request_key(method, params), []).append(recorded)
+
+    def replay(self, method, params):
+        key = rpc_request_key(method, params)
+        with self.lock:
+            responses = self.responses.get(key)
+            if not responses:
+                raise ArbSdkError(f"No recorded response for {method} with params {params}.")
+
+            cursor = self.cursors.get(key, 0)
+            self.cursors[key] = cursor + 1
+            return {"jsonrpc": "2.0", "id": cursor, **responses[min(cursor, len(responses) - 1)]}
+
+    def rewind(self):
+        with self.lock:
+            self.cursors.clear()
+
+
+class RecordingProvider(BaseProvider):
+    # Passes every request to provider and records the response. Call save to write the fixture.
+    def __init__(self, provider, fixture=None):
+        self.provider = provider
+        self.fixture = fixture if fixture is not None else RpcFixture()
+
+    def is_connected(self, show_traceback=False):
+        return self.provider.is_connected()
+
+    def make_request(self, method, params):
+        response = self.provider.make_request(method, params)
+        self.fixture.record(method, params, response)
+        return response
+
+    def save(self, path):
+        self.fixture.save(path)
+
+
+class AsyncRecordingProvider(AsyncBaseProvider):
+    def __init__(self, provider, fixture=None):
+        self.provider = provider
+        self.fixture = fixture if fixture is not None else RpcFixture()
+
+    async def is_connected(self, show_traceback=False):
+        return await self.provider.is_connected()
+
+    async def make_request(self, method, params):
+        response = await self.provider.make_request(method, params)
+        self.fixture.record(method, params, response)
+        return response
+
+    def save(self, path):
+        self.fixture.save(path)
+
+
+class ReplayProvider(BaseProvider):
+    # Serves a recorded fixture (a path or an RpcFixture) without a node. latency is a number of
+    # seconds, or a function of the method returning one, added to every request.
+    def __init__(self, fixture, latency=0):
+        self.fixture = fixture if isinstance(fixture, RpcFixture) else RpcFixture.load(fixture)
+        self.latency = latency
+
+    def is_connected(self, show_traceback=False):
+        return True
+
+    def get_latency(self, method):
+        return self.latency(method) if callable(self.latency) else self.latency
+
+    def make_request(self, method, params):
+        latency = self.get_latency(method)
+        if latency:
+            time.sleep(latency)
+        return self.fixture.replay(method, params)
+
+
+class AsyncReplayProvider(AsyncBaseProvider):
+    def __init__(self, fixture, latency=0):
+        self.fixture = fixture if isinstance(fixture, RpcFixture) else RpcFixture.load(fixture)
+        self.latency = latency
+
+    async def is_connected(self, show_traceback=False):
+        return True
+
+    def get_latency(self, method):
+        return self.latency(method) if callable(self.latency) else self.latency
+
+    async def make_request(self, method, params):
+        await asyncio.sleep(self.get_latency(method))
+        return self.fixture.replay(method, params)
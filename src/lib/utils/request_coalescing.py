@@ -0,0 +1,121 @@
+import asyncio
+import json
+import threading
+
+from web3._utils.encoding import Web3JsonEncoder
+
+from src.lib.utils.executor import is_async_provider
+
+# Read-only methods whose response only depends on the method and params at a given moment.
+COALESCABLE_METHODS = frozenset(
+    [
+        "eth_blockNumber",
+        "eth_call",
+        "eth_chainId",
+        "eth_estimateGas",
+        "eth_feeHistory",
+        "eth_gasPrice",
+        "eth_getBalance",
+        "eth_getBlockByHash",
+        "eth_getBlockByNumber",
+        "eth_getCode",
+        "eth_getLogs",
+        "eth_getStorageAt",
+        "eth_getTransactionByHash",
+        "eth_getTransactionCount",
+        "eth_getTransactionReceipt",
+        "eth_maxPriorityFeePerGas",
+        "net_version",
+    ]
+)
+
+REQUEST_COALESCING_MIDDLEWARE = "request_coalescing"
+
+
+def enable_request_coalescing(provider, request_coalescer=None):
+    request_coalescer = request_coalescer or RequestCoalescer()
+    if is_async_provider(provider):
+        middleware = request_coalescer.async_middleware
+    else:
+        middleware = request_coalescer.middleware
+
+    disable_request_coalescing(provider)
+    provider.middleware_onion.inject(middleware, name=REQUEST_COALESCING_MIDDLEWARE, layer=0)
+    return request_coalescer
+
+
+def disable_request_coalescing(provider):
+    if REQUEST_COALESCING_MIDDLEWARE in provider.middleware_onion:
+        provider.middleware_onion.remove(REQUEST_COALESCING_MIDDLEWARE)
+
+
+class RequestCoalescer:
+    # Identical requests issued while one is already in flight wait for that request's response
+    # instead of going to the node. Nothing is kept once the response arrives, so this never serves
+    # a stale value. Sync requests only overlap when made from several threads, e.g. in thread
+    # offload mode.
+    def __init__(self, methods=COALESCABLE_METHODS):
+        self.methods = methods
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.stats = {"requests": 0, "coalesced": 0}
+
+    def request_key(self, method, params):
+        if method not in self.methods:
+            return None
+        try:
+            return method, json.dumps(params, cls=Web3JsonEncoder, sort_keys=True)
+        except TypeError:
+            return None
+
+    def middleware(self, make_request, w3):
+        def middleware(method, params):
+            key = self.request_key(method, params)
+            if key is None:
+                return make_request(method, params)
+
+            with self.lock:
+                self.stats["requests"] += 1
+                slot = self.in_flight.get(key)
+                is_leader = slot is None
+                if is_leader:
+                    slot = self.in_flight[key] = {"done": threading.Event(), "response": None, "error": None}
+                else:
+                    self.stats["coalesced"] += 1
+
+            if is_leader:
+                try:
+                    slot["response"] = make_request(method, params)
+                except Exception as err:
+                    slot["error"] = err
+                finally:
+                    with self.lock:
+                        del self.in_flight[key]
+                    slot["done"].set()
+            else:
+                slot["done"].wait()
+
+            if slot["error"] is not None:
+                raise slot["error"]
+            return slot["response"]
+
+        return middleware
+
+    async def async_middleware(self, make_request, w3):
+        async def middleware(method, params):
+            key = self.request_key(method, params)
+            if key is None:
+                return await make_request(method, params)
+
+            self.stats["requests"] += 1
+            task = self.in_flight.get(key)
+            if task is None:
+                task = self.in_flight[key] = asyncio.ensure_future(make_request(method, params))
+                task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+            else:
+                self.stats["coalesced"] += 1
+
+            # A cancelled waiter must not cancel the request the others are waiting on.
+            return await asyncio.shield(task)
+
+        return middleware
@@ -61,7 +61,7 @@ async def test_find_l1_batch_info():
         except ContractLogicError:
             l1_batch_number = 0
 
-        l1_batch_confirmations = arb_tx_receipt.get_batch_confirmations(l2_provider)
+        l1_batch_confirmations = await arb_tx_receipt.get_batch_confirmations(l2_provider)
 
         if l1_batch_number and l1_batch_number > 0:
             assert l1_batch_confirmations > 0, "Missing confirmations"
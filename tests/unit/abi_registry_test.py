@@ -0,0 +1,52 @@
+from web3 import Web3
+
+from src.lib.data_entities.constants import ARB_SYS_ADDRESS
+from src.lib.utils.helper import (
+    clear_abi_registry,
+    get_abi_registry_stats,
+    load_abi,
+    load_contract,
+)
+
+
+def test_load_abi_parses_each_file_once():
+    clear_abi_registry()
+
+    first_abi, _ = load_abi("ArbSys")
+    second_abi, _ = load_abi("ArbSys")
+    load_abi("ArbSys", is_classic=True)
+
+    stats = get_abi_registry_stats()
+    assert first_abi is second_abi
+    assert stats.abi_misses == 2
+    assert stats.abi_hits == 1
+
+
+def test_load_contract_reuses_factory_per_provider():
+    clear_abi_registry()
+    provider = Web3()
+    other_provider = Web3()
+
+    first = load_contract(provider=provider, contract_name="ArbSys", address=ARB_SYS_ADDRESS)
+    second = load_contract(provider=provider, contract_name="ArbSys", address=ARB_SYS_ADDRESS.lower())
+    other = load_contract(provider=other_provider, contract_name="ArbSys", address=ARB_SYS_ADDRESS)
+
+    assert type(first) is type(second)
+    assert type(first) is not type(other)
+    assert second.address == Web3.to_checksum_address(ARB_SYS_ADDRESS)
+    assert other.w3 is other_provider
+
+    stats = get_abi_registry_stats()
+    assert stats.factory_misses == 2
+    assert stats.factory_hits == 1
+    assert stats.abi_misses == 1
+
+
+def test_load_contract_without_address_returns_factory():
+    clear_abi_registry()
+    provider = Web3()
+
+    factory = load_contract(provider=provider, contract_name="Multicall2", is_classic=True)
+
+    assert factory.bytecode
+    assert load_contract(provider=provider, contract_name="Multicall2", is_classic=True) is factory
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from eth_abi import encode
+from web3 import AsyncWeb3, Web3
+
+from src.lib.data_entities.constants import ARB_SYS_ADDRESS
+from src.lib.data_entities.networks import l2_networks
+from src.lib.utils.batch_provider import AsyncBatchHTTPProvider, BatchHTTPProvider
+from src.lib.utils.executor import call_rpc, disable_thread_offload, enable_thread_offload
+from src.lib.utils.lib import get_block_ranges_for_l1_block
+from tests.unit.stand_in_chain import StandInChain, serve_stand_in_chain
+
+
+@pytest.mark.asyncio
+async def test_async_requests_are_sent_as_one_batch():
+    chain = StandInChain(head=1000)
+    with serve_stand_in_chain(chain) as (url, posts):
+        web3 = AsyncWeb3(AsyncBatchHTTPProvider(url, max_batch_size=8))
+        blocks = await asyncio.gather(*[web3.eth.get_block(n) for n in range(20)])
+        head = await web3.eth.block_number
+
+    assert [block["number"] for block in blocks] == list(range(20))
+    assert head == 1000
+    assert [len(post) if isinstance(post, list) else 1 for post in posts] == [8, 8, 4, 1]
+
+
+def test_sync_requests_from_threads_are_batched():
+    chain = StandInChain(head=1000)
+
+    async def fetch(web3):
+        return await asyncio.gather(*[call_rpc(web3.eth.get_block, n) for n in range(12)])
+
+    enable_thread_offload(max_workers=12)
+    try:
+        with serve_stand_in_chain(chain) as (url, posts):
+            provider = BatchHTTPProvider(url, flush_interval=0.05)
+            blocks = asyncio.run(fetch(Web3(provider)))
+    finally:
+        disable_thread_offload()
+
+    assert [block["number"] for block in blocks] == list(range(12))
+    assert provider.stats["requests"] == 12
+    assert len(posts) == provider.stats["batches"] < 12
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_falls_back_to_single_requests():
+    chain = StandInChain(head=1000)
+    with serve_stand_in_chain(chain, accept_batches=False) as (url, posts):
+        web3 = AsyncWeb3(AsyncBatchHTTPProvider(url))
+        blocks = await asyncio.gather(*[web3.eth.get_block(n) for n in range(3)])
+
+    assert [block["number"] for block in blocks] == [0, 1, 2]
+    assert len(posts) == 4
+
+
+@pytest.mark.asyncio
+async def test_block_range_search_probes_in_batches():
+    genesis = l2_networks[42161].nitro_genesis_block
+    chain = StandInChain(
+        head=genesis + 100_000,
+        contracts={ARB_SYS_ADDRESS: lambda calldata: encode(["uint256"], [20])},
+    )
+    for_l1_block = (genesis + 50_001) // 4
+
+    with serve_stand_in_chain(chain) as (url, posts):
+        provider = AsyncBatchHTTPProvider(url)
+        l2_blocks = await get_block_ranges_for_l1_block(AsyncWeb3(provider), for_l1_block, interpolate=False)
+
+    assert l2_blocks == [for_l1_block * 4, for_l1_block * 4 + 3]
+    assert chain.count("eth_getBlockByNumber") > 2 * len(posts)
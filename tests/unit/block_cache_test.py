@@ -0,0 +1,73 @@
+import pytest
+from web3 import Web3
+
+from src.lib.utils.arb_provider import ArbitrumProvider
+from src.lib.utils.block_cache import BlockCache, enable_block_cache
+from tests.unit.stand_in_chain import StandInChain, block_hash
+
+
+def make_provider(**options):
+    chain = StandInChain(head=1000)
+    provider = Web3(chain)
+    return chain, provider, enable_block_cache(provider, BlockCache(**options))
+
+
+@pytest.mark.asyncio
+async def test_blocks_by_hash_are_fetched_once_across_providers():
+    chain, provider, block_cache = make_provider()
+
+    first = await ArbitrumProvider(provider).get_block(block_hash(500))
+    second = await ArbitrumProvider(provider).get_block(block_hash(500))
+
+    assert first is second
+    assert first["sendCount"] == "0x1f4"
+    assert chain.count("eth_getBlockByHash") == 1
+    assert block_cache.stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_only_finalized_block_numbers_are_served_from_cache():
+    chain, provider, _ = make_provider(finality_depth=64)
+    arb_provider = ArbitrumProvider(provider)
+
+    await arb_provider.get_block("latest")
+    for _ in range(2):
+        await arb_provider.get_block(900)
+        await arb_provider.get_block(990)
+
+    assert chain.count("eth_getBlockByNumber") == 4
+
+
+@pytest.mark.asyncio
+async def test_reorg_evicts_blocks_near_the_head():
+    chain, provider, block_cache = make_provider(finality_depth=5)
+    arb_provider = ArbitrumProvider(provider)
+    transaction_hash = "0x" + (990 * 1000).to_bytes(32, "big").hex()
+
+    await arb_provider.get_block(1000)
+    await arb_provider.get_block(998)
+    receipt = await arb_provider.get_transaction_receipt(transaction_hash)
+
+    chain.forks[998] = 1
+    reorged = await arb_provider.get_block(Web3.to_hex(998))
+
+    assert reorged["hash"] == Web3.to_bytes(hexstr=block_hash(998, fork=1))
+    assert block_cache.stats["reorgs"] == 1
+    assert (block_hash(998), False) not in block_cache.blocks
+    assert (block_hash(1000), False) not in block_cache.blocks
+    assert await arb_provider.get_transaction_receipt(transaction_hash) is receipt
+    assert chain.count("eth_getTransactionReceipt") == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded():
+    chain, provider, block_cache = make_provider(max_size=2)
+    arb_provider = ArbitrumProvider(provider)
+
+    for number in (1, 2, 3):
+        await arb_provider.get_block(block_hash(number))
+    await arb_provider.get_block(block_hash(1))
+
+    assert len(block_cache.blocks) == 2
+    assert block_cache.stats["evictions"] == 2
+    assert chain.count("eth_getBlockByHash") == 4
@@ -0,0 +1,80 @@
+import pytest
+from eth_abi import encode
+from web3 import AsyncWeb3, Web3
+
+from src.lib.data_entities.constants import ARB_SYS_ADDRESS
+from src.lib.data_entities.networks import l2_networks
+from src.lib.utils.lib import (
+    clear_block_search_stats,
+    get_block_ranges_for_l1_block,
+    get_block_search_stats,
+    get_first_block_for_l1_block,
+)
+from tests.unit.stand_in_chain import AsyncStandInChain, StandInChain, to_hex_int
+
+GENESIS = l2_networks[42161].nitro_genesis_block
+
+
+class CurvedChain(StandInChain):
+    # L1 block numbers that grow unevenly: slowly for the first half of the chain, then fast.
+    def l1_block(self, number):
+        offset = number - GENESIS
+        return 5_000_000 + (offset // 40 if offset < 500_000 else 12_500 + (offset - 500_000) // 3)
+
+    def get_block(self, number):
+        block = super().get_block(number)
+        if block is not None:
+            block["l1BlockNumber"] = to_hex_int(self.l1_block(number))
+        return block
+
+
+def make_chain(chain_class=StandInChain):
+    return chain_class(
+        head=GENESIS + 1_000_000, contracts={ARB_SYS_ADDRESS: lambda calldata: encode(["uint256"], [20])}
+    )
+
+
+@pytest.mark.asyncio
+async def test_interpolation_finds_the_same_blocks_as_the_k_ary_search():
+    chain = make_chain(CurvedChain)
+    provider = Web3(chain)
+    l1_blocks = [chain.l1_block(GENESIS + n) for n in (0, 1, 39_999, 499_999, 500_000, 500_001, 777_777, 1_000_000)]
+
+    for for_l1_block in l1_blocks + [l1_blocks[0] - 1, l1_blocks[-1] + 1]:
+        for allow_greater in (False, True):
+            expected = await get_first_block_for_l1_block(
+                provider, for_l1_block, allow_greater=allow_greater, interpolate=False
+            )
+            found = await get_first_block_for_l1_block(provider, for_l1_block, allow_greater=allow_greater)
+            assert found == expected, (for_l1_block, allow_greater)
+
+
+@pytest.mark.asyncio
+async def test_interpolation_converges_in_a_few_rounds():
+    chain = make_chain()
+    for_l1_block = (GENESIS + 654_321) // 4
+
+    clear_block_search_stats()
+    l2_blocks = await get_block_ranges_for_l1_block(AsyncWeb3(AsyncStandInChain(chain)), for_l1_block)
+    stats = get_block_search_stats()
+
+    assert l2_blocks == [for_l1_block * 4, for_l1_block * 4 + 3]
+    assert stats["searches"] == 2
+    assert stats["rounds"] <= 8
+    assert stats["probes"] <= 10
+
+    clear_block_search_stats()
+    await get_block_ranges_for_l1_block(Web3(chain), for_l1_block, interpolate=False)
+    assert get_block_search_stats()["probes"] > 30
+
+
+@pytest.mark.asyncio
+async def test_uneven_chain_is_bounded_by_bisection():
+    chain = make_chain(CurvedChain)
+    for_l1_block = chain.l1_block(GENESIS + 499_999)
+
+    clear_block_search_stats()
+    found = await get_first_block_for_l1_block(Web3(chain), for_l1_block)
+
+    assert chain.l1_block(found) == for_l1_block and chain.l1_block(found - 1) < for_l1_block
+    assert get_block_search_stats()["rounds"] <= 2 * 20 + 1
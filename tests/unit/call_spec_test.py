@@ -0,0 +1,30 @@
+from eth_abi import encode
+from web3 import Web3
+
+from src.lib.utils.call_spec import get_call_spec
+from src.lib.utils.helper import load_contract
+
+OWNER = "0x7F869dC59A96e798e759030b3c39398ba584F087"
+SPENDER = "0x467194771dAe2967Aef3ECbEDD3Bf9a310C76C65"
+
+
+def test_encode_matches_web3():
+    erc20 = load_contract(provider=Web3(), contract_name="ERC20", is_classic=True)
+    call_spec = get_call_spec("ERC20", "allowance", is_classic=True)
+
+    assert call_spec.selector == bytes(Web3.keccak(text="allowance(address,address)")[:4])
+    assert Web3.to_hex(call_spec.encode([OWNER, SPENDER])) == erc20.encodeABI(
+        fn_name="allowance", args=[OWNER, SPENDER]
+    )
+
+
+def test_decode_reads_outputs_and_unwraps_single_values():
+    assert get_call_spec("ERC20", "decimals", is_classic=True).decode(encode(["uint8"], [18])) == 18
+    assert get_call_spec("ERC20", "symbol", is_classic=True).decode(encode(["string"], ["WETH"])) == "WETH"
+
+    gateway = get_call_spec("L1GatewayRouter", "getGateway", is_classic=True)
+    assert gateway.decode(encode(["address"], [SPENDER.lower()])) == SPENDER
+
+
+def test_call_specs_are_compiled_once():
+    assert get_call_spec("ERC20", "balanceOf", is_classic=True) is get_call_spec("ERC20", "balanceOf", is_classic=True)
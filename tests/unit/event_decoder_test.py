@@ -0,0 +1,81 @@
+from eth_abi import encode
+from hexbytes import HexBytes
+from web3 import Web3
+
+from src.lib.data_entities.event import (
+    decode_logs,
+    get_event_decoder,
+    parse_typed_logs,
+    select_decoded_events,
+)
+from src.lib.utils.helper import load_abi
+
+BRIDGE = "0x8315177aB297bA92A06054cE80a67Ed4DBd7ed3a"
+INBOX = "0x4Dbd4fc535Ac27206064B68FfCf827b0A60BAB3f"
+SENDER = "0xa2e06c19EE14255889f0Ec0cA37f6D0778D06754"
+
+
+def make_log(topics, data, log_index, address):
+    return {
+        "transactionIndex": 1,
+        "blockNumber": 100,
+        "transactionHash": HexBytes("0x" + "11" * 32),
+        "address": address,
+        "topics": [HexBytes(t) for t in topics],
+        "data": HexBytes(data),
+        "logIndex": log_index,
+        "blockHash": HexBytes("0x" + "22" * 32),
+        "removed": False,
+    }
+
+
+def message_delivered_log(message_index, log_index=0):
+    decoder = get_event_decoder("Bridge", "MessageDelivered")
+    return make_log(
+        [decoder.topic, encode(["uint256"], [message_index]), encode(["bytes32"], [b"\x33" * 32])],
+        encode(
+            ["address", "uint8", "address", "bytes32", "uint256", "uint64"],
+            [INBOX, 9, SENDER, b"\x44" * 32, 12345, 1662696576],
+        ),
+        log_index,
+        BRIDGE,
+    )
+
+
+def inbox_message_delivered_log(message_num, log_index=1):
+    decoder = get_event_decoder("Inbox", "InboxMessageDelivered")
+    return make_log(
+        [decoder.topic, encode(["uint256"], [message_num])],
+        encode(["bytes"], [b"\x01\x02\x03"]),
+        log_index,
+        INBOX,
+    )
+
+
+def test_decoder_matches_web3_process_log():
+    log = message_delivered_log(7)
+    abi, _ = load_abi("Bridge")
+    expected = Web3().eth.contract(abi=abi).events.MessageDelivered().process_log(log)["args"]
+
+    decoded = parse_typed_logs(None, "Bridge", [log], "MessageDelivered")
+
+    assert len(decoded) == 1
+    assert decoded[0].to_dict() == dict(expected)
+
+
+def test_decode_logs_demultiplexes_known_events():
+    unrelated = make_log(["0x" + "55" * 32], b"", 2, SENDER)
+    logs = [message_delivered_log(7, 0), inbox_message_delivered_log(7, 1), unrelated]
+
+    decoded = decode_logs(logs)
+
+    assert [e.name for e in decoded] == ["MessageDelivered", "InboxMessageDelivered"]
+    assert decoded[0].contract_name == "Bridge"
+    assert decoded[1].event.message_num == 7
+    assert decoded[1].event.data == b"\x01\x02\x03"
+    assert select_decoded_events(decoded, "Bridge", "MessageDelivered")[0].sender == SENDER
+    assert select_decoded_events(decoded, "ArbSys", "L2ToL1Tx") == []
+
+
+def test_parse_typed_logs_unknown_event_returns_empty():
+    assert parse_typed_logs(None, "Bridge", [message_delivered_log(1)], "NotAnEvent") == []
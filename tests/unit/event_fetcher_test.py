@@ -0,0 +1,170 @@
+import pytest
+from web3 import AsyncWeb3, Web3
+
+from src.lib.data_entities.constants import ARB_SYS_ADDRESS
+from src.lib.message.l2_to_l1_message_nitro import L2ToL1MessageNitro
+from src.lib.utils.event_fetcher import EventFetcher, split_block_range
+from tests.unit.stand_in_chain import (
+    CALLER,
+    DESTINATION,
+    AsyncStandInChain,
+    StandInChain,
+    encode_log,
+    l2_to_l1_tx_log,
+)
+
+
+def make_chain(max_log_range=None):
+    logs = [l2_to_l1_tx_log(position, block_number=position * 10 + 5) for position in range(100)]
+    return StandInChain(logs=logs, head=1000, max_log_range=max_log_range)
+
+
+async def fetch_positions(chain, use_filters=False, **options):
+    events = await EventFetcher(Web3(chain), use_filters=use_filters).get_events(
+        contract_factory="ArbSys",
+        event_name="L2ToL1Tx",
+        filter={"fromBlock": 0, "toBlock": "latest", "address": ARB_SYS_ADDRESS},
+        **options,
+    )
+    return [e.event["position"] for e in events]
+
+
+def test_split_block_range():
+    assert split_block_range(0, 9, 4) == [(0, 3), (4, 7), (8, 9)]
+    assert split_block_range(5, 5, 100) == [(5, 5)]
+
+
+@pytest.mark.asyncio
+async def test_chunked_fetch_merges_windows_in_order():
+    positions = await fetch_positions(make_chain(), block_range_size=64, concurrency=3)
+    assert positions == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_rejected_range_is_bisected():
+    chain = make_chain(max_log_range=150)
+    positions = await fetch_positions(chain)
+    assert positions == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_unsplittable_range_error_is_raised():
+    chain = make_chain(max_log_range=0)
+    with pytest.raises(Exception):
+        await fetch_positions(chain, block_range_size=500)
+
+
+@pytest.mark.asyncio
+async def test_stateless_fetch_builds_topics_locally():
+    chain = make_chain()
+    events = await EventFetcher(Web3(chain)).get_events(
+        contract_factory="ArbSys",
+        event_name="L2ToL1Tx",
+        argument_filters={"position": [3, 42]},
+        filter={"fromBlock": 0, "toBlock": "latest", "address": ARB_SYS_ADDRESS},
+    )
+
+    assert [e.event.position for e in events] == [3, 42]
+    assert events[0].log_index == 0
+    assert chain.count("eth_getLogs") == 1
+    assert chain.count("eth_newFilter") == 0
+
+
+@pytest.mark.asyncio
+async def test_filter_mode_is_still_available():
+    chain = make_chain()
+    positions = await fetch_positions(chain, use_filters=True)
+
+    assert positions == list(range(100))
+    assert chain.count("eth_newFilter") == 1
+
+
+@pytest.mark.asyncio
+async def test_iter_events_streams_with_bounded_prefetch():
+    chain = make_chain()
+    events = EventFetcher(Web3(chain)).iter_events(
+        contract_factory="ArbSys",
+        event_name="L2ToL1Tx",
+        filter={"fromBlock": 0, "toBlock": "latest", "address": ARB_SYS_ADDRESS},
+        block_range_size=10,
+        concurrency=2,
+    )
+
+    first = await events.__anext__()
+    assert first.event.position == 0
+    assert chain.count("eth_getLogs") <= 3
+
+    positions = [first.event.position] + [e.event.position async for e in events]
+    assert positions == list(range(100))
+    assert chain.count("eth_getLogs") == 101
+
+
+@pytest.mark.asyncio
+async def test_iter_l2_to_l1_events_stops_early():
+    chain = make_chain()
+    events = L2ToL1MessageNitro.iter_l2_to_l1_events(
+        Web3(chain), {"fromBlock": 0, "toBlock": "latest"}, block_range_size=100
+    )
+    positions = []
+    async for event in events:
+        positions.append(event.event.position)
+        if len(positions) == 5:
+            break
+    await events.aclose()
+
+    assert positions == [0, 1, 2, 3, 4]
+    assert chain.count("eth_getLogs") < 10
+
+
+def l2_to_l1_transaction_log(batch_number, block_number):
+    return encode_log(
+        "ArbSys",
+        "L2ToL1Transaction",
+        {
+            "caller": CALLER,
+            "destination": DESTINATION,
+            "uniqueId": batch_number + 1,
+            "batchNumber": batch_number,
+            "indexInBatch": 0,
+            "arbBlockNum": block_number,
+            "ethBlockNum": block_number // 4,
+            "timestamp": 1_700_000_000 + block_number,
+            "callvalue": 0,
+            "data": b"",
+        },
+        block_number,
+        0,
+        ARB_SYS_ADDRESS,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_events_multi_demultiplexes_one_query():
+    logs = [l2_to_l1_transaction_log(n, block_number=n * 10 + 1) for n in range(10)]
+    logs += [l2_to_l1_tx_log(n, block_number=n * 10 + 5) for n in range(10)]
+    chain = StandInChain(logs=logs, head=1000)
+
+    events = await EventFetcher(Web3(chain)).get_events_multi(
+        contract_factory="ArbSys",
+        event_names=["L2ToL1Transaction", "L2ToL1Tx"],
+        argument_filters={"L2ToL1Transaction": {"batchNumber": 4}, "L2ToL1Tx": {"position": [1, 2]}},
+        filter={"fromBlock": 0, "toBlock": "latest", "address": ARB_SYS_ADDRESS},
+    )
+
+    assert [e.event.batch_number for e in events["L2ToL1Transaction"]] == [4]
+    assert [e.event.position for e in events["L2ToL1Tx"]] == [1, 2]
+    assert chain.count("eth_getLogs") == 1
+    assert len(chain.calls[-1][1][0]["topics"][0]) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_web3_provider_is_awaited():
+    chain = make_chain(max_log_range=150)
+    events = await EventFetcher(AsyncWeb3(AsyncStandInChain(chain))).get_events(
+        contract_factory="ArbSys",
+        event_name="L2ToL1Tx",
+        filter={"fromBlock": 0, "toBlock": "latest", "address": ARB_SYS_ADDRESS},
+        block_range_size=400,
+    )
+
+    assert [e.event.position for e in events] == list(range(100))
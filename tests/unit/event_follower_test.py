@@ -0,0 +1,48 @@
+import pytest
+from web3 import Web3
+
+from src.lib.data_entities.constants import ARB_SYS_ADDRESS
+from src.lib.utils.event_fetcher import EventFetcher
+from tests.unit.stand_in_chain import StandInChain, l2_to_l1_tx_log
+
+
+def make_follower(chain, confirmations=0):
+    return EventFetcher(Web3(chain)).follower(
+        contract_factory="ArbSys",
+        event_name="L2ToL1Tx",
+        filter={"fromBlock": 0, "address": ARB_SYS_ADDRESS},
+        confirmations=confirmations,
+    )
+
+
+def summary(events):
+    return [(e.event.position, e.block_number, e.removed) for e in events]
+
+
+@pytest.mark.asyncio
+async def test_follower_only_fetches_new_confirmed_blocks():
+    chain = StandInChain(logs=[l2_to_l1_tx_log(0, 50), l2_to_l1_tx_log(1, 98)], head=100)
+    follower = make_follower(chain, confirmations=5)
+
+    assert summary(await follower.poll()) == [(0, 50, False)]
+    assert await follower.poll() == []
+
+    chain.head = 103
+    assert summary(await follower.poll()) == [(1, 98, False)]
+    requested = [(p[0]["fromBlock"], p[0]["toBlock"]) for m, p in chain.calls if m == "eth_getLogs"]
+    assert requested == [(hex(0), hex(95)), (hex(96), hex(98))]
+
+
+@pytest.mark.asyncio
+async def test_follower_retracts_events_from_reorged_blocks():
+    chain = StandInChain(logs=[l2_to_l1_tx_log(0, 50), l2_to_l1_tx_log(1, 90)], head=100)
+    follower = make_follower(chain)
+    assert summary(await follower.poll()) == [(0, 50, False), (1, 90, False)]
+
+    for number in range(88, 102):
+        chain.forks[number] = 1
+    chain.logs = [l2_to_l1_tx_log(0, 50), l2_to_l1_tx_log(2, 92, fork=1)]
+    chain.head = 101
+
+    assert summary(await follower.poll()) == [(1, 90, True), (2, 92, False)]
+    assert await follower.poll() == []
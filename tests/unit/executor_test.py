@@ -0,0 +1,42 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.lib.utils.executor import call_rpc, disable_thread_offload, enable_thread_offload
+
+
+def slow_read(active, peak):
+    with active["lock"]:
+        active["count"] += 1
+        peak.append(active["count"])
+    time.sleep(0.05)
+    with active["lock"]:
+        active["count"] -= 1
+    return threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_sync_calls_run_inline_by_default():
+    active = {"count": 0, "lock": threading.Lock()}
+    names = await asyncio.gather(*[call_rpc(slow_read, active, []) for _ in range(2)])
+
+    assert names == [threading.current_thread().name] * 2
+
+
+@pytest.mark.asyncio
+async def test_thread_offload_overlaps_calls_within_pool_size():
+    active = {"count": 0, "lock": threading.Lock()}
+    peak = []
+    enable_thread_offload(max_workers=2)
+    try:
+        started = time.monotonic()
+        names = await asyncio.gather(*[call_rpc(slow_read, active, peak) for _ in range(4)])
+        elapsed = time.monotonic() - started
+    finally:
+        disable_thread_offload()
+
+    assert all(name.startswith("arb-sdk-rpc") for name in names)
+    assert max(peak) == 2
+    assert elapsed < 4 * 0.05
@@ -0,0 +1,187 @@
+import asyncio
+
+import pytest
+from web3 import AsyncWeb3, Web3
+
+from src.lib.data_entities.constants import ARB_SYS_ADDRESS
+from src.lib.utils.arb_provider import ArbitrumProvider
+from src.lib.utils.event_fetcher import EventFetcher
+from src.lib.utils.executor import call_rpc, disable_thread_offload, enable_thread_offload
+from src.lib.utils.helper import load_contract
+from src.lib.utils.instrumentation import (
+    NO_MEASUREMENT,
+    INSTRUMENTATION_MIDDLEWARE,
+    Instrumentation,
+    LatencyHistogram,
+    OpenTelemetryExporter,
+    disable_instrumentation,
+    enable_instrumentation,
+    instrumented_operation,
+    measure,
+    operation,
+)
+from src.lib.utils.multi_call import MultiCaller
+from tests.unit.stand_in_chain import AsyncStandInChain, StandInChain, l2_to_l1_tx_log
+
+MULTICALL = "0x842eC2c7D803033Edf55E478F461FC547Bc54EB2"
+
+
+def make_chain():
+    chain = StandInChain(logs=[l2_to_l1_tx_log(position, block_number=position * 10 + 5) for position in range(10)])
+    chain.add_multicall(MULTICALL)
+    return chain
+
+
+async def get_events(provider):
+    return await EventFetcher(provider).get_events(
+        contract_factory="ArbSys",
+        event_name="L2ToL1Tx",
+        filter={"fromBlock": 0, "toBlock": "latest", "address": ARB_SYS_ADDRESS},
+    )
+
+
+@pytest.mark.asyncio
+async def test_calls_are_attributed_to_the_operation():
+    provider = Web3(make_chain())
+    instrumentation = enable_instrumentation(provider)
+
+    with operation("withdrawals"):
+        load_contract(provider=provider, contract_name="ArbSys", address=ARB_SYS_ADDRESS)
+        events = await get_events(provider)
+        caller = MultiCaller(provider, MULTICALL)
+        await caller.multi_call([caller.get_block_number_input(), caller.get_current_block_timestamp_input()])
+        await ArbitrumProvider(provider).get_block(5)
+    await call_rpc(provider.eth.get_block_number)
+
+    assert len(events) == 10
+    # Once here and once by the event fetcher.
+    assert instrumentation.count("withdrawals", "load_contract", "ArbSys") == 2
+    assert instrumentation.count("withdrawals", "rpc", "eth_getLogs") == 1
+    assert instrumentation.count("withdrawals", "multicall", "aggregate") == 1
+    assert instrumentation.count("withdrawals", "provider", "get_block") == 1
+    assert instrumentation.count("withdrawals", "rpc", "eth_getBlockByNumber") == 1
+    assert instrumentation.count(None, "rpc", "eth_blockNumber") == 1
+    assert instrumentation.count("withdrawals", "rpc", "eth_blockNumber") == 0
+
+    [logs] = [m for m in instrumentation.snapshot("withdrawals") if m["kind"] == "logs"]
+    assert logs["name"] == "L2ToL1Tx"
+    assert logs["size"] == 10
+    assert logs["latency"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_operations_are_kept_apart():
+    chain = make_chain()
+    provider = AsyncWeb3(AsyncStandInChain(chain))
+    instrumentation = enable_instrumentation(provider)
+    caller = MultiCaller(provider, MULTICALL)
+
+    async def read(name, count):
+        with operation(name):
+            inputs = [caller.get_block_number_input() for _ in range(count)]
+            await asyncio.gather(*[caller.multi_call(inputs[i : i + 1]) for i in range(count)])
+
+    await asyncio.gather(read("first", 3), read("second", 5))
+
+    assert instrumentation.count("first", "multicall") == 3
+    assert instrumentation.count("second", "multicall") == 5
+    assert instrumentation.count("second", "rpc", "eth_call") == 5
+
+
+@pytest.mark.asyncio
+async def test_operation_reaches_offloaded_calls():
+    provider = Web3(make_chain())
+    instrumentation = enable_instrumentation(provider)
+    enable_thread_offload(max_workers=2)
+    try:
+        with operation("offloaded"):
+            await call_rpc(provider.eth.get_block_number)
+    finally:
+        disable_thread_offload()
+
+    assert instrumentation.count("offloaded", "rpc", "eth_blockNumber") == 1
+
+
+@pytest.mark.asyncio
+async def test_sdk_methods_open_their_own_operation():
+    provider = Web3(make_chain())
+    instrumentation = enable_instrumentation(provider)
+
+    @instrumented_operation("reader.status")
+    async def status():
+        return await call_rpc(provider.eth.get_block_number)
+
+    @instrumented_operation("reader.status")
+    async def wrapper_status():
+        return await status()
+
+    with operation("user"):
+        await wrapper_status()
+
+    [metrics] = instrumentation.snapshot("reader.status")
+    assert metrics["name"] == "eth_blockNumber"
+
+
+@pytest.mark.asyncio
+async def test_exporters_receive_every_call():
+    class Span:
+        def __init__(self, name, start_time, attributes):
+            self.name = name
+            self.start_time = start_time
+            self.attributes = attributes
+            self.end_time = None
+
+        def end(self, end_time=None):
+            self.end_time = end_time
+
+    class Tracer:
+        def __init__(self):
+            self.spans = []
+
+        def start_span(self, name, start_time=None, attributes=None):
+            self.spans.append(Span(name, start_time, attributes))
+            return self.spans[-1]
+
+    chain = make_chain()
+    chain.max_log_range = 0
+    provider = Web3(chain)
+    records = []
+    tracer = Tracer()
+    enable_instrumentation(provider, Instrumentation(exporters=[records.append, OpenTelemetryExporter(tracer)]))
+
+    with operation("outer"), operation("inner"):
+        with pytest.raises(Exception):
+            await get_events(provider)
+
+    log_queries = [r for r in records if r["name"] == "eth_getLogs"]
+    assert log_queries and all(isinstance(r["error"], ValueError) for r in log_queries)
+    assert records[-1]["kind"] == "logs" and records[-1]["error"] is not None
+    assert all(r["operation"] == "inner" and r["path"] == "outer/inner" for r in records)
+
+    assert [s.name for s in tracer.spans] == [f"{r['kind']} {r['name']}" for r in records]
+    assert tracer.spans[-1].attributes["arb_sdk.operation"] == "outer/inner"
+    assert tracer.spans[-1].attributes["error.type"] == "ArbSdkError"
+    assert all(s.end_time >= s.start_time for s in tracer.spans)
+
+
+def test_disabled_instrumentation_measures_nothing():
+    provider = Web3(make_chain())
+    assert measure(provider, "rpc", "eth_call") is NO_MEASUREMENT
+
+    enable_instrumentation(provider)
+    assert measure(Web3(make_chain()), "rpc", "eth_call") is NO_MEASUREMENT
+
+    disable_instrumentation(provider)
+    assert INSTRUMENTATION_MIDDLEWARE not in provider.middleware_onion
+    assert measure(provider, "rpc", "eth_call") is NO_MEASUREMENT
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+    for latency in [0.005, 0.05, 0.05, 0.5, 5.0]:
+        histogram.observe(latency)
+
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.8) == 1.0
+    assert histogram.quantile(1.0) is None
@@ -0,0 +1,46 @@
+import pytest
+from eth_abi import decode, encode
+from web3 import AsyncWeb3, Web3
+
+from src.lib.data_entities.networks import l2_networks
+from src.lib.message.l1_to_l2_message_gas_estimator import L1ToL2MessageGasEstimator
+from tests.unit.stand_in_chain import (
+    CALLER,
+    DESTINATION,
+    GAS_ESTIMATE,
+    GAS_PRICE,
+    AsyncStandInChain,
+    StandInChain,
+    revert,
+    selector,
+)
+
+INBOX = l2_networks[42161].ethBridge.inbox
+
+
+def inbox(calldata):
+    if calldata[:4] == selector("calculateRetryableSubmissionFee(uint256,uint256)"):
+        data_length, base_fee = decode(["uint256", "uint256"], calldata[4:])
+        return encode(["uint256"], [(1400 + 6 * data_length) * base_fee])
+    revert()
+
+
+@pytest.mark.parametrize("make_provider", [Web3, lambda chain: AsyncWeb3(AsyncStandInChain(chain))])
+async def test_estimate_all(make_provider):
+    l1_provider = make_provider(StandInChain(chain_id=1, contracts={INBOX: inbox}))
+    l2_provider = make_provider(StandInChain())
+    retryable_data = {
+        "from": CALLER,
+        "to": DESTINATION,
+        "data": b"\x00" * 100,
+        "l2CallValue": 10,
+        "excessFeeRefundAddress": CALLER,
+        "callValueRefundAddress": CALLER,
+    }
+
+    estimates = await L1ToL2MessageGasEstimator(l2_provider).estimate_all(retryable_data, 1_000, l1_provider)
+
+    assert estimates["gasLimit"] == GAS_ESTIMATE
+    assert estimates["maxFeePerGas"] == 3 * GAS_PRICE
+    assert estimates["maxSubmissionCost"] == 4 * (1400 + 6 * 100) * 1_000
+    assert estimates["deposit"] == 3 * GAS_PRICE * GAS_ESTIMATE + 4 * (1400 + 6 * 100) * 1_000 + 10
@@ -0,0 +1,113 @@
+import pytest
+from eth_abi import decode, encode
+from web3 import AsyncWeb3, Web3
+
+from src.lib.data_entities.message import L2ToL1MessageStatus
+from src.lib.data_entities.networks import l2_networks
+from src.lib.message.l2_to_l1_message_nitro import ASSERTION_CONFIRMED_PADDING, L2ToL1MessageReaderNitro
+from tests.unit.stand_in_chain import AsyncStandInChain, StandInChain, block_hash, encode_log, revert, selector
+
+L2_NETWORK = l2_networks[42161]
+
+ROLLUP = L2_NETWORK.ethBridge.rollup
+
+NODE_COUNT = 150
+
+L1_HEAD = 20_000_000
+
+# Node n asserts L2 block (n + 1) * 1000, whose send count is the same number on the stand-in chain.
+L2_BLOCKS_PER_NODE = 1_000
+
+
+def rollup(calldata):
+    if calldata[:4] == selector("getNode(uint64)"):
+        (node_num,) = decode(["uint64"], calldata[4:])
+        node = (
+            b"\x01" * 32,
+            b"\x00" * 32,
+            b"\x02" * 32,
+            max(node_num - 1, 0),
+            node_num * 10,
+            0,
+            0,
+            0,
+            0,
+            0,
+            0,
+            b"\x03" * 32,
+        )
+        return encode(
+            ["(bytes32,bytes32,bytes32,uint64,uint64,uint64,uint64,uint64,uint64,uint64,uint64,bytes32)"], [node]
+        )
+    revert()
+
+
+def node_created_log(node_num):
+    l2_block = (node_num + 1) * L2_BLOCKS_PER_NODE
+    after_state = (([Web3.to_bytes(hexstr=block_hash(l2_block)), l2_block.to_bytes(32, "big")], [0, 0]), 1)
+    before_state = (([b"\x00" * 32, b"\x00" * 32], [0, 0]), 1)
+    return encode_log(
+        "RollupUserLogic",
+        "NodeCreated",
+        {
+            "nodeNum": node_num,
+            "parentNodeHash": b"\x04" * 32,
+            "nodeHash": b"\x03" * 32,
+            "executionHash": b"\x05" * 32,
+            "assertion": (before_state, after_state, 1),
+            "afterInboxBatchAcc": b"\x06" * 32,
+            "wasmModuleRoot": b"\x07" * 32,
+            "inboxMaxCount": 1,
+        },
+        L1_HEAD - NODE_COUNT + node_num,
+        0,
+        ROLLUP,
+    )
+
+
+def make_reader(position):
+    l1_chain = StandInChain(
+        logs=[node_created_log(node_num) for node_num in range(NODE_COUNT)],
+        head=L1_HEAD,
+        chain_id=1,
+        contracts={ROLLUP: rollup},
+    )
+    reader = L2ToL1MessageReaderNitro(Web3(l1_chain), {"position": position}, L2_NETWORK)
+
+    async def status(l2_provider):
+        return L2ToL1MessageStatus.UNCONFIRMED
+
+    reader.status = status
+    return reader
+
+
+@pytest.mark.parametrize("node_num", [0, 1, 70, 148, 149])
+async def test_first_executable_block_is_the_deadline_of_the_first_node_including_the_message(node_num):
+    l2_chain = StandInChain(head=(NODE_COUNT + 1) * L2_BLOCKS_PER_NODE)
+    reader = make_reader(position=node_num * L2_BLOCKS_PER_NODE + 5)
+
+    assert await reader.get_first_executable_block(Web3(l2_chain)) == node_num * 10 + ASSERTION_CONFIRMED_PADDING
+    # The last node is checked first, then a binary search over the rest.
+    assert l2_chain.count("eth_getBlockByHash") <= 1 + NODE_COUNT.bit_length()
+
+
+@pytest.mark.parametrize("node_num", [0, 70, 149])
+async def test_overlapping_search_probes_a_bounded_number_of_nodes(node_num):
+    l2_chain = StandInChain(head=(NODE_COUNT + 1) * L2_BLOCKS_PER_NODE)
+    reader = make_reader(position=node_num * L2_BLOCKS_PER_NODE + 5)
+
+    block = await reader.get_first_executable_block(AsyncWeb3(AsyncStandInChain(l2_chain)))
+
+    assert block == node_num * 10 + ASSERTION_CONFIRMED_PADDING
+    # Three rounds of eight probes narrow 150 nodes down to one.
+    assert l2_chain.count("eth_getBlockByHash") <= 1 + 3 * 8
+
+
+async def test_first_executable_block_when_no_node_includes_the_message():
+    l2_chain = StandInChain(head=(NODE_COUNT + 1) * L2_BLOCKS_PER_NODE)
+    reader = make_reader(position=NODE_COUNT * L2_BLOCKS_PER_NODE + 5)
+
+    block = await reader.get_first_executable_block(Web3(l2_chain))
+
+    assert block > L1_HEAD + L2_NETWORK.confirm_period_blocks
+    assert l2_chain.count("eth_getBlockByHash") == 1
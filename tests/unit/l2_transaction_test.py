@@ -0,0 +1,35 @@
+import pytest
+from eth_abi import encode
+from web3 import AsyncWeb3, Web3
+
+from src.lib.data_entities.constants import NODE_INTERFACE_ADDRESS
+from src.lib.message.l2_transaction import L2TransactionReceipt
+from src.lib.utils.helper import fetch_is_contract_deployed
+from tests.unit.stand_in_chain import AsyncStandInChain, StandInChain, block_hash, revert, selector
+
+
+def node_interface(confirmations):
+    def handler(calldata):
+        if calldata[:4] == selector("getL1Confirmations(bytes32)"):
+            return encode(["uint64"], [confirmations])
+        revert()
+
+    return handler
+
+
+@pytest.mark.parametrize("make_provider", [Web3, lambda chain: AsyncWeb3(AsyncStandInChain(chain))])
+@pytest.mark.parametrize("confirmations, available", [(3, False), (11, True)])
+async def test_is_data_available(make_provider, confirmations, available):
+    chain = StandInChain(contracts={NODE_INTERFACE_ADDRESS: node_interface(confirmations)})
+    receipt = L2TransactionReceipt({"blockHash": block_hash(100)})
+
+    assert await receipt.get_batch_confirmations(make_provider(chain)) == confirmations
+    assert await receipt.is_data_available(make_provider(chain)) is available
+
+
+@pytest.mark.parametrize("make_provider", [Web3, lambda chain: AsyncWeb3(AsyncStandInChain(chain))])
+async def test_fetch_is_contract_deployed(make_provider):
+    provider = make_provider(StandInChain(contracts={NODE_INTERFACE_ADDRESS: node_interface(0)}))
+
+    assert await fetch_is_contract_deployed(provider, NODE_INTERFACE_ADDRESS)
+    assert not await fetch_is_contract_deployed(provider, "0x" + "12" * 20)
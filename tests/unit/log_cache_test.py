@@ -0,0 +1,70 @@
+import pytest
+from web3 import Web3
+
+from src.lib.data_entities.constants import ARB_SYS_ADDRESS
+from src.lib.data_entities.event import get_event_decoder
+from src.lib.utils.event_fetcher import EventFetcher
+from src.lib.utils.log_cache import LogCache, enable_log_cache
+from tests.unit.stand_in_chain import StandInChain, l2_to_l1_tx_log
+
+TOPIC = get_event_decoder("ArbSys", "L2ToL1Tx").topic
+
+
+async def fetch_positions(provider, from_block=0, to_block="latest", **argument_filters):
+    events = await EventFetcher(provider).get_events(
+        contract_factory="ArbSys",
+        event_name="L2ToL1Tx",
+        argument_filters=argument_filters,
+        filter={"fromBlock": from_block, "toBlock": to_block, "address": ARB_SYS_ADDRESS},
+    )
+    return [e.event.position for e in events]
+
+
+def test_missing_ranges_follow_merged_coverage():
+    cache = LogCache()
+    cache.store(1, ARB_SYS_ADDRESS, TOPIC, 10, 19, [])
+    cache.store(1, ARB_SYS_ADDRESS, TOPIC, 30, 39, [])
+    cache.store(1, ARB_SYS_ADDRESS, TOPIC, 20, 25, [])
+
+    assert cache.covered_ranges(1, ARB_SYS_ADDRESS, TOPIC) == [(10, 25), (30, 39)]
+    assert cache.missing_ranges(1, ARB_SYS_ADDRESS, TOPIC, 0, 50) == [(0, 9), (26, 29), (40, 50)]
+    assert cache.missing_ranges(2, ARB_SYS_ADDRESS, TOPIC, 12, 14) == [(12, 14)]
+
+
+@pytest.mark.asyncio
+async def test_finalized_ranges_are_served_from_cache():
+    logs = [l2_to_l1_tx_log(position, block_number=position * 10 + 5) for position in range(100)]
+    chain = StandInChain(logs=logs, head=1000)
+    provider = Web3(chain)
+    enable_log_cache(provider, LogCache(finality_depth=100))
+
+    assert await fetch_positions(provider, 0, 499) == list(range(50))
+    assert chain.count("eth_getLogs") == 1
+
+    assert await fetch_positions(provider, 100, 299, position=[12, 27]) == [12, 27]
+    assert chain.count("eth_getLogs") == 1
+
+    # Only the gap past the cached range and the unfinalized tail go to the node.
+    assert await fetch_positions(provider) == list(range(100))
+    requested = [(p[0]["fromBlock"], p[0]["toBlock"]) for m, p in chain.calls if m == "eth_getLogs"]
+    assert requested[1:] == [(hex(500), hex(900)), (hex(901), hex(1000))]
+
+
+@pytest.mark.asyncio
+async def test_finality_is_resolved_once_per_call():
+    logs = [l2_to_l1_tx_log(position, block_number=position * 10 + 5) for position in range(100)]
+    chain = StandInChain(logs=logs, head=1000)
+    provider = Web3(chain)
+    enable_log_cache(provider, LogCache(finality_depth=100))
+
+    events = await EventFetcher(provider).get_events(
+        contract_factory="ArbSys",
+        event_name="L2ToL1Tx",
+        filter={"fromBlock": 0, "toBlock": 999, "address": ARB_SYS_ADDRESS},
+        block_range_size=100,
+    )
+
+    assert [e.event.position for e in events] == list(range(100))
+    # The last window straddles the finalized block 900.
+    assert chain.count("eth_getLogs") == 11
+    assert chain.count("eth_blockNumber") == 1
@@ -0,0 +1,330 @@
+import asyncio
+
+import pytest
+from eth_abi import decode, encode
+from web3 import AsyncWeb3, Web3
+from web3.exceptions import ContractLogicError
+
+from src.lib.data_entities.constants import MULTICALL3_ADDRESS, NODE_INTERFACE_ADDRESS
+from src.lib.utils.helper import load_contract
+from src.lib.utils import multi_call
+from src.lib.utils.multi_call import (
+    MultiCaller,
+    chunk_calls,
+    disable_multi_call_batching,
+    enable_multi_call_batching,
+)
+from src.lib.utils.multi_call_batcher import encode_function_call, read_contract, read_contracts
+from tests.unit.stand_in_chain import AsyncStandInChain, StandInChain, revert, selector
+
+MULTICALL = "0x842eC2c7D803033Edf55E478F461FC547Bc54EB2"
+ROUTER = "0x72Ce9c846789fdB6fC1f34aC4AD25Dd9ef7031ef"
+GATEWAY = "0xa3A7B6F88361F48403514059F1F16C8E78d60EeC"
+DISABLED_TOKEN = "0x0000000000000000000000000000000000000bad"
+
+
+def router(calldata):
+    if calldata[:4] == selector("getGateway(address)"):
+        if calldata[-20:] == bytes.fromhex(DISABLED_TOKEN[2:]):
+            revert("no gateway")
+        return encode(["address"], [GATEWAY])
+    if calldata[:4] == selector("calculateL2TokenAddress(address)"):
+        return encode(["address"], ["0x" + calldata[-20:][::-1].hex()])
+    revert()
+
+
+def make_provider(max_calls=None):
+    chain = StandInChain(contracts={ROUTER: router})
+    chain.add_multicall(MULTICALL, max_calls=max_calls)
+    return chain, Web3(chain)
+
+
+def gateway_router(provider):
+    return load_contract(provider=provider, contract_name="L1GatewayRouter", address=ROUTER, is_classic=True)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_one_aggregate():
+    chain, provider = make_provider()
+    await enable_multi_call_batching(provider, MultiCaller(provider, MULTICALL))
+    contract = gateway_router(provider)
+    tokens = [Web3.to_checksum_address("0x" + f"{i:040x}") for i in range(1, 6)]
+
+    results = await asyncio.gather(
+        read_contract(contract.functions.getGateway(tokens[0])),
+        *[read_contract(contract.functions.calculateL2TokenAddress(token)) for token in tokens],
+    )
+
+    assert results[0] == GATEWAY
+    assert [r.lower() for r in results[1:]] == ["0x" + bytes.fromhex(t[2:])[::-1].hex() for t in tokens]
+    assert chain.count("eth_call") == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_read_raises_its_own_error():
+    chain, provider = make_provider()
+    await enable_multi_call_batching(provider, MultiCaller(provider, MULTICALL))
+    contract = gateway_router(provider)
+
+    ok, failed = await asyncio.gather(
+        read_contract(contract.functions.getGateway(GATEWAY)),
+        read_contract(contract.functions.getGateway(Web3.to_checksum_address(DISABLED_TOKEN))),
+        return_exceptions=True,
+    )
+
+    assert ok == GATEWAY
+    assert isinstance(failed, ContractLogicError)
+
+
+def test_encode_function_call_matches_web3():
+    _, provider = make_provider()
+    contract = gateway_router(provider)
+    node_interface = load_contract(
+        provider=provider, contract_name="NodeInterface", address=NODE_INTERFACE_ADDRESS, is_classic=False
+    )
+    block_hash = "0x" + "11" * 32
+
+    assert encode_function_call(contract.functions.getGateway(GATEWAY)) == bytes.fromhex(
+        contract.encodeABI(fn_name="getGateway", args=[GATEWAY])[2:]
+    )
+    assert encode_function_call(contract.functions.getGateway(_token=GATEWAY)) == encode_function_call(
+        contract.functions.getGateway(GATEWAY)
+    )
+    # eth_abi does not take hex strings for bytes32; web3 does.
+    assert encode_function_call(node_interface.functions.getL1Confirmations(block_hash)) == bytes.fromhex(
+        node_interface.encodeABI(fn_name="getL1Confirmations", args=[block_hash])[2:]
+    )
+
+
+def test_read_contracts_without_batching_calls_directly():
+    chain, provider = make_provider()
+    contract = gateway_router(provider)
+    disable_multi_call_batching(provider)
+
+    assert read_contracts([contract.functions.getGateway(GATEWAY)] * 2) == [GATEWAY, GATEWAY]
+    assert chain.count("eth_call") == 2
+
+
+def calculate_l2_token_inputs(contract, count):
+    return [
+        {
+            "targetAddr": ROUTER,
+            "encoder": lambda i=i: contract.encodeABI(
+                fn_name="calculateL2TokenAddress", args=[Web3.to_checksum_address(f"0x{i:040x}")]
+            ),
+            "decoder": lambda return_data: decode(["address"], return_data)[0],
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def test_chunk_calls_respects_calldata_and_gas_limits():
+    calls = [(ROUTER, b"\x00" * 36)] * 10
+
+    assert chunk_calls(calls, max_chunk_calldata_size=4 * (36 + 128)) == [(0, 4), (4, 8), (8, 10)]
+    assert chunk_calls(calls, gas_estimates=[1_000_000] * 10, max_chunk_gas=3_100_000) == [
+        (0, 3),
+        (3, 6),
+        (6, 9),
+        (9, 10),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_multi_call_chunks_in_order_and_splits_rejected_chunks():
+    chain, provider = make_provider(max_calls=7)
+    contract = gateway_router(provider)
+    expected = ["0x" + i.to_bytes(20, "big")[::-1].hex() for i in range(1, 41)]
+
+    results = await MultiCaller(provider, MULTICALL).multi_call(
+        calculate_l2_token_inputs(contract, 40), max_chunk_calldata_size=10 * (36 + 128)
+    )
+
+    assert results == expected
+    # Four chunks of ten are each rejected once and served as two halves.
+    assert chain.count("eth_call") == 12
+
+
+@pytest.mark.asyncio
+async def test_multi_call_raises_other_failures_at_once():
+    chain, provider = make_provider()
+    contract = gateway_router(provider)
+
+    def unavailable(calldata):
+        raise ValueError({"code": -32603, "message": "internal error"})
+
+    chain.contracts[MULTICALL.lower()] = unavailable
+
+    with pytest.raises(ValueError):
+        await MultiCaller(provider, MULTICALL).multi_call(calculate_l2_token_inputs(contract, 40))
+    assert chain.count("eth_call") == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error",
+    [{"code": -32000, "message": "header not found"}, {"code": 429, "message": "Too many requests"}],
+)
+async def test_multi_call_retries_transient_failures_without_splitting(monkeypatch, error):
+    monkeypatch.setattr(multi_call, "DEFAULT_MULTI_CALL_RETRY_BACKOFF", 0)
+    chain, provider = make_provider()
+    contract = gateway_router(provider)
+
+    def unavailable(calldata):
+        raise ValueError(error)
+
+    chain.contracts[MULTICALL.lower()] = unavailable
+
+    with pytest.raises(ValueError):
+        await MultiCaller(provider, MULTICALL).multi_call(calculate_l2_token_inputs(contract, 40))
+    assert chain.count("eth_call") == 1 + multi_call.DEFAULT_MULTI_CALL_RETRIES
+
+
+@pytest.mark.asyncio
+async def test_multi_call_retries_only_the_failed_chunk(monkeypatch):
+    monkeypatch.setattr(multi_call, "DEFAULT_MULTI_CALL_RETRY_BACKOFF", 0)
+    chain, provider = make_provider()
+    contract = gateway_router(provider)
+    expected = ["0x" + i.to_bytes(20, "big")[::-1].hex() for i in range(1, 41)]
+    aggregate = chain.contracts[MULTICALL.lower()]
+    failures = [{"code": -32000, "message": "header not found"}]
+
+    def lagging(calldata):
+        if failures:
+            raise ValueError(failures.pop())
+        return aggregate(calldata)
+
+    chain.contracts[MULTICALL.lower()] = lagging
+
+    results = await MultiCaller(provider, MULTICALL).multi_call(
+        calculate_l2_token_inputs(contract, 40), max_chunk_calldata_size=10 * (36 + 128)
+    )
+
+    assert results == expected
+    # Four chunks, one of them sent twice.
+    assert chain.count("eth_call") == 5
+
+
+@pytest.mark.asyncio
+async def test_multicall3_allows_failure_per_call():
+    chain, provider = make_provider()
+    chain.add_multicall(MULTICALL3_ADDRESS)
+    contract = gateway_router(provider)
+    inputs = calculate_l2_token_inputs(contract, 2)
+    failing = {
+        "targetAddr": ROUTER,
+        "encoder": lambda: contract.encodeABI(fn_name="getGateway", args=[Web3.to_checksum_address(DISABLED_TOKEN)]),
+        "decoder": lambda return_data: decode(["address"], return_data)[0],
+    }
+
+    caller = MultiCaller.multicall3(provider)
+    with pytest.raises(ContractLogicError):
+        await caller.multi_call([inputs[0], failing], require_success=True)
+
+    results = await caller.multi_call([inputs[0], {**failing, "allowFailure": True}], require_success=True)
+    assert results[1] is None
+
+
+@pytest.mark.asyncio
+async def test_pinned_caller_reads_one_block():
+    chain, provider = make_provider()
+    contract = gateway_router(provider)
+    caller = await MultiCaller(provider, MULTICALL).pinned()
+    chain.head += 5
+
+    await caller.multi_call(calculate_l2_token_inputs(contract, 2))
+    await caller.multi_call(calculate_l2_token_inputs(contract, 40), max_chunk_calldata_size=10 * (36 + 128))
+
+    assert {p[1] for m, p in chain.calls if m == "eth_call"} == {hex(1000)}
+
+
+def erc20(balances, allowances):
+    def handler(calldata):
+        if calldata[:4] == selector("balanceOf(address)"):
+            (account,) = decode(["address"], calldata[4:])
+            return encode(["uint256"], [balances.get(account, 0)])
+        if calldata[:4] == selector("allowance(address,address)"):
+            owner, spender = decode(["address", "address"], calldata[4:])
+            return encode(["uint256"], [allowances.get((owner, spender), 0)])
+        revert()
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_balance_matrix_reads_tokens_and_native_eth():
+    accounts = ["0x" + f"{i:040x}" for i in range(1, 4)]
+    spenders = ["0x" + f"{i:040x}" for i in range(100, 102)]
+    tokens = ["0x" + f"{i:040x}" for i in range(200, 202)]
+
+    chain, provider = make_provider()
+    chain.contracts[tokens[0]] = erc20({accounts[0]: 7}, {(accounts[0], spenders[1]): 3})
+    chain.contracts[tokens[1]] = erc20({accounts[2]: 9}, {})
+    chain.eth_balances[accounts[1]] = 5
+
+    matrix = await MultiCaller(provider, MULTICALL).get_balance_matrix(
+        [Web3.to_checksum_address(a) for a in accounts],
+        [*tokens, None],
+        spenders=[Web3.to_checksum_address(s) for s in spenders],
+    )
+
+    assert matrix["balances"] == [[7, 0, 0], [0, 0, 5], [0, 9, 0]]
+    assert matrix["allowances"][0] == [[0, 3], [0, 0], [None, None]]
+    assert chain.count("eth_call") == 1
+
+
+@pytest.mark.asyncio
+async def test_get_token_data_skips_disabled_options():
+    token = "0x" + f"{200:040x}"
+    account = "0x" + f"{1:040x}"
+    chain, provider = make_provider()
+    chain.contracts[token] = erc20({account: 7}, {})
+
+    token_data = await MultiCaller(provider, MULTICALL).get_token_data(
+        [token, token], {"balanceOf": {"account": Web3.to_checksum_address(account)}, "name": False}
+    )
+
+    assert token_data == [{"balance": 7}, {"balance": 7}]
+
+
+@pytest.mark.asyncio
+async def test_get_token_data_without_options_reads_nothing():
+    chain, provider = make_provider()
+
+    token_data = await MultiCaller(provider, MULTICALL).get_token_data(["0x" + f"{200:040x}"], {"name": False})
+
+    assert token_data == []
+    assert chain.count("eth_call") == 0
+
+
+@pytest.mark.asyncio
+async def test_async_web3_reads_are_batched():
+    chain, _ = make_provider()
+    provider = AsyncWeb3(AsyncStandInChain(chain))
+    await enable_multi_call_batching(provider, MultiCaller(provider, MULTICALL))
+    contract = gateway_router(provider)
+
+    results = await asyncio.gather(
+        read_contract(contract.functions.getGateway(ROUTER)),
+        read_contract(contract.functions.getGateway(Web3.to_checksum_address(DISABLED_TOKEN))),
+        return_exceptions=True,
+    )
+
+    assert results[0] == GATEWAY
+    assert isinstance(results[1], ContractLogicError)
+    # One aggregate, then the failed read is retried on its own to surface the revert.
+    assert chain.count("eth_call") == 2
+
+
+@pytest.mark.asyncio
+async def test_identical_batched_reads_are_called_once():
+    chain, provider = make_provider()
+    await enable_multi_call_batching(provider, MultiCaller(provider, MULTICALL))
+    contract = gateway_router(provider)
+    token = Web3.to_checksum_address("0x" + f"{1:040x}")
+
+    results = await asyncio.gather(*[read_contract(contract.functions.getGateway(token)) for _ in range(5)])
+
+    assert results == [GATEWAY] * 5
+    assert chain.count("eth_call") == 1
+    disable_multi_call_batching(provider)
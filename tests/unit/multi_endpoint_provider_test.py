@@ -0,0 +1,140 @@
+import asyncio
+import time
+from contextlib import ExitStack
+
+import pytest
+from web3 import AsyncWeb3, Web3
+from web3.providers import BaseProvider
+
+from src.lib.utils.arb_provider import ArbitrumProvider
+from src.lib.utils.executor import call_rpc
+from src.lib.utils.multi_endpoint_provider import AsyncMultiEndpointProvider, MultiEndpointProvider
+from tests.unit.stand_in_chain import AsyncStandInChain, StandInChain, serve_stand_in_chain
+
+DEAD_ENDPOINT = "http://127.0.0.1:1"
+
+HEADER_NOT_FOUND = {"code": -32000, "message": "header not found"}
+
+
+class ErrorEndpoint(BaseProvider):
+    # Answers every request with the same JSON-RPC error.
+    def __init__(self, error):
+        self.error = error
+        self.requests = 0
+
+    def make_request(self, method, params):
+        self.requests += 1
+        return {"jsonrpc": "2.0", "id": self.requests, "error": self.error}
+
+
+def serve_endpoints(stack, *latencies):
+    chain = StandInChain(head=1000)
+    return [stack.enter_context(serve_stand_in_chain(chain, latency=latency)) for latency in latencies]
+
+
+def test_reads_are_routed_to_the_fastest_endpoint():
+    with ExitStack() as stack:
+        (slow_url, slow_posts), (fast_url, fast_posts) = serve_endpoints(stack, 0.05, 0)
+        arb_provider = ArbitrumProvider.from_endpoints([slow_url, fast_url], hedge=False)
+
+        for _ in range(10):
+            assert arb_provider.provider.eth.block_number == 1000
+
+    assert len(slow_posts) == 1
+    assert len(fast_posts) == 9
+    stats = arb_provider.provider.provider.stats()
+    assert stats[0]["latency"] > stats[1]["latency"]
+
+
+def test_slow_read_is_hedged_to_the_next_endpoint():
+    latency = {"primary": 0}
+    with ExitStack() as stack:
+        (primary_url, primary_posts), (backup_url, backup_posts) = serve_endpoints(
+            stack, lambda: latency["primary"], 0.02
+        )
+        arb_provider = ArbitrumProvider.from_endpoints([primary_url, backup_url], hedge_delay=0.05)
+        web3 = arb_provider.provider
+        for _ in range(3):
+            web3.eth.get_block(1)
+
+        latency["primary"] = 1.0
+        started = time.monotonic()
+        block = web3.eth.get_block(2)
+        elapsed = time.monotonic() - started
+
+    assert block["number"] == 2
+    assert elapsed < 0.5
+    assert len(backup_posts) >= 1
+
+
+def test_writes_go_to_the_pinned_endpoint():
+    with ExitStack() as stack:
+        (pinned_url, pinned_posts), (fast_url, fast_posts) = serve_endpoints(stack, 0.02, 0)
+        web3 = ArbitrumProvider.from_endpoints([fast_url, pinned_url], pinned_endpoint=1).provider
+
+        for _ in range(3):
+            web3.eth.send_raw_transaction("0x01")
+
+    assert [post["method"] for post in pinned_posts] == ["eth_sendRawTransaction"] * 3
+    assert fast_posts == []
+
+
+@pytest.mark.asyncio
+async def test_async_reads_fail_over_from_a_dead_endpoint():
+    with ExitStack() as stack:
+        [(url, posts)] = serve_endpoints(stack, 0)
+        arb_provider = ArbitrumProvider.from_endpoints([DEAD_ENDPOINT, url], is_async=True)
+
+        blocks = await asyncio.gather(*[arb_provider.get_block(n) for n in range(5)])
+        head = await call_rpc(lambda: arb_provider.provider.eth.block_number)
+
+    assert [block["number"] for block in blocks] == list(range(5))
+    assert head == 1000
+    stats = arb_provider.provider.provider.stats()
+    assert stats[0]["errors"] >= 1
+    assert stats[1]["requests"] == len(posts)
+
+
+@pytest.mark.parametrize("hedge", [False, True])
+def test_reads_fail_over_from_an_endpoint_answering_with_errors(hedge):
+    error_endpoint = ErrorEndpoint(HEADER_NOT_FOUND)
+    provider = MultiEndpointProvider([error_endpoint, StandInChain(head=1000)], hedge=hedge)
+
+    assert Web3(provider).eth.get_block(7)["number"] == 7
+    assert error_endpoint.requests == 1
+    stats = provider.stats()
+    assert stats[0]["errors"] == 1 and stats[0]["latency"] is None
+    assert stats[1]["errors"] == 0
+
+
+@pytest.mark.asyncio
+async def test_async_hedged_read_does_not_settle_for_an_error():
+    error_endpoint = ErrorEndpoint({"code": 429, "message": "Too many requests"})
+
+    class AsyncErrorEndpoint(AsyncStandInChain):
+        async def make_request(self, method, params):
+            return error_endpoint.make_request(method, params)
+
+    provider = AsyncMultiEndpointProvider([AsyncErrorEndpoint(None), AsyncStandInChain(StandInChain(head=1000))])
+
+    assert await AsyncWeb3(provider).eth.block_number == 1000
+    assert provider.stats()[0]["errors"] == 1
+
+
+def test_error_is_returned_when_every_endpoint_answers_with_one():
+    provider = MultiEndpointProvider([ErrorEndpoint(HEADER_NOT_FOUND), ErrorEndpoint(HEADER_NOT_FOUND)])
+
+    with pytest.raises(ValueError, match="header not found"):
+        Web3(provider).eth.get_block(7)
+    assert [stats["errors"] for stats in provider.stats()] == [1, 1]
+
+
+def test_request_errors_are_not_retried_on_other_endpoints():
+    error_endpoint = ErrorEndpoint({"code": 3, "message": "execution reverted"})
+    chain = StandInChain(head=1000)
+    provider = MultiEndpointProvider([error_endpoint, chain], hedge=False)
+
+    with pytest.raises(ValueError, match="execution reverted"):
+        Web3(provider).eth.get_block(7)
+    assert chain.count("eth_getBlockByNumber") == 0
+    assert provider.stats()[0]["errors"] == 0
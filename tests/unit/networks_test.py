@@ -0,0 +1,45 @@
+import pytest
+from web3 import AsyncWeb3, Web3
+
+from src.lib.data_entities.networks import fetch_l2_network, get_l2_network, l2_networks
+from src.lib.message.l2_to_l1_message_nitro import L2ToL1MessageReaderNitro
+from src.lib.utils.chain_id import invalidate_chain_id
+from tests.unit.stand_in_chain import AsyncStandInChain, StandInChain
+
+
+def test_chain_id_is_read_once_per_provider():
+    chain = StandInChain()
+    provider = Web3(chain)
+
+    assert get_l2_network(provider) is l2_networks[42161]
+    assert get_l2_network(provider) is l2_networks[42161]
+    assert chain.count("eth_chainId") == 1
+
+    chain.chain_id = 421613
+    invalidate_chain_id(provider)
+    assert get_l2_network(provider) is l2_networks[421613]
+    assert chain.count("eth_chainId") == 2
+
+
+@pytest.mark.asyncio
+async def test_async_chain_id_is_memoized():
+    chain = StandInChain()
+    provider = AsyncWeb3(AsyncStandInChain(chain))
+
+    for _ in range(3):
+        assert await fetch_l2_network(provider) is l2_networks[42161]
+    assert chain.count("eth_chainId") == 1
+
+
+@pytest.mark.asyncio
+async def test_reader_binds_its_l2_network():
+    chain = StandInChain()
+    provider = Web3(chain)
+
+    bound = L2ToL1MessageReaderNitro(provider, {}, l2_networks[42161])
+    assert await bound.get_l2_network(provider) is l2_networks[42161]
+    assert chain.count("eth_chainId") == 0
+
+    reader = L2ToL1MessageReaderNitro(provider, {})
+    await reader.get_l2_network(provider)
+    assert reader.l2_network is l2_networks[42161]
@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+import pytest
+from web3 import AsyncHTTPProvider, AsyncWeb3, HTTPProvider, Web3
+
+from src.lib.utils.arb_provider import ArbitrumProvider
+from src.lib.utils.executor import call_rpc, disable_thread_offload, enable_thread_offload
+from src.lib.utils.rate_limiter import AdaptiveRateLimiter, enable_rate_limiting
+from tests.unit.stand_in_chain import AsyncStandInChain, StandInChain, serve_stand_in_chain
+
+
+@pytest.mark.asyncio
+async def test_throttled_requests_are_retried_and_shrink_the_window():
+    chain = StandInChain(head=1000)
+    with serve_stand_in_chain(chain, latency=0.02, max_concurrent=4) as (url, posts):
+        provider = AsyncWeb3(AsyncHTTPProvider(url))
+        rate_limiter = enable_rate_limiting(provider, AdaptiveRateLimiter(initial_concurrency=16, backoff=0.01))
+        blocks = await asyncio.gather(*[ArbitrumProvider(provider).get_block(n) for n in range(40)])
+
+    assert [block["number"] for block in blocks] == list(range(40))
+    assert rate_limiter.stats["rateLimited"] > 0
+    assert rate_limiter.stats["queued"] > 0
+    assert rate_limiter.window < 16
+
+
+def test_requests_over_the_window_are_queued():
+    chain = StandInChain(head=1000)
+    rate_limiter = AdaptiveRateLimiter(initial_concurrency=2, max_concurrency=2, min_concurrency=2)
+
+    async def fetch(provider):
+        return await asyncio.gather(*[call_rpc(provider.eth.get_block, n) for n in range(12)])
+
+    enable_thread_offload(max_workers=8)
+    try:
+        with serve_stand_in_chain(chain, latency=0.01, max_concurrent=2) as (url, posts):
+            provider = Web3(HTTPProvider(url))
+            enable_rate_limiting(provider, rate_limiter)
+            blocks = asyncio.run(fetch(provider))
+    finally:
+        disable_thread_offload()
+
+    assert [block["number"] for block in blocks] == list(range(12))
+    assert len(posts) == 12
+    assert rate_limiter.stats["rateLimited"] == 0
+    assert rate_limiter.stats["queued"] > 0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_requests():
+    chain = StandInChain(head=1000)
+    provider = AsyncWeb3(AsyncStandInChain(chain))
+    enable_rate_limiting(provider, AdaptiveRateLimiter(requests_per_second=50, burst=1))
+
+    started = time.monotonic()
+    await asyncio.gather(*[provider.eth.get_block(n) for n in range(10)])
+
+    assert time.monotonic() - started >= 9 / 50 * 0.9
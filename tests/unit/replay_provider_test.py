@@ -0,0 +1,71 @@
+import time
+
+import pytest
+from eth_abi import encode
+from web3 import AsyncWeb3, Web3
+
+from src.lib.data_entities.constants import ARB_SYS_ADDRESS
+from src.lib.data_entities.errors import ArbSdkError
+from src.lib.data_entities.networks import l2_networks
+from src.lib.utils.lib import get_block_ranges_for_l1_block
+from src.lib.utils.replay_provider import AsyncReplayProvider, RecordingProvider, ReplayProvider, RpcFixture
+from tests.unit.stand_in_chain import StandInChain
+
+
+def make_chain():
+    genesis = l2_networks[42161].nitro_genesis_block
+    chain = StandInChain(
+        head=genesis + 100_000,
+        contracts={ARB_SYS_ADDRESS: lambda calldata: encode(["uint256"], [20])},
+    )
+    return chain, (genesis + 50_001) // 4
+
+
+@pytest.mark.asyncio
+async def test_recorded_search_replays_without_the_node(tmp_path):
+    chain, for_l1_block = make_chain()
+    recording = RecordingProvider(chain)
+    recorded = await get_block_ranges_for_l1_block(Web3(recording), for_l1_block)
+    recording.save(tmp_path / "search.json.gz")
+    requests_made = len(chain.calls)
+
+    replayed = await get_block_ranges_for_l1_block(Web3(ReplayProvider(tmp_path / "search.json.gz")), for_l1_block)
+
+    assert recorded == replayed == [for_l1_block * 4, for_l1_block * 4 + 3]
+    assert len(chain.calls) == requests_made
+
+
+def test_repeated_requests_replay_in_order():
+    chain = StandInChain(head=10)
+    recording = Web3(RecordingProvider(chain))
+    heads = []
+    for head in (10, 11):
+        chain.head = head
+        heads.append(recording.eth.block_number)
+
+    replay = Web3(ReplayProvider(recording.provider.fixture, latency=0.01))
+    started = time.monotonic()
+    assert [replay.eth.block_number for _ in range(3)] == [10, 11, 11]
+    assert time.monotonic() - started >= 0.03
+
+    with pytest.raises(ArbSdkError):
+        replay.eth.get_block(3)
+
+
+@pytest.mark.asyncio
+async def test_async_replay_serves_the_same_fixture():
+    chain = StandInChain(head=10)
+    recording = Web3(RecordingProvider(chain))
+    recording.eth.get_block(3)
+
+    replay = AsyncWeb3(AsyncReplayProvider(recording.provider.fixture, latency=lambda method: 0.01))
+    assert (await replay.eth.get_block(3))["hash"] == recording.eth.get_block(3)["hash"]
+
+
+def test_fixture_round_trips_errors(tmp_path):
+    fixture = RpcFixture()
+    fixture.record("eth_call", [{"to": "0x01"}, "latest"], {"id": 7, "error": {"code": 3, "message": "reverted"}})
+    fixture.save(tmp_path / "errors.json")
+
+    response = RpcFixture.load(tmp_path / "errors.json").replay("eth_call", ({"to": "0x01"}, "latest"))
+    assert response["error"] == {"code": 3, "message": "reverted"}
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+import pytest
+from web3 import AsyncWeb3, Web3
+
+from src.lib.utils.executor import call_rpc, disable_thread_offload, enable_thread_offload
+from src.lib.utils.request_coalescing import disable_request_coalescing, enable_request_coalescing
+from tests.unit.stand_in_chain import AsyncStandInChain, StandInChain
+
+
+class SlowStandInChain(StandInChain):
+    def make_request(self, method, params):
+        time.sleep(0.2)
+        return super().make_request(method, params)
+
+
+@pytest.mark.asyncio
+async def test_identical_async_requests_share_one_call():
+    chain = StandInChain(head=1000)
+    provider = AsyncWeb3(AsyncStandInChain(chain))
+    request_coalescer = enable_request_coalescing(provider)
+
+    blocks = await asyncio.gather(*[provider.eth.get_block("latest") for _ in range(10)], provider.eth.get_block(7))
+
+    assert [block["number"] for block in blocks] == [1000] * 10 + [7]
+    assert chain.count("eth_getBlockByNumber") == 2
+    assert request_coalescer.stats == {"requests": 11, "coalesced": 9}
+
+    await provider.eth.get_block("latest")
+    assert chain.count("eth_getBlockByNumber") == 3
+
+
+@pytest.mark.asyncio
+async def test_identical_sync_requests_from_threads_share_one_call():
+    chain = SlowStandInChain(head=1000)
+    provider = Web3(chain)
+    enable_request_coalescing(provider)
+    enable_thread_offload(max_workers=4)
+    try:
+        chain_ids = await asyncio.gather(*[call_rpc(lambda: provider.eth.chain_id) for _ in range(4)])
+    finally:
+        disable_thread_offload()
+
+    assert chain_ids == [42161] * 4
+    assert chain.count("eth_chainId") == 1
+
+    disable_request_coalescing(provider)
+    assert "request_coalescing" not in provider.middleware_onion
@@ -0,0 +1,333 @@
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from eth_abi import decode, encode
+from web3 import Web3
+from web3.providers import BaseProvider
+from web3.providers.async_base import AsyncBaseProvider
+
+from src.lib.data_entities.constants import ARB_SYS_ADDRESS
+from src.lib.data_entities.event import get_event_decoder
+
+DESTINATION = "0x467194771dAe2967Aef3ECbEDD3Bf9a310C76C65"
+CALLER = "0x7F869dC59A96e798e759030b3c39398ba584F087"
+
+GAS_PRICE = 100_000_000
+
+GAS_ESTIMATE = 100_000
+
+
+def to_hex_int(value):
+    return hex(value)
+
+
+def block_hash(number, fork=0):
+    return "0x" + (number.to_bytes(8, "big") + fork.to_bytes(2, "big")).hex().rjust(64, "0")
+
+
+def encode_log(contract_name, event_name, args, block_number, log_index, address, is_classic=False, fork=0):
+    decoder = get_event_decoder(contract_name, event_name, is_classic)
+    topics = [decoder.topic] + [
+        Web3.to_hex(encode([abi_type], [args[abi_input["name"]]]))
+        for abi_input, abi_type in zip(decoder.topic_inputs, decoder.topic_types)
+    ]
+    data = encode(decoder.data_types, [args[abi_input["name"]] for abi_input in decoder.data_inputs])
+    return {
+        "address": address,
+        "topics": topics,
+        "data": Web3.to_hex(data),
+        "blockNumber": to_hex_int(block_number),
+        "blockHash": block_hash(block_number, fork),
+        "transactionHash": "0x" + (block_number * 1000 + log_index).to_bytes(32, "big").hex(),
+        "transactionIndex": "0x0",
+        "logIndex": to_hex_int(log_index),
+        "removed": False,
+    }
+
+
+def l2_to_l1_tx_log(position, block_number, log_index=0, fork=0):
+    return encode_log(
+        "ArbSys",
+        "L2ToL1Tx",
+        {
+            "caller": CALLER,
+            "destination": DESTINATION,
+            "hash": position + 1,
+            "position": position,
+            "arbBlockNum": block_number,
+            "ethBlockNum": block_number // 4,
+            "timestamp": 1_700_000_000 + block_number,
+            "callvalue": 0,
+            "data": b"",
+        },
+        block_number,
+        log_index,
+        ARB_SYS_ADDRESS,
+        fork=fork,
+    )
+
+
+def topic_matches(expected, actual):
+    if expected is None:
+        return True
+    if isinstance(expected, list):
+        return any(topic_matches(e, actual) for e in expected)
+    return expected.lower() == actual.lower()
+
+
+def selector(signature):
+    return Web3.keccak(text=signature)[:4]
+
+
+def revert(message="reverted"):
+    raise ValueError({"code": 3, "message": f"execution reverted: {message}", "data": "0x"})
+
+
+class StandInChain(BaseProvider):
+    # contracts maps an address to a handler taking calldata bytes and returning return data bytes.
+    def __init__(self, logs=None, head=1000, chain_id=42161, max_log_range=None, contracts=None):
+        self.logs = logs or []
+        self.contracts = {address.lower(): handler for address, handler in (contracts or {}).items()}
+        self.head = head
+        self.chain_id = chain_id
+        self.max_log_range = max_log_range
+        self.filters = {}
+        self.forks = {}
+        self.eth_balances = {}
+        self.calls = []
+
+    def is_connected(self, show_traceback=False):
+        return True
+
+    def count(self, method):
+        return sum(1 for m, _ in self.calls if m == method)
+
+    def parse_block(self, tag):
+        if tag in ("latest", "pending", "safe", "finalized", None):
+            return self.head
+        if tag == "earliest":
+            return 0
+        return int(tag, 16) if isinstance(tag, str) else tag
+
+    def query_logs(self, params):
+        from_block = self.parse_block(params.get("fromBlock", "earliest"))
+        to_block = self.parse_block(params.get("toBlock", "latest"))
+        if self.max_log_range is not None and to_block - from_block + 1 > self.max_log_range:
+            raise ValueError({"code": -32005, "message": "query returned more than 10000 results"})
+
+        addresses = params.get("address")
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        topics = params.get("topics") or []
+
+        return [
+            log
+            for log in self.logs
+            if from_block <= int(log["blockNumber"], 16) <= to_block
+            and int(log["blockNumber"], 16) <= self.head
+            and (not addresses or log["address"].lower() in [a.lower() for a in addresses])
+            and len(topics) <= len(log["topics"])
+            and all(topic_matches(t, a) for t, a in zip(topics, log["topics"]))
+        ]
+
+    def get_block(self, number):
+        if number > self.head:
+            return None
+        fork = self.forks.get(number, 0)
+        return {
+            "number": to_hex_int(number),
+            "hash": block_hash(number, fork),
+            "parentHash": block_hash(number - 1, self.forks.get(number - 1, 0)) if number else "0x" + "00" * 32,
+            "timestamp": to_hex_int(1_700_000_000 + number),
+            "transactions": [],
+            "l1BlockNumber": to_hex_int(number // 4),
+            "sendCount": to_hex_int(number),
+            "sendRoot": "0x" + number.to_bytes(32, "big").hex(),
+        }
+
+    def get_transaction_receipt(self, transaction_hash):
+        # Transaction hashes encode block_number * 1000 + index, as in encode_log.
+        number = int(transaction_hash, 16) // 1000
+        if number > self.head:
+            return None
+        return {
+            "transactionHash": transaction_hash,
+            "transactionIndex": "0x0",
+            "blockNumber": to_hex_int(number),
+            "blockHash": block_hash(number, self.forks.get(number, 0)),
+            "status": "0x1",
+            "gasUsed": "0x5208",
+            "l1BlockNumber": to_hex_int(number // 4),
+            "gasUsedForL1": "0x0",
+            "logs": [],
+        }
+
+    def call(self, to, calldata):
+        handler = self.contracts.get(to.lower())
+        if handler is None:
+            return b""
+        return handler(calldata)
+
+    def add_multicall(self, address, max_calls=None):
+        # Serves Multicall2 tryAggregate and Multicall3 aggregate3/aggregate3Value as calls of (target, allow_failure, calldata).
+        def try_aggregate(args):
+            require_success, calls = decode(["bool", "(address,bytes)[]"], args)
+            return [(target, not require_success, calldata) for target, calldata in calls]
+
+        def aggregate3(args):
+            (calls,) = decode(["(address,bool,bytes)[]"], args)
+            return calls
+
+        def aggregate3_value(args):
+            (calls,) = decode(["(address,bool,uint256,bytes)[]"], args)
+            return [(target, allow_failure, calldata) for target, allow_failure, _, calldata in calls]
+
+        def get_eth_balance(args):
+            (account,) = decode(["address"], args)
+            return encode(["uint256"], [self.eth_balances.get(account.lower(), 0)])
+
+        functions = {
+            selector("tryAggregate(bool,(address,bytes)[])"): try_aggregate,
+            selector("aggregate3((address,bool,bytes)[])"): aggregate3,
+            selector("aggregate3Value((address,bool,uint256,bytes)[])"): aggregate3_value,
+        }
+
+        def handler(calldata):
+            if calldata[:4] == selector("getEthBalance(address)"):
+                return get_eth_balance(calldata[4:])
+            if calldata[:4] not in functions:
+                revert("unknown multicall function")
+            calls = functions[calldata[:4]](calldata[4:])
+            if max_calls is not None and len(calls) > max_calls:
+                raise ValueError({"code": -32000, "message": "gas required exceeds allowance"})
+
+            results = []
+            for target, allow_failure, inner_calldata in calls:
+                try:
+                    results.append((True, self.call(target, inner_calldata)))
+                except ValueError:
+                    if not allow_failure:
+                        revert("Multicall: call failed")
+                    results.append((False, b""))
+            return encode(["(bool,bytes)[]"], [results])
+
+        self.contracts[address.lower()] = handler
+
+    def handle(self, method, params):
+        if method == "eth_chainId":
+            return to_hex_int(self.chain_id)
+        if method == "eth_blockNumber":
+            return to_hex_int(self.head)
+        if method == "eth_getBlockByNumber":
+            return self.get_block(self.parse_block(params[0]))
+        if method == "eth_getBlockByHash":
+            number = int(params[0][-20:-4], 16)
+            block = self.get_block(number)
+            return block if block and block["hash"] == params[0] else None
+        if method == "eth_getTransactionReceipt":
+            return self.get_transaction_receipt(params[0])
+        if method == "eth_sendRawTransaction":
+            return Web3.to_hex(Web3.keccak(hexstr=params[0]))
+        if method == "eth_call":
+            return Web3.to_hex(self.call(params[0]["to"], bytes(Web3.to_bytes(hexstr=params[0]["data"]))))
+        if method == "eth_gasPrice":
+            return to_hex_int(GAS_PRICE)
+        if method == "eth_estimateGas":
+            return to_hex_int(GAS_ESTIMATE)
+        if method == "eth_getCode":
+            return "0x6080" if params[0].lower() in self.contracts else "0x"
+        if method == "eth_getLogs":
+            return self.query_logs(params[0])
+        if method == "eth_newFilter":
+            filter_id = to_hex_int(len(self.filters) + 1)
+            self.filters[filter_id] = params[0]
+            return filter_id
+        if method == "eth_getFilterLogs":
+            return self.query_logs(self.filters[params[0]])
+        if method == "eth_uninstallFilter":
+            return self.filters.pop(params[0], None) is not None
+        raise NotImplementedError(method)
+
+    def make_request(self, method, params):
+        self.calls.append((method, params))
+        try:
+            return {"jsonrpc": "2.0", "id": len(self.calls), "result": self.handle(method, params)}
+        except ValueError as err:
+            return {"jsonrpc": "2.0", "id": len(self.calls), "error": err.args[0]}
+
+
+class AsyncStandInChain(AsyncBaseProvider):
+    # Serves a StandInChain to AsyncWeb3, yielding to the event loop on every request.
+    def __init__(self, chain):
+        self.chain = chain
+
+    async def is_connected(self, show_traceback=False):
+        return True
+
+    async def make_request(self, method, params):
+        await asyncio.sleep(0)
+        return self.chain.make_request(method, params)
+
+
+@contextmanager
+def serve_stand_in_chain(chain, accept_batches=True, latency=0, max_concurrent=None):
+    # Serves chain over JSON-RPC on a local port. Every POST body is recorded in posts, and batch
+    # arrays are answered in reverse order so clients must match responses by id. latency is a
+    # number of seconds, or a function returning one, to wait before answering. Requests beyond
+    # max_concurrent in flight are refused with HTTP 429.
+    posts = []
+    lock = threading.Lock()
+    in_flight = {"count": 0}
+
+    def answer(request):
+        with lock:
+            response = chain.make_request(request["method"], request.get("params", []))
+        return {**response, "id": request["id"]}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            posts.append(body)
+            with lock:
+                in_flight["count"] += 1
+                throttled = max_concurrent is not None and in_flight["count"] > max_concurrent
+            try:
+                time.sleep(latency() if callable(latency) else latency)
+                if throttled:
+                    self.send_error(429)
+                    return
+                self.respond(body)
+            finally:
+                with lock:
+                    in_flight["count"] -= 1
+
+        def respond(self, body):
+            if not isinstance(body, list):
+                payload = answer(body)
+            elif accept_batches:
+                payload = [answer(request) for request in reversed(body)]
+            else:
+                payload = {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch not supported"}}
+
+            data = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", posts
+    finally:
+        server.shutdown()
+        server.server_close()